@@ -1,6 +1,11 @@
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from app.api.v1 import schemas
+from app.core.responses import ModelJSONResponse, dumps
 from app.services import analysis_service
+from app.services.jobs import CallbackURLError, QueueFullError
 
 router = APIRouter()
 
@@ -10,12 +15,197 @@ router = APIRouter()
     response_model=schemas.ScheduleAnalysisResponse,
     tags=["Analysis"],
 )
-def analyze_schedule(request: schemas.ScheduleAnalysisRequest):
+async def analyze_schedule(request: schemas.ScheduleAnalysisRequest, mode: Optional[schemas.AnalysisMode] = None):
     """
     Analyzes a list of tasks and returns categorizations, a report, and suggestions.
     """
     # Call the analysis service with the user's tasks
-    result = analysis_service.analyze_schedule_service(request.tasks)
+    result = await analysis_service.analyze_schedule_service(request.tasks, mode=mode)
 
-    # The service returns a dictionary, which we can directly pass into our response model
-    return schemas.ScheduleAnalysisResponse(**result)
+    # The response model is validated once here and serialized straight from its fields
+    return ModelJSONResponse(schemas.ScheduleAnalysisResponse(**result))
+
+
+@router.post(
+    "/analyze-schedule/stream",
+    tags=["Analysis"],
+    response_class=StreamingResponse,
+)
+async def analyze_schedule_stream(
+    request: schemas.ScheduleAnalysisRequest,
+    tokens: bool = False,
+    mode: Optional[schemas.AnalysisMode] = None,
+):
+    """
+    Streams the analysis as Server-Sent Events while the agent runs: one event
+    per finished node, the routing decision, a final `result` event with the
+    full response, and with `?tokens=true` text deltas of the reports (a delta
+    with `reset: true` replaces the text of its report sent so far).
+    """
+
+    async def event_stream():
+        try:
+            async for event, data in analysis_service.stream_schedule_analysis_service(
+                request.tasks, include_tokens=tokens, mode=mode
+            ):
+                if event == "result":
+                    data = schemas.ScheduleAnalysisResponse(**data)
+                yield _sse(event, data)
+        except Exception as exc:
+            # Headers are already sent, so errors are reported in-band
+            yield _sse("error", {"detail": str(exc) or type(exc).__name__})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, data) -> str:
+    """Formats one Server-Sent Event."""
+    return f"event: {event}\ndata: {dumps(data).decode()}\n\n"
+
+
+@router.post(
+    "/analyze-schedule/jobs",
+    response_model=schemas.AnalysisJobResponse,
+    status_code=202,
+    tags=["Jobs"],
+)
+async def submit_analysis_job(request: schemas.AnalysisJobRequest, mode: Optional[schemas.AnalysisMode] = None):
+    """
+    Queues an analysis and returns its job right away. Poll
+    `GET /analyze-schedule/jobs/{job_id}` for the result, or pass a
+    `callback_url` to have it POSTed there when the job finishes.
+    """
+    callback_url = str(request.callback_url) if request.callback_url else None
+    try:
+        job = analysis_service.submit_analysis_job(request.tasks, mode=mode, callback_url=callback_url)
+    except CallbackURLError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    except QueueFullError as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "5"})
+    return ModelJSONResponse(
+        schemas.AnalysisJobResponse(**job),
+        status_code=202,
+        headers={"Location": f"/api/v1/analyze-schedule/jobs/{job['job_id']}"},
+    )
+
+
+@router.get(
+    "/analyze-schedule/jobs/{job_id}",
+    response_model=schemas.AnalysisJobResponse,
+    tags=["Jobs"],
+)
+async def get_analysis_job(job_id: str):
+    """Returns the status of a job and, once it has finished, its result or error."""
+    try:
+        job = analysis_service.get_analysis_job(job_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job {job_id!r}.")
+    return ModelJSONResponse(schemas.AnalysisJobResponse(**job))
+
+
+@router.put(
+    "/sessions/{session_id}/schedule",
+    response_model=schemas.SessionAnalysisResponse,
+    tags=["Sessions"],
+)
+async def analyze_session_schedule(session_id: str, request: schemas.ScheduleAnalysisRequest):
+    """
+    Sets the task list of a session and analyzes it. Repeated calls only
+    recompute the steps whose inputs changed since the session's last run.
+    """
+    result = await analysis_service.analyze_session_service(session_id, request.tasks)
+    return ModelJSONResponse(schemas.SessionAnalysisResponse(**result))
+
+
+@router.patch(
+    "/sessions/{session_id}/schedule",
+    response_model=schemas.SessionAnalysisResponse,
+    tags=["Sessions"],
+)
+async def edit_session_schedule(session_id: str, request: schemas.ScheduleEditRequest):
+    """
+    Adds and removes tasks from a session's schedule and re-analyzes it
+    incrementally, reusing stored categories and unchanged results.
+    """
+    try:
+        result = await analysis_service.update_session_service(session_id, request.add, request.remove)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown session {session_id!r}.")
+    return ModelJSONResponse(schemas.SessionAnalysisResponse(**result))
+
+
+@router.get(
+    "/sessions/{session_id}/schedule",
+    response_model=schemas.SessionAnalysisResponse,
+    tags=["Sessions"],
+)
+async def get_session_schedule(session_id: str):
+    """Returns the latest analysis of a session."""
+    try:
+        result = await analysis_service.get_session_service(session_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown session {session_id!r}.")
+    return ModelJSONResponse(schemas.SessionAnalysisResponse(**result))
+
+
+@router.delete("/sessions/{session_id}", status_code=204, tags=["Sessions"])
+async def delete_session(session_id: str):
+    """Deletes a session and its stored analysis."""
+    await analysis_service.delete_session_service(session_id)
+
+
+@router.post(
+    "/analyze-schedule/week",
+    response_model=schemas.WeeklyScheduleAnalysisResponse,
+    tags=["Analysis"],
+)
+async def analyze_week(request: schemas.WeeklyScheduleAnalysisRequest, mode: Optional[schemas.AnalysisMode] = None):
+    """
+    Analyzes every day of a week concurrently, then aggregates the stress
+    levels and moves the tasks each day should reschedule onto lighter days.
+    """
+    result = await analysis_service.analyze_week_service(
+        request.days, max_concurrency=request.max_concurrency, mode=mode
+    )
+    return ModelJSONResponse(schemas.WeeklyScheduleAnalysisResponse(**result))
+
+
+@router.post(
+    "/analyze-schedules:batch",
+    response_model=schemas.BatchScheduleAnalysisResponse,
+    tags=["Analysis"],
+)
+async def analyze_schedules_batch(
+    request: schemas.BatchScheduleAnalysisRequest, mode: Optional[schemas.AnalysisMode] = None
+):
+    """
+    Analyzes many schedules concurrently and returns one result or error per
+    schedule, in the order they were sent.
+    """
+    results = await analysis_service.analyze_schedules_batch_service(
+        [item.tasks for item in request.requests],
+        max_concurrency=request.max_concurrency,
+        mode=mode,
+    )
+
+    return ModelJSONResponse(
+        schemas.BatchScheduleAnalysisResponse(
+            results=[_batch_item(index, result) for index, result in enumerate(results)]
+        )
+    )
+
+
+def _batch_item(index: int, result) -> schemas.BatchScheduleAnalysisItem:
+    """Wraps one batch result, turning failures (including invalid results) into an error entry."""
+    if not isinstance(result, Exception):
+        try:
+            return schemas.BatchScheduleAnalysisItem(
+                index=index, result=schemas.ScheduleAnalysisResponse(**result)
+            )
+        except ValidationError as exc:
+            result = exc
+    return schemas.BatchScheduleAnalysisItem(index=index, error=str(result) or type(result).__name__)
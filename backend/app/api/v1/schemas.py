@@ -1,5 +1,12 @@
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field, HttpUrl
+from typing import List, Dict, Literal, Optional
+
+from app.core.config import settings
+
+# Selects the analysis graph: "standard" runs categorize -> analyze, "fast" fuses them into one LLM call,
+# "speculative" starts the advice branch the rule-based estimate predicts while the analysis runs
+AnalysisMode = Literal["standard", "fast", "speculative"]
 
 
 class ScheduleAnalysisRequest(BaseModel):
@@ -68,3 +75,175 @@ class ScheduleAnalysisResponse(BaseModel):
         example=["Take a 15-minute walk to clear your mind"],
         description="Stress recovery recommendations"
     )
+
+    # Nodes whose LLM call failed and were answered by local heuristics instead
+    degraded_nodes: Optional[List[str]] = Field(
+        None,
+        example=["suggest"],
+        description="Steps answered by local fallbacks because the language model was unavailable"
+    )
+
+
+class SessionAnalysisResponse(ScheduleAnalysisResponse):
+    """Analysis of a session's schedule, as of its latest edit."""
+
+    session_id: str = Field(..., example="3f2c9a")
+    tasks: List[str] = Field(
+        ...,
+        example=["Team stand-up at 9am", "Gym after work"],
+        description="The session's current task list",
+    )
+    reused_nodes: List[str] = Field(
+        default_factory=list,
+        example=["categorize", "analyze"],
+        description="Steps whose previous result was reused because their inputs did not change",
+    )
+
+
+class ScheduleEditRequest(BaseModel):
+    """Request model for adding tasks to and removing tasks from a session's schedule."""
+
+    add: List[str] = Field(default_factory=list, example=["Dentist at 4pm"])
+    remove: List[str] = Field(
+        default_factory=list,
+        example=["Gym after work"],
+        description="Tasks to remove, matched case- and whitespace-insensitively",
+    )
+
+
+class BatchScheduleAnalysisRequest(BaseModel):
+    """Request model for analyzing many schedules in one call."""
+
+    requests: List[ScheduleAnalysisRequest] = Field(
+        ...,
+        example=[
+            {"tasks": ["Team stand-up at 9am", "Call the doctor to make an appointment"]},
+            {"tasks": ["Team stand-up at 9am", "Gym after work"]},
+        ],
+        max_length=settings.BATCH_MAX_ITEMS,
+        description="Schedules to analyze",
+    )
+    max_concurrency: Optional[int] = Field(
+        None,
+        ge=1,
+        example=4,
+        description="Maximum number of schedules analyzed at the same time (capped by the server)",
+    )
+
+
+class BatchScheduleAnalysisItem(BaseModel):
+    """Outcome of one schedule in a batch: either a result or an error."""
+
+    index: int = Field(..., example=0, description="Position of the schedule in the request")
+    result: Optional[ScheduleAnalysisResponse] = Field(None, description="Analysis result, if it succeeded")
+    error: Optional[str] = Field(None, example=None, description="Error message, if the analysis failed")
+
+
+class BatchScheduleAnalysisResponse(BaseModel):
+    """Response model for the batch analysis endpoint, in the same order as the request."""
+
+    results: List[BatchScheduleAnalysisItem]
+
+
+class WeeklyScheduleAnalysisRequest(BaseModel):
+    """Request model for analyzing a week's schedule, one task list per day."""
+
+    days: Dict[str, List[str]] = Field(
+        ...,
+        example={
+            "Monday": ["Team stand-up at 9am", "Prepare presentation for 10am meeting", "Client dinner"],
+            "Tuesday": ["Team stand-up at 9am", "Gym after work"],
+        },
+        min_length=1,
+        max_length=settings.WEEK_MAX_DAYS,
+        description="Task lists keyed by day, in calendar order",
+    )
+    max_concurrency: Optional[int] = Field(
+        None,
+        ge=1,
+        example=7,
+        description="Maximum number of days analyzed at the same time (capped by the server)",
+    )
+
+
+class DayAnalysis(BaseModel):
+    """Analysis of one day of the week: either a result or an error."""
+
+    day: str = Field(..., example="Monday")
+    result: Optional[ScheduleAnalysisResponse] = Field(None, description="Analysis result, if it succeeded")
+    error: Optional[str] = Field(None, example=None, description="Error message, if the analysis failed")
+
+
+class TaskMove(BaseModel):
+    """A task moved from an overloaded day onto a lighter one."""
+
+    task: str = Field(..., example="Client dinner")
+    from_day: str = Field(..., example="Monday")
+    to_day: str = Field(..., example="Tuesday")
+
+
+class UnplacedTask(BaseModel):
+    """A task to reschedule for which no day of the week had room."""
+
+    task: str = Field(..., example="Client dinner")
+    day: str = Field(..., example="Monday")
+
+
+class WeeklyScheduleAnalysisResponse(BaseModel):
+    """Response model for the weekly analysis endpoint: per-day results and the week's rebalancing."""
+
+    days: List[DayAnalysis]
+    average_stress_level: Optional[float] = Field(
+        None, example=5.5, description="Mean stress level of the days that were analyzed"
+    )
+    peak_stress_level: Optional[int] = Field(None, example=8)
+    peak_day: Optional[str] = Field(None, example="Monday")
+    overloaded_days: List[str] = Field(
+        default_factory=list, example=["Monday"], description="Days that need rebalancing"
+    )
+    moves: List[TaskMove] = Field(default_factory=list)
+    unplaced_tasks: List[UnplacedTask] = Field(
+        default_factory=list, description="Tasks to reschedule that no lighter day could take"
+    )
+    rebalanced_schedule: Dict[str, List[str]] = Field(
+        ...,
+        example={
+            "Monday": ["Team stand-up at 9am", "Prepare presentation for 10am meeting"],
+            "Tuesday": ["Team stand-up at 9am", "Gym after work", "Client dinner"],
+        },
+        description="The week's task lists after the moves",
+    )
+    projected_stress_levels: Dict[str, float] = Field(
+        default_factory=dict,
+        example={"Monday": 5.3, "Tuesday": 5.7},
+        description="Estimated stress level of each analyzed day after the moves",
+    )
+
+
+class AnalysisJobRequest(ScheduleAnalysisRequest):
+    """Request model for queuing a background analysis."""
+
+    callback_url: Optional[HttpUrl] = Field(
+        None,
+        example="https://example.com/hooks/analysis",
+        description=(
+            "URL the finished job is POSTed to as JSON, with its status and result or error. "
+            "Must be a public address on a host the server allows."
+        ),
+    )
+
+
+class AnalysisJobResponse(BaseModel):
+    """Status of a background analysis and, once it has finished, its result or error."""
+
+    job_id: str = Field(..., example="9b1f0c6e2d4a4e55a3c1d2f0b7e8a912")
+    status: Literal["queued", "running", "succeeded", "failed"] = Field(..., example="queued")
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[ScheduleAnalysisResponse] = Field(None, description="Analysis result, if the job succeeded")
+    error: Optional[str] = Field(None, example=None, description="Error message, if the job failed")
+    callback_url: Optional[str] = None
+    webhook_status: Optional[Literal["delivered", "failed"]] = Field(
+        None, description="Outcome of the webhook call, once it was made"
+    )
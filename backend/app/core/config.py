@@ -1,3 +1,5 @@
+from typing import Any, Dict, List
+
 from pydantic_settings import BaseSettings
 
 
@@ -6,6 +8,180 @@ class Settings(BaseSettings):
 
     AZURE_AI_API_KEY: str = "YOUR_KEY_HERE"
     AZURE_AI_ENDPOINT: str = "YOUR_ENDPOINT_HERE"
+    AZURE_OPENAI_API_VERSION: str = "2024-10-21"
+
+    # Tracing (see app/core/tracing.py): DEBUG adds per-node state dumps, INFO logs node spans.
+    # The default WARNING keeps both off, so spans cost nothing unless opted in
+    TRACE_LEVEL: str = "WARNING"
+    # Optional JSON-lines file receiving every trace record
+    TRACE_JSONL_PATH: str = ""
+
+    # Prometheus metrics on /metrics (see app/core/metrics.py)
+    METRICS_ENABLED: bool = True
+
+    # Build the LLM client and compile the graphs in the app's lifespan hook instead of on the first request
+    WARM_UP_ON_STARTUP: bool = True
+
+    # HTTP transport shared by all LLM calls (see app/core/http.py)
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    LLM_HTTP_HTTP2: bool = True
+    LLM_HTTP_TIMEOUT_SECONDS: float = 60.0
+    LLM_HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    # How long a request may wait for a free pooled connection
+    LLM_HTTP_POOL_TIMEOUT_SECONDS: float = 10.0
+
+    # Chat model behind every node: "openai", "azure" (AZURE_AI_* settings), "local" (an
+    # OpenAI-compatible server at LOCAL_LLM_BASE_URL) or "fake" (offline, see app/langgraph_agent/fake_llm.py)
+    LLM_BACKEND: str = "openai"
+    # Fake backend: simulated latency per call, random extra latency, and share of calls that fail
+    FAKE_LLM_LATENCY_SECONDS: float = 0.0
+    FAKE_LLM_LATENCY_JITTER_SECONDS: float = 0.0
+    FAKE_LLM_FAILURE_RATE: float = 0.0
+    FAKE_LLM_SEED: int = 0
+
+    # Per-node model routing (see app/langgraph_agent/model_router.py). Named model profiles besides
+    # the LLM_BACKEND model ("default"), e.g.
+    #   {"mini": {"backend": "azure", "model": "gpt-4o-mini", "deployment": "my-4o-mini", "quality": 3},
+    #    "nano": {"backend": "openai", "model": "gpt-4.1-nano", "quality": 1, "max_in_flight": 64},
+    #    "local": {"backend": "local", "model": "llama3.1:8b", "quality": 1}}
+    # Backends: "openai", "azure" (AZURE_AI_ENDPOINT/AZURE_AI_API_KEY), "local" (OpenAI-compatible
+    # server) and "fake". "quality" defaults to 3; prices ("input_cost_per_1m"/"output_cost_per_1m",
+    # USD) default to the known list prices; calls beyond "max_in_flight" count as saturated.
+    LLM_MODELS: Dict[str, Dict[str, Any]] = {}
+    # Lowest profile quality each node accepts; the cheapest profile that meets it is used
+    LLM_NODE_MIN_QUALITY: Dict[str, int] = {
+        "categorize": 1,
+        "categorize_and_analyze": 3,
+        "analyze": 3,
+        "suggest": 2,
+        "rebalance": 3,
+    }
+    # Nodes pinned to a profile, regardless of quality and price
+    LLM_NODE_MODELS: Dict[str, str] = {}
+    # Profile taking the calls while every qualifying profile is saturated ("" = none)
+    LLM_FALLBACK_MODEL: str = ""
+    # Base URL of "local" profiles, e.g. Ollama's OpenAI-compatible API
+    LOCAL_LLM_BASE_URL: str = "http://localhost:11434/v1"
+
+    # Default analysis graph: "standard" (categorize -> analyze), "fast" (one fused call)
+    # or "speculative" (suggest/rebalance start concurrently with the analysis)
+    ANALYSIS_MODE: str = "standard"
+    # Speculative mode starts both branches when the estimated stress is in this range,
+    # otherwise only the branch the estimate predicts
+    SPECULATION_BOTH_MIN_STRESS: int = 6
+    SPECULATION_BOTH_MAX_STRESS: int = 8
+    # A speculated branch is built on the rule-based estimate, not the LLM analysis. It is kept
+    # only if the analysis agrees with the estimate on `needs_rebalancing` and its stress level is
+    # at most this far off; otherwise the branch runs again on the analysis. -1 always re-runs it.
+    SPECULATION_MAX_STRESS_DRIFT: int = 1
+
+    # LLM response cache (see app/langgraph_agent/cache.py)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 1024
+    LLM_CACHE_TTL_SECONDS: float = 24 * 60 * 60
+    # Path of the optional on-disk SQLite tier; leave empty to keep the cache in memory only
+    LLM_CACHE_SQLITE_PATH: str = ""
+
+    # Per-task categorization memo (see app/langgraph_agent/task_index.py)
+    TASK_INDEX_ENABLED: bool = True
+    TASK_INDEX_MAX_ENTRIES: int = 10_000
+
+    # Near-duplicate lookups on hashed character n-gram vectors (see app/langgraph_agent/semantic_index.py):
+    # tasks reuse the category of a similar known task, schedules the analysis of a similar schedule
+    SEMANTIC_CACHE_ENABLED: bool = False
+    # Look up near duplicates and record their agreement with the LLM without using them
+    SEMANTIC_CACHE_SHADOW_MODE: bool = False
+    # Minimum cosine similarity of a near hit
+    SEMANTIC_TASK_THRESHOLD: float = 0.9
+    SEMANTIC_SCHEDULE_THRESHOLD: float = 0.95
+    SEMANTIC_TASK_MAX_ENTRIES: int = 10_000
+    SEMANTIC_SCHEDULE_MAX_ENTRIES: int = 1_000
+    SEMANTIC_VECTOR_DIM: int = 512
+
+    # Local heuristic pre-classifier (see app/langgraph_agent/heuristics.py)
+    HEURISTICS_ENABLED: bool = True
+    # Only schedules with at most this many tasks may skip the LLM categorization and analysis
+    HEURISTIC_MAX_TASKS: int = 3
+    HEURISTIC_MIN_CONFIDENCE: float = 0.85
+    # Only short-circuit when the estimated stress is well below the rebalance threshold (8)
+    HEURISTIC_MAX_STRESS: int = 4
+    # Compute and record heuristic decisions without acting on them, to measure agreement with the LLM
+    HEURISTIC_SHADOW_MODE: bool = False
+
+    # Prompt compaction (see app/langgraph_agent/compaction.py): task lists are sent as
+    # "[Category]" blocks of "<id> <task>" lines instead of the repr of a dict
+    PROMPT_COMPACTION_ENABLED: bool = True
+    # Estimated token budget of each node's task list. Categorization splits larger
+    # lists into parallel chunks; later stages only keep a sample per category.
+    PROMPT_TOKEN_BUDGETS: Dict[str, int] = {
+        "categorize": 1500,
+        "categorize_and_analyze": 2000,
+        "analyze": 2000,
+        "suggest": 1000,
+        "rebalance": 1500,
+    }
+    # Budget of the analysis report repeated in the suggest and rebalance prompts
+    PROMPT_REPORT_TOKEN_BUDGET: int = 150
+
+    # Resilience of node LLM calls (see app/langgraph_agent/resilience.py)
+    LLM_RESILIENCE_ENABLED: bool = True
+    # Deadline of one attempt per node, in seconds
+    LLM_NODE_TIMEOUT_SECONDS: Dict[str, float] = {
+        "categorize": 20.0,
+        "categorize_and_analyze": 30.0,
+        "analyze": 30.0,
+        "suggest": 20.0,
+        "rebalance": 30.0,
+    }
+    # Attempts per call, including the first; retries back off exponentially with full jitter
+    LLM_RETRY_MAX_ATTEMPTS: int = 3
+    LLM_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    LLM_RETRY_MAX_DELAY_SECONDS: float = 8.0
+    # Send a duplicate request when a call runs longer than the node's recent p95 latency
+    LLM_HEDGE_ENABLED: bool = False
+    # Hedge delay used until a node has enough latency samples
+    LLM_HEDGE_DELAY_SECONDS: float = 3.0
+    # Consecutive failed calls that open a node's circuit breaker, and how long it stays open.
+    # While open, cached responses are still served and misses get local heuristic results.
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+    # Worker threads running sync LLM calls under a deadline
+    LLM_RESILIENCE_MAX_THREADS: int = 32
+
+    # Session checkpoints for incremental re-analysis (see app/langgraph_agent/checkpoints.py):
+    # "memory", or "sqlite" (needs langgraph-checkpoint-sqlite and aiosqlite)
+    CHECKPOINT_BACKEND: str = "memory"
+    CHECKPOINT_SQLITE_PATH: str = "checkpoints.sqlite"
+    # Least recently used sessions beyond this many are deleted
+    SESSION_MAX_ENTRIES: int = 10_000
+
+    # Concurrent requests for the same normalized task list share one graph execution
+    COALESCE_REQUESTS_ENABLED: bool = True
+
+    # Batch analysis endpoint
+    BATCH_MAX_ITEMS: int = 100
+    BATCH_MAX_CONCURRENCY: int = 8
+
+    # Weekly analysis endpoint: every day is analyzed concurrently, up to BATCH_MAX_CONCURRENCY at a time
+    WEEK_MAX_DAYS: int = 7
+    # Rescheduled tasks are only moved onto days whose projected stress level stays at or below this
+    WEEK_TARGET_STRESS_LEVEL: float = 6.0
+
+    # Background analysis jobs (see app/services/jobs.py)
+    JOB_WORKERS: int = 4
+    # Jobs waiting for a worker beyond this many are rejected with 503
+    JOB_QUEUE_MAX_DEPTH: int = 100
+    # How long a finished job's result can be polled before it is evicted
+    JOB_RESULT_TTL_SECONDS: float = 3600.0
+    JOB_WEBHOOK_TIMEOUT_SECONDS: float = 10.0
+    # Attempts per webhook, including the first; errors, 5xx and 429 answers are retried
+    JOB_WEBHOOK_MAX_ATTEMPTS: int = 3
+    # Hosts webhooks may be sent to ("hooks.example.com", or "*.example.com" for its subdomains); empty allows any
+    JOB_WEBHOOK_ALLOWED_HOSTS: List[str] = []
+    # Webhooks to loopback, private, link-local and other non-public addresses are refused unless this is set
+    JOB_WEBHOOK_ALLOW_PRIVATE: bool = False
 
     class Config:
         env_file = ".env"
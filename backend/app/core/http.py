@@ -0,0 +1,217 @@
+import importlib.util
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """
+    Counts in-flight requests on the LLM HTTP transport. A request counts as
+    in flight until its response body is closed, so streamed completions are
+    included. Requests that start while every pooled connection is busy are
+    counted as saturated: they have to wait for a free connection.
+    """
+
+    def __init__(self, max_connections: int):
+        self.max_connections = max_connections
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests_total = 0
+        self.saturated_total = 0
+        self.errors_total = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self.in_flight >= self.max_connections:
+                self.saturated_total += 1
+            self.in_flight += 1
+            self.requests_total += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finish(self, error: bool = False) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.errors_total += int(error)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "max_connections": self.max_connections,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "utilization": self.in_flight / self.max_connections if self.max_connections else 0.0,
+                "requests_total": self.requests_total,
+                "saturated_total": self.saturated_total,
+                "errors_total": self.errors_total,
+            }
+
+
+def _once(callback: Callable[[], None]) -> Callable[[], None]:
+    called = False
+
+    def wrapper() -> None:
+        nonlocal called
+        if not called:
+            called = True
+            callback()
+
+    return wrapper
+
+
+class _TrackedSyncStream(httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream, on_close: Callable[[], None]):
+        self._stream = stream
+        self._on_close = on_close
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._on_close()
+
+
+class _TrackedAsyncStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[], None]):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._on_close()
+
+
+class InstrumentedTransport(httpx.HTTPTransport):
+    """Connection-pooled sync transport that reports to `PoolStats`."""
+
+    def __init__(self, stats: PoolStats, **kwargs):
+        super().__init__(**kwargs)
+        self.pool_stats = stats
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.pool_stats.start()
+        try:
+            response = super().handle_request(request)
+        except Exception:
+            self.pool_stats.finish(error=True)
+            raise
+        response.stream = _TrackedSyncStream(response.stream, _once(self.pool_stats.finish))
+        return response
+
+
+class InstrumentedAsyncTransport(httpx.AsyncHTTPTransport):
+    """Connection-pooled async transport that reports to `PoolStats`."""
+
+    def __init__(self, stats: PoolStats, **kwargs):
+        super().__init__(**kwargs)
+        self.pool_stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.pool_stats.start()
+        try:
+            response = await super().handle_async_request(request)
+        except Exception:
+            self.pool_stats.finish(error=True)
+            raise
+        response.stream = _TrackedAsyncStream(response.stream, _once(self.pool_stats.finish))
+        return response
+
+
+def _http2_enabled() -> bool:
+    if not settings.LLM_HTTP_HTTP2:
+        return False
+    # HTTP/2 needs the optional `h2` package (installed with `httpx[http2]`)
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("LLM_HTTP_HTTP2 is enabled but the 'h2' package is not installed; falling back to HTTP/1.1")
+        return False
+    return True
+
+
+def _transport_options() -> dict:
+    return {
+        "http2": _http2_enabled(),
+        "limits": httpx.Limits(
+            max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    }
+
+
+def http_timeout() -> httpx.Timeout:
+    """Timeouts applied to every LLM request."""
+    return httpx.Timeout(
+        settings.LLM_HTTP_TIMEOUT_SECONDS,
+        connect=settings.LLM_HTTP_CONNECT_TIMEOUT_SECONDS,
+        pool=settings.LLM_HTTP_POOL_TIMEOUT_SECONDS,
+    )
+
+
+# One pool per client flavour, shared by every LLM call in the process
+sync_pool_stats = PoolStats(settings.LLM_HTTP_MAX_CONNECTIONS)
+async_pool_stats = PoolStats(settings.LLM_HTTP_MAX_CONNECTIONS)
+
+_sync_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """Returns the shared, connection-pooled sync client for LLM calls."""
+    global _sync_client
+    if _sync_client is None:
+        with _lock:
+            if _sync_client is None:
+                _sync_client = httpx.Client(
+                    transport=InstrumentedTransport(sync_pool_stats, **_transport_options()),
+                    timeout=http_timeout(),
+                )
+    return _sync_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Returns the shared, connection-pooled async client for LLM calls."""
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                _async_client = httpx.AsyncClient(
+                    transport=InstrumentedAsyncTransport(async_pool_stats, **_transport_options()),
+                    timeout=http_timeout(),
+                )
+    return _async_client
+
+
+async def aclose_http_clients() -> None:
+    """
+    Closes the shared clients and their pooled connections. Models built on
+    them are rebuilt on fresh clients the next time they are used.
+    """
+    global _sync_client, _async_client
+    with _lock:
+        sync_client, async_client = _sync_client, _async_client
+        _sync_client = _async_client = None
+    if sync_client is not None:
+        sync_client.close()
+    if async_client is not None:
+        await async_client.aclose()
+
+
+def pool_stats() -> Dict[str, Dict[str, float]]:
+    """Returns the pool counters of both transports."""
+    return {"sync": sync_pool_stats.stats(), "async": async_pool_stats.stats()}
@@ -0,0 +1,42 @@
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # Falls back to pydantic's serializer
+    orjson = None
+
+
+def _model_fields(value: Any) -> Any:
+    # A model's `__dict__` holds exactly its field values, so nested models are written without a copy
+    if isinstance(value, BaseModel):
+        return value.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serializes a response model (or plain JSON data containing models) to
+    JSON bytes with orjson, straight from the model's fields. Models are
+    expected to be validated already, so they are not dumped to dicts first.
+    """
+    if orjson is None:
+        return to_json(content)
+    # UTC datetimes end in "Z", as pydantic writes them
+    return orjson.dumps(content, default=_model_fields, option=orjson.OPT_UTC_Z)
+
+
+class ModelJSONResponse(Response):
+    """
+    JSON response for a model the endpoint has already validated. Returning
+    it skips FastAPI's second validation and serialization against the
+    route's `response_model`, which is then only used for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,241 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import pprint
+import queue
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+
+# Parent logger of everything the app logs; handlers are attached here by `configure_tracing`
+logger = logging.getLogger("app")
+_trace_logger = logging.getLogger("app.trace")
+
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+# --- Debug dumps ---
+
+
+def _to_plain(data: Any) -> Any:
+    if hasattr(data, "model_dump"):
+        return data.model_dump()
+    return data
+
+
+def debug_dump(title: str, data: Any) -> None:
+    """
+    Logs a node's input or output at DEBUG level. Nothing is formatted unless
+    DEBUG is enabled, so the call costs a single level check otherwise.
+    """
+    if _trace_logger.isEnabledFor(logging.DEBUG):
+        _trace_logger.debug("%s\n%s", title, pprint.pformat(_to_plain(data)))
+
+
+# --- Spans ---
+
+
+class Span:
+    """Timing and token accounting for one graph node execution."""
+
+    __slots__ = ("name", "request_id", "start", "duration_ms", "prompt_tokens", "completion_tokens", "cache_hit", "degraded", "error")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.request_id = request_id_var.get()
+        self.start = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cache_hit: Optional[bool] = None
+        # Set when an LLM call failed and the node fell back to a local result
+        self.degraded = False
+        self.error: Optional[str] = None
+
+    def add_usage(self, usage_metadata: Dict[str, Dict[str, Any]]) -> None:
+        """Adds the per-model usage collected by a `UsageMetadataCallbackHandler`."""
+        for usage in usage_metadata.values():
+            self.prompt_tokens += usage.get("input_tokens", 0)
+            self.completion_tokens += usage.get("output_tokens", 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "span": self.name,
+            "request_id": self.request_id,
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cache_hit": self.cache_hit,
+            "degraded": self.degraded,
+            "error": self.error,
+        }
+
+
+def current_span() -> Optional[Span]:
+    """Returns the span of the node currently executing in this context, if any."""
+    return _current_span.get()
+
+
+node_duration = metrics_registry.histogram("graph_node_duration_seconds", "Graph node latency", ("node",))
+node_in_flight = metrics_registry.gauge("graph_nodes_in_flight", "Graph node executions running", ("node",))
+node_prompt_tokens = metrics_registry.counter("llm_prompt_tokens_total", "Prompt tokens sent by graph nodes", ("node",))
+node_completion_tokens = metrics_registry.counter(
+    "llm_completion_tokens_total", "Completion tokens received by graph nodes", ("node",)
+)
+
+
+@contextmanager
+def node_span(name: str) -> Iterator[Span]:
+    """
+    Measures a graph node, records it in the node metrics and logs the
+    finished span at INFO level.
+    """
+    span = Span(name)
+    token = _current_span.set(span)
+    node_in_flight.inc(name)
+    try:
+        yield span
+    except BaseException as exc:
+        span.error = type(exc).__name__
+        raise
+    finally:
+        span.duration_ms = (time.perf_counter() - span.start) * 1000
+        _current_span.reset(token)
+        node_in_flight.dec(name)
+        node_duration.observe(span.duration_ms / 1000, name)
+        node_prompt_tokens.inc(name, amount=span.prompt_tokens)
+        node_completion_tokens.inc(name, amount=span.completion_tokens)
+        if _trace_logger.isEnabledFor(logging.INFO):
+            _trace_logger.info(
+                "node=%s duration_ms=%.1f prompt_tokens=%d completion_tokens=%d cache_hit=%s degraded=%s error=%s",
+                span.name, span.duration_ms, span.prompt_tokens, span.completion_tokens, span.cache_hit,
+                span.degraded, span.error,
+                extra={"span": span.to_dict()},
+            )
+
+
+# --- Request IDs ---
+
+
+class RequestIDMiddleware:
+    """
+    ASGI middleware that assigns every HTTP request an ID (taken from the
+    `X-Request-ID` header when present), exposes it to log records and spans,
+    and echoes it in the response headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = next(
+            (value.decode("latin-1") for name, value in scope["headers"] if name == b"x-request-id"),
+            None,
+        ) or new_request_id()
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
+
+
+# --- Sinks ---
+
+
+class _RequestIDFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        span = getattr(record, "span", None)
+        if span is not None:
+            entry.update(span)
+        return json.dumps(entry, default=str)
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+def configure_tracing() -> None:
+    """
+    Attaches the configured sinks to the `app` logger. Records are handed to a
+    background thread through a queue, so logging never blocks a request on
+    stdout or file I/O. Called on app startup; safe to call more than once.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    handlers = []
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"))
+    handlers.append(console)
+    if settings.TRACE_JSONL_PATH:
+        sink = logging.FileHandler(settings.TRACE_JSONL_PATH, encoding="utf-8")
+        sink.setFormatter(JsonLinesFormatter())
+        handlers.append(sink)
+
+    _queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+    _queue_handler.addFilter(_RequestIDFilter())
+    logger.addHandler(_queue_handler)
+    logger.setLevel(settings.TRACE_LEVEL.upper())
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_tracing)
+
+
+def shutdown_tracing() -> None:
+    """
+    Flushes and stops the sink thread started by `configure_tracing` and hands
+    the `app` logger back to the root logger's handlers. Called on app
+    shutdown; safe to call more than once.
+    """
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    atexit.unregister(shutdown_tracing)
+    logger.removeHandler(_queue_handler)
+    logger.setLevel(logging.NOTSET)
+    logger.propagate = True
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = _queue_handler = None
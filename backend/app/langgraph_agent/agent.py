@@ -1,10 +1,46 @@
-from langgraph.graph import StateGraph, END
-from typing import TypedDict, List, Dict
+from typing import TypedDict, List, Dict, Optional, Tuple, Type
+import asyncio
+import hashlib
 import json
-from app.langgraph_agent.schemas import CategorizedTasks, AnalysisResult, EnhancedAnalysisResult, PriorityRebalanceResult
-from app.langgraph_agent.llm import llm
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pydantic import BaseModel
+from app.langgraph_agent.schemas import CategorizedTasks, AnalysisResult, EnhancedAnalysisResult, FusedAnalysisResult, PriorityRebalanceResult
+from app.core.config import settings
+from app.langgraph_agent.model_router import ModelRoute, model_router
+from app.langgraph_agent.cache import llm_cache, make_cache_key
+from app.langgraph_agent.task_index import normalize_task, task_category_index
+from app.langgraph_agent.semantic_index import schedule_text, semantic_analysis_cache, semantic_task_index
+from app.langgraph_agent.heuristics import (
+    assess_schedule,
+    categorize_by_rules,
+    estimated_analysis,
+    heuristic_stats,
+    local_analysis,
+)
+from app.langgraph_agent.resilience import llm_resilience
+from app.langgraph_agent.speculation import speculation_stats, speculative_branches
+from app.langgraph_agent.compaction import (
+    chunk_tasks,
+    encode_categorized_tasks,
+    estimate_tokens,
+    measure_prompt,
+    prompt_stats,
+    resolve_task_refs,
+    summarize_text,
+    token_budget,
+)
 from langchain_core.prompts import ChatPromptTemplate
-from app.langgraph_agent.utils import pretty_print
+from langchain_core.callbacks import UsageMetadataCallbackHandler
+from langchain_core.runnables import Runnable, RunnableLambda
+from langchain_core.tracers.context import register_configure_hook
+from app.core.metrics import metrics_registry
+from app.core.tracing import current_span, debug_dump, node_span
+
+logger = logging.getLogger(__name__)
 
 # --- Prompts ---
 
@@ -29,7 +65,7 @@ analysis_prompt = ChatPromptTemplate.from_messages(
             "3. Workload assessment: 'light', 'moderate', 'heavy', or 'overwhelming'\n"
             "4. Key concerns (list of main issues)\n"
             "5. Whether the schedule needs rebalancing (true/false)\n\n"
-            "Consider factors like: task density, work-life balance, break time, task complexity, and potential conflicts.",
+            "Consider factors like: task density, work-life balance, break time, task complexity, and potential conflicts.{format_hint}",
         ),
         (
             "human",
@@ -49,7 +85,7 @@ priority_rebalance_prompt = ChatPromptTemplate.from_messages(
             "3. Tasks that should be rescheduled to another day\n"
             "4. Tasks that could be delegated to others\n"
             "5. Recovery suggestions for stress management\n\n"
-            "Be direct but supportive. Focus on practical, actionable solutions.",
+            "Be direct but supportive. Focus on practical, actionable solutions.{format_hint}",
         ),
         (
             "human",
@@ -58,11 +94,29 @@ priority_rebalance_prompt = ChatPromptTemplate.from_messages(
     ]
 )
 
+fused_analysis_prompt = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            "You are a work-life balance assistant. First sort the user's tasks into relevant categories like 'Work', 'Personal', 'Health' and 'Chores', "
+            "then analyze the resulting daily schedule and provide:\n"
+            "1. The categorized tasks as a dictionary of category to list of tasks\n"
+            "2. A brief analysis report identifying stress points, lack of breaks, or work-life conflicts\n"
+            "3. A stress level (1-10): 1=very relaxed, 10=extremely overwhelming\n"
+            "4. Workload assessment: 'light', 'moderate', 'heavy', or 'overwhelming'\n"
+            "5. Key concerns (list of main issues)\n"
+            "6. Whether the schedule needs rebalancing (true/false)\n\n"
+            "Consider factors like: task density, work-life balance, break time, task complexity, and potential conflicts.",
+        ),
+        ("human", "Please categorize and analyze the following tasks:\n\n{tasks}"),
+    ]
+)
+
 suggestion_prompt = ChatPromptTemplate.from_messages(
     [
         (
             "system",
-            "You are a helpful and non-judgmental work-life balance coach. Based on the categorized tasks and the analysis report, generate 2-3 clear, actionable suggestions to help the user improve their day. Focus on protecting personal time and reducing stress.",
+            "You are a helpful and non-judgmental work-life balance coach. Based on the categorized tasks and the analysis report, generate 2-3 clear, actionable suggestions to help the user improve their day. Focus on protecting personal time and reducing stress.{format_hint}",
         ),
         (
             "human",
@@ -71,6 +125,14 @@ suggestion_prompt = ChatPromptTemplate.from_messages(
     ]
 )
 
+# Explains the compacted schedule format (see `_compact_schedule`); left out when tasks are sent as-is
+_COMPACT_FORMAT = "Tasks are given as '<ID> <task>' lines under [Category] headers; "
+COMPACT_FORMAT_HINTS = {
+    "analyze": "\n\n" + _COMPACT_FORMAT + "name tasks by text, not ID.",
+    "rebalance": "\n\n" + _COMPACT_FORMAT + "list tasks to reschedule or delegate by ID only.",
+    "suggest": " " + _COMPACT_FORMAT + "name tasks by text, not ID.",
+}
+
 # --- Agent State ---
 
 
@@ -93,18 +155,315 @@ class AgentState(TypedDict):
     tasks_to_reschedule: List[str]
     tasks_to_delegate: List[str]
     recovery_suggestions: List[str]
+    # Local heuristic pre-classifier (see app/langgraph_agent/heuristics.py)
+    heuristic_categories: Dict[str, str]
+    heuristic_stress_level: int
+    short_circuited: bool
+    # Nodes answered by local fallbacks because their LLM call failed
+    degraded_nodes: List[str]
+    # Incremental re-analysis of checkpointed sessions: what the stored analysis and
+    # suggestions/rebalancing were computed from, and the nodes a run could skip
+    analysis_fingerprint: str
+    advice_fingerprint: str
+    reused_nodes: List[str]
 
 
-# --- Nodes ---
+# --- LLM Calls ---
 
+# Token usage of the LLM call running in the current context. Registered once as
+# an inheritable configure hook, so the handler is attached to every callback
+# manager created while it is set, without overriding the graph's own callbacks.
+_usage_handler_var: ContextVar[Optional[UsageMetadataCallbackHandler]] = ContextVar(
+    "node_usage_handler", default=None
+)
+register_configure_hook(_usage_handler_var, inheritable=True)
 
-def categorize_tasks(state: dict) -> dict:
+
+@contextmanager
+def _track_usage():
+    """Collects the token usage of the enclosed LLM call into the current node span."""
+    handler = UsageMetadataCallbackHandler()
+    token = _usage_handler_var.set(handler)
+    try:
+        yield handler
+    finally:
+        _usage_handler_var.reset(token)
+        span = current_span()
+        if span is not None:
+            span.add_usage(handler.usage_metadata)
+
+
+def _model_fingerprint(llm) -> str:
+    """Identifies the model configuration that produced a cached result."""
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__
+    return f"{model}:temperature={getattr(llm, 'temperature', None)}"
+
+
+def _record_cache_hit(hit: bool) -> None:
+    span = current_span()
+    if span is not None:
+        span.cache_hit = hit
+
+
+# Prompt and output schema of the structured LLM call made by each node
+NODE_CALLS: Dict[str, Tuple[ChatPromptTemplate, Type[BaseModel]]] = {
+    "categorize": (categorization_prompt, CategorizedTasks),
+    "analyze": (analysis_prompt, EnhancedAnalysisResult),
+    "categorize_and_analyze": (fused_analysis_prompt, FusedAnalysisResult),
+    "suggest": (suggestion_prompt, AnalysisResult),
+    "rebalance": (priority_rebalance_prompt, PriorityRebalanceResult),
+}
+
+# Prompt text per node, rendered once for the cache keys
+_PROMPT_FINGERPRINTS = {node: prompt.pretty_repr() for node, (prompt, _) in NODE_CALLS.items()}
+
+# (node, model profile) -> (model it was built for, runnable)
+_structured_runnables: Dict[Tuple[str, str], Tuple[object, Runnable]] = {}
+
+
+def structured_runnable(node: str, route: Optional[ModelRoute] = None) -> Runnable:
     """
-    Calls an LLM to categorize a list of tasks into a structured format.
+    Returns the `prompt | llm.with_structured_output(schema)` runnable of a
+    node for the model `route` picked (by default the node's primary model).
+    It is built once and shared by every request, and only rebuilt if the
+    model is replaced.
+    """
+    route = route or model_router.primary(node)
+    entry = _structured_runnables.get((node, route.profile))
+    if entry is None or entry[0] is not route.model:
+        prompt, schema = NODE_CALLS[node]
+        entry = (route.model, prompt | route.model.with_structured_output(schema, method="function_calling"))
+        _structured_runnables[(node, route.profile)] = entry
+    return entry[1]
+
+
+def _fallback_response(node: str, input_data: dict, state: dict) -> BaseModel:
+    """
+    Local stand-in for a node's LLM response, built from the heuristic rules,
+    for when the call failed for good or the node's circuit breaker is open.
+    """
+    if node == "categorize":
+        return CategorizedTasks(categorized_tasks=categorize_by_rules(input_data["tasks"].splitlines()))
+    if node == "categorize_and_analyze":
+        tasks = input_data["tasks"].splitlines()
+        return FusedAnalysisResult(categorized_tasks=categorize_by_rules(tasks), **estimated_analysis(tasks))
+    if node == "analyze":
+        tasks = [task for tasks in state.get("categorized_tasks", {}).values() for task in tasks]
+        return EnhancedAnalysisResult(**estimated_analysis(tasks))
+    if node == "suggest":
+        return AnalysisResult(
+            suggestions=[
+                "Schedule a 10-15 minute break between your longer tasks.",
+                "Protect at least one hour today for personal time.",
+            ]
+        )
+    return PriorityRebalanceResult(
+        rebalance_report="Your schedule looks demanding. Consider what can move to another day.",
+        urgent_actions=["Postpone any task that is not due today"],
+        recovery_suggestions=["Take a short walk away from screens"],
+    )
+
+
+def _degrade(node: str, input_data: dict, state: Optional[dict]) -> BaseModel:
+    logger.warning("LLM call of node %s failed, falling back to a local result", node, exc_info=True)
+    llm_resilience.record_fallback(node)
+    span = current_span()
+    if span is not None:
+        span.degraded = True
+    return _fallback_response(node, input_data, state or {})
+
+
+def _node_degraded() -> bool:
+    span = current_span()
+    return span is not None and span.degraded
+
+
+def _call_llm(node: str, input_data: dict, state: Optional[dict] = None) -> BaseModel:
+    """
+    Runs the structured LLM call of a node, answering from the LLM response
+    cache when the same node already saw the same input. The call goes to the
+    model `model_router` picks for the node. With `LLM_RESILIENCE_ENABLED`,
+    the call runs under the node's deadline, retry, hedging and
+    circuit-breaker policy, and degrades to a local result instead of failing
+    the request.
+    """
+    schema = NODE_CALLS[node][1]
+    key = make_cache_key(node, _PROMPT_FINGERPRINTS[node], _model_fingerprint(model_router.primary(node).model), input_data)
+    cached = llm_cache.get(key, schema)
+    _record_cache_hit(cached is not None)
+    if cached is not None:
+        return cached
+
+    if not settings.LLM_RESILIENCE_ENABLED:
+        with _track_usage() as usage, model_router.route(node, usage) as route:
+            response = structured_runnable(node, route).invoke(input_data)
+    else:
+        try:
+            with _track_usage() as usage, model_router.route(node, usage) as route:
+                runnable = structured_runnable(node, route)
+                response = llm_resilience.call(node, lambda: runnable.invoke(input_data))
+        except Exception:
+            return _degrade(node, input_data, state)
+    # Answers of a stand-in model are not kept for the primary one
+    if not route.fallback:
+        llm_cache.set(key, response)
+    return response
+
+
+async def _acall_llm(node: str, input_data: dict, state: Optional[dict] = None) -> BaseModel:
     """
-    pretty_print("--- Current State before Categorize Node ---", state)
-    tasks = state.get("tasks", [])
+    Async version of `_call_llm`.
+    """
+    schema = NODE_CALLS[node][1]
+    key = make_cache_key(node, _PROMPT_FINGERPRINTS[node], _model_fingerprint(model_router.primary(node).model), input_data)
+    cached = llm_cache.get(key, schema)
+    _record_cache_hit(cached is not None)
+    if cached is not None:
+        return cached
+
+    if not settings.LLM_RESILIENCE_ENABLED:
+        with _track_usage() as usage, model_router.route(node, usage) as route:
+            response = await structured_runnable(node, route).ainvoke(input_data)
+    else:
+        try:
+            with _track_usage() as usage, model_router.route(node, usage) as route:
+                runnable = structured_runnable(node, route)
+                response = await llm_resilience.acall(node, lambda: runnable.ainvoke(input_data))
+        except Exception:
+            return _degrade(node, input_data, state)
+    if not route.fallback:
+        llm_cache.set(key, response)
+    return response
+
+
+# --- Prompt Compaction ---
+
+
+def _record_prompt(node: str, raw_input: dict, sent_inputs: List[dict], compacted: bool = False) -> None:
+    """Records the estimated prompt tokens of a stage, and what the uncompacted prompt would have cost."""
+    prompt = NODE_CALLS[node][0]
+    prompt_stats.record(
+        node,
+        raw_tokens=measure_prompt(prompt, raw_input),
+        prompt_tokens=sum(measure_prompt(prompt, input_data) for input_data in sent_inputs),
+        calls=len(sent_inputs),
+        compacted=compacted,
+    )
+
+
+def _compact_schedule(node: str, state: dict) -> Tuple[dict, dict, bool]:
+    """
+    Returns the raw and the compacted `categorized_tasks`/`analysis_report`
+    inputs of a node, and whether its token budget forced tasks to be left out.
+    """
+    raw = {"categorized_tasks": state.get("categorized_tasks", {}), "format_hint": ""}
+    if "analysis_report" in NODE_CALLS[node][0].input_variables:
+        raw["analysis_report"] = state.get("analysis_report", "")
+    if not settings.PROMPT_COMPACTION_ENABLED:
+        return raw, dict(raw), False
+
+    encoded, omitted = encode_categorized_tasks(raw["categorized_tasks"], token_budget(node))
+    compact = {"categorized_tasks": encoded, "format_hint": COMPACT_FORMAT_HINTS[node]}
+    if "analysis_report" in raw:
+        compact["analysis_report"] = summarize_text(raw["analysis_report"] or "", settings.PROMPT_REPORT_TOKEN_BUDGET)
+    return raw, compact, omitted > 0
+
+
+def _categorize_chunks(unseen: List[str]) -> List[dict]:
+    """Inputs of the categorization calls for `unseen`, split to fit the node's token budget."""
+    if not unseen:
+        return []
+    raw = {"tasks": "\n".join(unseen)}
+    if not settings.PROMPT_COMPACTION_ENABLED:
+        inputs = [raw]
+    else:
+        inputs = [{"tasks": "\n".join(chunk)} for chunk in chunk_tasks(unseen, token_budget("categorize"))]
+    _record_prompt("categorize", raw, inputs, compacted=len(inputs) > 1)
+    return inputs
+
+
+def _fused_over_budget(tasks: List[str]) -> bool:
+    """Whether a task list is too large for the single fast-mode call."""
+    budget = token_budget("categorize_and_analyze")
+    return (
+        settings.PROMPT_COMPACTION_ENABLED
+        and budget is not None
+        and estimate_tokens("\n".join(tasks)) > budget
+    )
+
+
+# --- Incremental Re-Analysis ---
+#
+# Session graphs are checkpointed, so a new run on the same session starts from
+# the previous run's state. Nodes compare their inputs with fingerprints stored
+# in that state and skip the LLM call when nothing they depend on changed.
+
+
+def schedule_fingerprint(categorized_tasks: Dict[str, List[str]]) -> str:
+    """Order-, case- and whitespace-insensitive fingerprint of a categorized schedule."""
+    pairs = sorted(
+        (category.casefold(), normalize_task(task))
+        for category, tasks in (categorized_tasks or {}).items()
+        for task in tasks
+    )
+    return hashlib.sha256(json.dumps(pairs).encode("utf-8")).hexdigest()
+
+
+def _advice_fingerprint(node: str, state: dict) -> str:
+    """Fingerprint of everything the suggest or rebalance node reads from the state."""
+    payload = [
+        node,
+        schedule_fingerprint(state.get("categorized_tasks", {})),
+        state.get("analysis_report", ""),
+        state.get("stress_level", 5),
+        state.get("key_concerns", []),
+    ]
+    return hashlib.sha256(json.dumps(payload, default=str).encode("utf-8")).hexdigest()
+
+
+def _reused(node: str, state: dict) -> dict:
+    """State update of a node that kept its previous result."""
+    debug_dump(f"--- {node} inputs unchanged, reusing the previous result ---", {})
+    return {"reused_nodes": list(state.get("reused_nodes") or []) + [node]}
+
+
+def _reused_analysis(state: dict) -> Optional[dict]:
+    if state.get("analysis_fingerprint") == schedule_fingerprint(state.get("categorized_tasks", {})):
+        return _reused("analyze", state)
+    return None
+
+
+def _reused_advice(node: str, state: dict) -> Optional[dict]:
+    if state.get("advice_fingerprint") == _advice_fingerprint(node, state):
+        return _reused(node, state)
+    return None
+
+
+def _with_fingerprint(field: str, fingerprint: str, update: dict) -> dict:
+    """Stores the fingerprint a node's result was computed from, unless it is a local fallback."""
+    update[field] = "" if _node_degraded() else fingerprint
+    return update
+
 
+# A session that was routed to rebalancing before drops that result
+_CLEARED_REBALANCE = {
+    "rebalance_report": None,
+    "urgent_actions": [],
+    "tasks_to_reschedule": [],
+    "tasks_to_delegate": [],
+    "recovery_suggestions": [],
+}
+
+
+# --- Nodes ---
+#
+# Every node is split into a pure "input" step that reads the state and a pure
+# "output" step that maps the structured LLM response back onto the state. The
+# sync and async variants only differ in how they call the LLM (`invoke` vs
+# `ainvoke`), so both graph entry points (`invoke`/`ainvoke`) share one code path.
+
+
+def _sanitize_tasks(tasks) -> List[str]:
     # Input sanitization
     if isinstance(tasks, str):
         try:
@@ -116,34 +475,168 @@ def categorize_tasks(state: dict) -> dict:
             tasks = json.loads(tasks[0])
         except (json.JSONDecodeError, TypeError):
             pass
+    return tasks
 
-    pretty_print("1. INPUT to Categorize Node", {"tasks": tasks})
 
-    structured_llm = categorization_prompt | llm.with_structured_output(
-        CategorizedTasks, method="function_calling"
-    )
-    response = structured_llm.invoke({"tasks": "\n".join(tasks)})
+def precheck_schedule(state: dict) -> dict:
+    """
+    Runs the local heuristic pre-classifier before any LLM call. Confidently
+    recognized tasks are categorized here, and trivial schedules get a local
+    analysis so the graph can route straight to the suggestions.
+    """
+    # Per-run flags start fresh, also when a session continues from a checkpoint
+    update = {"short_circuited": False, "degraded_nodes": [], "reused_nodes": []}
+    if not settings.HEURISTICS_ENABLED:
+        return update
+    tasks = _sanitize_tasks(state.get("tasks", []))
+    assessment = assess_schedule(tasks)
+    heuristic_stats.record_assessment(len(tasks), assessment)
+    debug_dump("0. OUTPUT from Precheck Node", assessment)
 
-    pretty_print("1. OUTPUT from Categorize Node", response.dict())
-    return {"categorized_tasks": response.categorized_tasks}
+    update.update({
+        "heuristic_categories": assessment.categories,
+        "heuristic_stress_level": assessment.stress_level,
+    })
+    if assessment.short_circuit and not settings.HEURISTIC_SHADOW_MODE:
+        update.update(local_analysis(tasks, assessment))
+        update["short_circuited"] = True
+        # The local analysis replaces any stored LLM analysis
+        update["analysis_fingerprint"] = ""
+    return update
 
 
-def get_analysis(state: dict) -> dict:
+def after_precheck(state: dict) -> str:
     """
-    Calls an LLM to analyze the categorized schedule and generate an enhanced report
-    with stress level, workload assessment, and rebalancing recommendations.
+    Routes short-circuited schedules straight to the suggestions; everything
+    else continues to the LLM categorization.
     """
-    pretty_print("--- Current State before Enhanced Analyze Node ---", state)
-    categorized_tasks = state.get("categorized_tasks", {})
-    pretty_print("2. INPUT to Enhanced Analyze Node", {"categorized_tasks": categorized_tasks})
+    return "suggest" if state.get("short_circuited") else "categorize"
+
+
+def _categorize_input(state: dict) -> List[str]:
+    debug_dump("--- Current State before Categorize Node ---", state)
+    tasks = _sanitize_tasks(state.get("tasks", []))
+    debug_dump("1. INPUT to Categorize Node", {"tasks": tasks})
+    return tasks
+
+
+def _categorize_split(state: dict, tasks: List[str]):
+    """
+    Splits tasks into those with a known category (from the session's previous
+    run, the task category index, the heuristic pre-classifier or a near
+    duplicate in the semantic task index) and those that still need the LLM.
+    """
+    previous = {
+        normalize_task(task): category
+        for category, category_tasks in (state.get("categorized_tasks") or {}).items()
+        for task in category_tasks
+    }
+    kept = {task: previous[normalize_task(task)] for task in tasks if normalize_task(task) in previous}
+    known, unseen = task_category_index.split([task for task in tasks if task not in kept])
+    known.update(kept)
+    heuristic = state.get("heuristic_categories") or {}
+    if heuristic and not settings.HEURISTIC_SHADOW_MODE:
+        known.update({task: heuristic[task] for task in unseen if task in heuristic})
+        unseen = [task for task in unseen if task not in heuristic]
+    if semantic_task_index.enabled and unseen:
+        matches = semantic_task_index.search(unseen)
+        # In shadow mode near hits are only counted; the LLM still categorizes the tasks
+        if not settings.SEMANTIC_CACHE_SHADOW_MODE:
+            known.update({task: match[0] for task, match in zip(unseen, matches) if match is not None})
+            unseen = [task for task in unseen if task not in known]
+    return known, unseen
+
+
+def _remember_categories(categorized_tasks: Dict[str, List[str]]) -> None:
+    """Records LLM-picked categories in the task category index and the semantic task index."""
+    task_category_index.record(categorized_tasks)
+    pairs = [(task, category) for category, tasks in categorized_tasks.items() for task in tasks]
+    if pairs:
+        semantic_task_index.add(*zip(*pairs))
+
+
+def _categorize_output(state: dict, tasks: List[str], known: Dict[str, str], responses: List[CategorizedTasks]) -> dict:
+    fresh: Dict[str, List[str]] = {}
+    for response in responses:
+        debug_dump("1. OUTPUT from Categorize Node", response)
+        for category, category_tasks in (response.categorized_tasks or {}).items():
+            fresh.setdefault(category, []).extend(category_tasks)
+    # Rule-based fallbacks are not remembered as if the LLM had picked them
+    if not _node_degraded():
+        _remember_categories(fresh)
+    categorized_tasks = task_category_index.merge(tasks, known, fresh)
+    if settings.HEURISTIC_SHADOW_MODE and state.get("heuristic_categories"):
+        heuristic_stats.record_categories(state["heuristic_categories"], categorized_tasks)
+    update = {"categorized_tasks": categorized_tasks}
+    if not responses and state.get("categorized_tasks"):
+        update.update(_reused("categorize", state))
+    return update
+
+
+def categorize_tasks(state: dict) -> dict:
+    """
+    Calls an LLM to categorize a list of tasks into a structured format.
+    Tasks already in the task category index are not sent to the LLM again,
+    and lists over the node's token budget are categorized in chunks.
+    """
+    tasks = _categorize_input(state)
+    known, unseen = _categorize_split(state, tasks)
+    responses = [_call_llm("categorize", input_data) for input_data in _categorize_chunks(unseen)]
+    return _categorize_output(state, tasks, known, responses)
 
-    structured_llm = analysis_prompt | llm.with_structured_output(
-        EnhancedAnalysisResult, method="function_calling"
+
+async def acategorize_tasks(state: dict) -> dict:
+    """
+    Async version of `categorize_tasks`. Chunks are categorized concurrently.
+    """
+    tasks = _categorize_input(state)
+    known, unseen = _categorize_split(state, tasks)
+    responses = await asyncio.gather(
+        *(_acall_llm("categorize", input_data) for input_data in _categorize_chunks(unseen))
     )
-    response = structured_llm.invoke({"categorized_tasks": categorized_tasks})
+    return _categorize_output(state, tasks, known, list(responses))
+
+
+async def aprecategorize_tasks(task_lists: List[List[str]]) -> None:
+    """
+    Categorizes the unseen tasks of many schedules up front, once per distinct
+    task, and records them in the task category index and the semantic task
+    index. Tasks are split and chunked as by the categorize node, so only
+    tasks that no index or heuristic rule knows reach the LLM. The categorize
+    node of each schedule then finds its tasks there instead of asking the
+    LLM again.
+    """
+    if not (task_category_index.enabled or semantic_task_index.enabled):
+        return
+    tasks = [task for task_list in task_lists for task in _sanitize_tasks(task_list)]
+    state = {}
+    if settings.HEURISTICS_ENABLED:
+        state["heuristic_categories"] = assess_schedule(tasks).categories
+    _, unseen = _categorize_split(state, tasks)
+    with node_span("precategorize") as span:
+        responses = await asyncio.gather(
+            *(_acall_llm("categorize", input_data) for input_data in _categorize_chunks(unseen))
+        )
+        # Leave tasks to the per-schedule categorize nodes if the LLM was unavailable
+        if span.degraded:
+            return
+    for response in responses:
+        _remember_categories(response.categorized_tasks or {})
+
+
+def _analysis_input(state: dict) -> dict:
+    debug_dump("--- Current State before Enhanced Analyze Node ---", state)
+    raw, input_data, compacted = _compact_schedule("analyze", state)
+    _record_prompt("analyze", raw, [input_data], compacted)
+    debug_dump("2. INPUT to Enhanced Analyze Node", input_data)
+    return input_data
+
+
+def _analysis_output(state: dict, response: EnhancedAnalysisResult) -> dict:
+    debug_dump("2. OUTPUT from Enhanced Analyze Node", response)
+    if "heuristic_stress_level" in state and not _node_degraded():
+        heuristic_stats.record_stress(state["heuristic_stress_level"], response.stress_level)
 
-    pretty_print("2. OUTPUT from Enhanced Analyze Node", response.dict())
-    
     return {
         "analysis_report": response.analysis_report,
         "stress_level": response.stress_level,
@@ -153,62 +646,189 @@ def get_analysis(state: dict) -> dict:
     }
 
 
-def generate_suggestions(state: dict) -> dict:
+def _near_duplicate_analysis(state: dict) -> Optional[EnhancedAnalysisResult]:
+    """The stored analysis of a near-identical schedule, unless the semantic cache is off or shadowing."""
+    if not semantic_analysis_cache.enabled:
+        return None
+    match = semantic_analysis_cache.lookup(schedule_text(state.get("categorized_tasks", {})))
+    return None if settings.SEMANTIC_CACHE_SHADOW_MODE else match
+
+
+def _remember_analysis(state: dict, response: EnhancedAnalysisResult) -> None:
+    if not _node_degraded():
+        semantic_analysis_cache.add([schedule_text(state.get("categorized_tasks", {}))], [response])
+
+
+def get_analysis(state: dict) -> dict:
     """
-    Calls an LLM to generate actionable suggestions based on the analysis.
+    Calls an LLM to analyze the categorized schedule and generate an enhanced report
+    with stress level, workload assessment, and rebalancing recommendations.
+    With the semantic cache enabled, the analysis of a near-identical schedule
+    is reused instead.
     """
-    pretty_print("--- Current State before Suggestion Node ---", state)
-    categorized_tasks = state.get("categorized_tasks", {})
-    analysis_report = state.get("analysis_report", "")
-    input_data = {
-        "categorized_tasks": categorized_tasks,
-        "analysis_report": analysis_report,
+    reused = _reused_analysis(state)
+    if reused is not None:
+        return reused
+    response = _near_duplicate_analysis(state)
+    if response is None:
+        response = _call_llm("analyze", _analysis_input(state), state)
+        _remember_analysis(state, response)
+    fingerprint = schedule_fingerprint(state.get("categorized_tasks", {}))
+    return _with_fingerprint("analysis_fingerprint", fingerprint, _analysis_output(state, response))
+
+
+async def aget_analysis(state: dict) -> dict:
+    """
+    Async version of `get_analysis`, awaiting the LLM call instead of blocking.
+    """
+    reused = _reused_analysis(state)
+    if reused is not None:
+        return reused
+    response = _near_duplicate_analysis(state)
+    if response is None:
+        response = await _acall_llm("analyze", _analysis_input(state), state)
+        _remember_analysis(state, response)
+    fingerprint = schedule_fingerprint(state.get("categorized_tasks", {}))
+    return _with_fingerprint("analysis_fingerprint", fingerprint, _analysis_output(state, response))
+
+
+def _fused_output(state: dict, tasks: List[str], response: FusedAnalysisResult) -> dict:
+    categorized_tasks = response.categorized_tasks or {}
+    if not _node_degraded():
+        _remember_categories(categorized_tasks)
+    return {
+        "categorized_tasks": task_category_index.merge(tasks, {}, categorized_tasks),
+        **_analysis_output(state, response),
     }
-    pretty_print("3. INPUT to Suggestion Node", input_data)
 
-    structured_llm = suggestion_prompt | llm.with_structured_output(
-        AnalysisResult, method="function_calling"
-    )
-    response = structured_llm.invoke(input_data)
 
-    pretty_print("3. OUTPUT from Suggestion Node", response.dict())
-    return {"suggestions": response.suggestions}
+def categorize_and_analyze(state: dict) -> dict:
+    """
+    Fast-mode node: categorizes and analyzes the schedule with a single LLM
+    call instead of running `categorize_tasks` and `get_analysis` in sequence.
+    Task lists over the node's token budget fall back to those two steps, so
+    categorization can be chunked.
+    """
+    tasks = _categorize_input(state)
+    if _fused_over_budget(tasks):
+        update = categorize_tasks(state)
+        return {**update, **get_analysis({**state, **update})}
+    input_data = {"tasks": "\n".join(tasks)}
+    _record_prompt("categorize_and_analyze", input_data, [input_data])
+    response = _call_llm("categorize_and_analyze", input_data)
+    return _fused_output(state, tasks, response)
 
 
-def priority_rebalance(state: dict) -> dict:
+async def acategorize_and_analyze(state: dict) -> dict:
     """
-    Handles high-stress scenarios by providing aggressive rebalancing recommendations.
-    This node is triggered when the analysis indicates the schedule needs rebalancing.
+    Async version of `categorize_and_analyze`, awaiting the LLM call instead of blocking.
     """
-    pretty_print("--- Current State before Priority Rebalance Node ---", state)
-    
-    categorized_tasks = state.get("categorized_tasks", {})
-    analysis_report = state.get("analysis_report", "")
-    stress_level = state.get("stress_level", 5)
+    tasks = _categorize_input(state)
+    if _fused_over_budget(tasks):
+        update = await acategorize_tasks(state)
+        return {**update, **(await aget_analysis({**state, **update}))}
+    input_data = {"tasks": "\n".join(tasks)}
+    _record_prompt("categorize_and_analyze", input_data, [input_data])
+    response = await _acall_llm("categorize_and_analyze", input_data)
+    return _fused_output(state, tasks, response)
+
+
+def _suggestions_input(state: dict) -> dict:
+    debug_dump("--- Current State before Suggestion Node ---", state)
+    raw, input_data, compacted = _compact_schedule("suggest", state)
+    _record_prompt("suggest", raw, [input_data], compacted)
+    debug_dump("3. INPUT to Suggestion Node", input_data)
+    return input_data
+
+
+def _suggestions_output(state: dict, response: AnalysisResult) -> dict:
+    debug_dump("3. OUTPUT from Suggestion Node", response)
+    update = {"suggestions": response.suggestions, **_CLEARED_REBALANCE}
+    return _with_fingerprint("advice_fingerprint", _advice_fingerprint("suggest", state), update)
+
+
+def generate_suggestions(state: dict) -> dict:
+    """
+    Calls an LLM to generate actionable suggestions based on the analysis.
+    """
+    reused = _reused_advice("suggest", state)
+    if reused is not None:
+        return reused
+    input_data = _suggestions_input(state)
+    response = _call_llm("suggest", input_data, state)
+    return _suggestions_output(state, response)
+
+
+async def agenerate_suggestions(state: dict) -> dict:
+    """
+    Async version of `generate_suggestions`, awaiting the LLM call instead of blocking.
+    """
+    reused = _reused_advice("suggest", state)
+    if reused is not None:
+        return reused
+    input_data = _suggestions_input(state)
+    response = await _acall_llm("suggest", input_data, state)
+    return _suggestions_output(state, response)
+
+
+def _rebalance_details(state: dict) -> dict:
     key_concerns = state.get("key_concerns", [])
-    
-    input_data = {
-        "categorized_tasks": categorized_tasks,
-        "analysis_report": analysis_report,
-        "stress_level": stress_level,
+    return {
+        "stress_level": state.get("stress_level", 5),
         "key_concerns": "\n".join(key_concerns) if key_concerns else "No specific concerns identified",
     }
-    pretty_print("4. INPUT to Priority Rebalance Node", input_data)
 
-    structured_llm = priority_rebalance_prompt | llm.with_structured_output(
-        PriorityRebalanceResult, method="function_calling"
-    )
-    response = structured_llm.invoke(input_data)
 
-    pretty_print("4. OUTPUT from Priority Rebalance Node", response.dict())
-    
-    return {
+def _rebalance_input(state: dict) -> dict:
+    debug_dump("--- Current State before Priority Rebalance Node ---", state)
+    details = _rebalance_details(state)
+    raw, input_data, compacted = _compact_schedule("rebalance", state)
+    _record_prompt("rebalance", {**raw, **details}, [{**input_data, **details}], compacted)
+    input_data.update(details)
+    debug_dump("4. INPUT to Priority Rebalance Node", input_data)
+    return input_data
+
+
+def _rebalance_output(state: dict, response: PriorityRebalanceResult) -> dict:
+    debug_dump("4. OUTPUT from Priority Rebalance Node", response)
+    categorized_tasks = state.get("categorized_tasks", {})
+
+    update = {
         "rebalance_report": response.rebalance_report,
         "urgent_actions": response.urgent_actions or [],
-        "tasks_to_reschedule": response.tasks_to_reschedule or [],
-        "tasks_to_delegate": response.tasks_to_delegate or [],
+        # The prompt lists tasks by ID; map them back onto the user's wording
+        "tasks_to_reschedule": resolve_task_refs(response.tasks_to_reschedule or [], categorized_tasks),
+        "tasks_to_delegate": resolve_task_refs(response.tasks_to_delegate or [], categorized_tasks),
         "recovery_suggestions": response.recovery_suggestions or [],
+        # A session that was routed to suggestions before drops them
+        "suggestions": [],
     }
+    return _with_fingerprint("advice_fingerprint", _advice_fingerprint("rebalance", state), update)
+
+
+def priority_rebalance(state: dict) -> dict:
+    """
+    Handles high-stress scenarios by providing aggressive rebalancing recommendations.
+    This node is triggered when the analysis indicates the schedule needs rebalancing.
+    """
+    reused = _reused_advice("rebalance", state)
+    if reused is not None:
+        return reused
+    input_data = _rebalance_input(state)
+    response = _call_llm("rebalance", input_data, state)
+    return _rebalance_output(state, response)
+
+
+async def apriority_rebalance(state: dict) -> dict:
+    """
+    Async version of `priority_rebalance`, awaiting the LLM call instead of blocking.
+    """
+    reused = _reused_advice("rebalance", state)
+    if reused is not None:
+        return reused
+    input_data = _rebalance_input(state)
+    response = await _acall_llm("rebalance", input_data, state)
+    return _rebalance_output(state, response)
 
 
 def should_rebalance(state: dict) -> str:
@@ -219,7 +839,7 @@ def should_rebalance(state: dict) -> str:
     needs_rebalancing = state.get("needs_rebalancing", False)
     stress_level = state.get("stress_level", 5)
     
-    pretty_print("--- Conditional Routing Decision ---", {
+    debug_dump("--- Conditional Routing Decision ---", {
         "needs_rebalancing": needs_rebalancing,
         "stress_level": stress_level,
     })
@@ -231,37 +851,188 @@ def should_rebalance(state: dict) -> str:
         return "suggest"
 
 
+route_total = metrics_registry.counter("agent_route_total", "Routing decisions of should_rebalance", ("branch",))
+
+
+def route_branch(state: dict) -> str:
+    """`should_rebalance` as used by the graphs, counting each decision."""
+    branch = should_rebalance(state)
+    route_total.inc(branch)
+    return branch
+
+
+# --- Speculative Execution ---
+#
+# In "speculative" mode the suggest/rebalance branch starts while the analysis
+# is still running. The speculative branch sees the categorized tasks plus the
+# rule-based analysis estimate instead of the LLM analysis; once the analysis
+# is in, the branch the router picks is kept if the estimate was close enough
+# (see `_estimate_holds`), and any other one is cancelled.
+
+BRANCH_NODES = {
+    "suggest": agenerate_suggestions,
+    "rebalance": apriority_rebalance,
+}
+
+
+def _speculative_state(state: dict) -> dict:
+    tasks = [task for tasks in (state.get("categorized_tasks") or {}).values() for task in tasks]
+    return {**state, **estimated_analysis(tasks)}
+
+
+def _estimate_holds(estimate: dict, analysis: dict) -> bool:
+    """Whether advice built on the rule-based estimate may stand in for advice built on the analysis."""
+    return (
+        bool(estimate["needs_rebalancing"]) == bool(analysis.get("needs_rebalancing"))
+        and abs(estimate["stress_level"] - analysis.get("stress_level", 5)) <= settings.SPECULATION_MAX_STRESS_DRIFT
+    )
+
+
+def _branch_prompt_tokens(branch: str, state: dict) -> int:
+    """Estimated prompt tokens of a branch's LLM call, without recording prompt stats."""
+    input_data = _compact_schedule(branch, state)[1]
+    if branch == "rebalance":
+        input_data.update(_rebalance_details(state))
+    return measure_prompt(NODE_CALLS[branch][0], input_data)
+
+
+async def _run_speculative_branch(branch: str, state: dict) -> Tuple[dict, object]:
+    with node_span(f"speculative_{branch}") as span:
+        return await BRANCH_NODES[branch](state), span
+
+
+def analyze_speculative(state: dict) -> dict:
+    """
+    Sync version of `aanalyze_speculative`. Without an event loop to overlap
+    the calls on, it runs the analysis and the routed branch in sequence.
+    """
+    update = get_analysis(state)
+    branch_state = {**state, **update}
+    branch = route_branch(branch_state)
+    node = generate_suggestions if branch == "suggest" else priority_rebalance
+    return {**update, **node(branch_state)}
+
+
+async def aanalyze_speculative(state: dict) -> dict:
+    """
+    Speculative-mode node: analyzes the schedule and, concurrently, runs the
+    branch the rule-based stress estimate predicts (both branches for
+    borderline schedules). The branch `should_rebalance` picks from the real
+    analysis is kept as long as the estimate it was built on holds; otherwise,
+    or if the pick was not speculated, it runs after the analysis as usual. A
+    speculated branch that was not picked is cancelled.
+    """
+    start = time.perf_counter()
+    speculative_state = _speculative_state(state)
+    started = speculative_branches(speculative_state["stress_level"], should_rebalance(speculative_state))
+    runs = {branch: asyncio.ensure_future(_run_speculative_branch(branch, speculative_state)) for branch in started}
+    try:
+        update = await aget_analysis(state)
+        analysis_ms = (time.perf_counter() - start) * 1000
+        branch_state = {**state, **update}
+        branch = route_branch(branch_state)
+        speculated = runs.pop(branch, None)
+        if speculated is not None and _estimate_holds(speculative_state, update):
+            branch_update, branch_span = await speculated
+            if branch_span.degraded:
+                current_span().degraded = True
+            # Without speculation the branch would have started after the analysis
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            speculation_stats.record_run(len(started), True, analysis_ms + branch_span.duration_ms - elapsed_ms)
+        else:
+            if speculated is not None:
+                # Advice on an estimate this far off the analysis is not kept
+                runs[branch] = speculated
+            branch_update = await BRANCH_NODES[branch](branch_state)
+            speculation_stats.record_run(len(started), False, 0.0)
+    finally:
+        for discarded, run in runs.items():
+            if run.done() and not run.cancelled() and run.exception() is None:
+                span = run.result()[1]
+                speculation_stats.record_waste(span.prompt_tokens, span.completion_tokens, cancelled=False)
+            else:
+                run.cancel()
+                # The request may already have been sent, so count its prompt as spent
+                speculation_stats.record_waste(_branch_prompt_tokens(discarded, speculative_state), 0, cancelled=True)
+    return {**update, **branch_update}
+
+
 # --- Graph Definition ---
 
 
-def create_agent_graph():
+def _flag_degraded(name: str, state: dict, span, update: dict) -> dict:
+    """Adds a node that fell back to a local result to the state's `degraded_nodes`."""
+    if span.degraded:
+        update["degraded_nodes"] = list(state.get("degraded_nodes") or []) + [name]
+    return update
+
+
+def _traced_node(name: str, func, afunc=None):
+    """
+    Wraps a node's sync (and, for LLM nodes, async) implementation so each
+    execution is recorded as a tracing span.
+    """
+    def traced(state: dict) -> dict:
+        with node_span(name) as span:
+            return _flag_degraded(name, state, span, func(state))
+
+    if afunc is None:
+        return traced
+
+    async def atraced(state: dict) -> dict:
+        with node_span(name) as span:
+            return _flag_degraded(name, state, span, await afunc(state))
+
+    return RunnableLambda(traced, afunc=atraced, name=name)
+
+
+
+def create_agent_graph(checkpointer=None):
     """
     Creates the enhanced LangGraph agent with conditional routing based on stress analysis.
     
     Graph flow:
+    0. precheck -> categorize, or straight to suggest for trivial schedules
     1. categorize -> analyze 
     2. analyze -> conditional routing based on stress level/needs_rebalancing
     3a. If high stress: analyze -> rebalance -> END
     3b. If normal stress: analyze -> suggest -> END
+
+    With a `checkpointer`, runs on the same thread continue from the previous
+    run's state and only recompute the nodes whose inputs changed.
     """
+    from langgraph.graph import StateGraph, END
+
     workflow = StateGraph(AgentState)
 
-    # Add all nodes
-    workflow.add_node("categorize", categorize_tasks)
-    workflow.add_node("analyze", get_analysis)
-    workflow.add_node("suggest", generate_suggestions)
-    workflow.add_node("rebalance", priority_rebalance)
+    # Add all nodes. Each LLM node carries both its sync and async implementation,
+    # so the compiled graph supports `invoke` as well as a non-blocking `ainvoke`.
+    workflow.add_node("precheck", _traced_node("precheck", precheck_schedule))
+    workflow.add_node("categorize", _traced_node("categorize", categorize_tasks, acategorize_tasks))
+    workflow.add_node("analyze", _traced_node("analyze", get_analysis, aget_analysis))
+    workflow.add_node("suggest", _traced_node("suggest", generate_suggestions, agenerate_suggestions))
+    workflow.add_node("rebalance", _traced_node("rebalance", priority_rebalance, apriority_rebalance))
 
     # Set entry point
-    workflow.set_entry_point("categorize")
-    
+    workflow.set_entry_point("precheck")
+
+    # Skip the LLM categorization and analysis for trivial schedules
+    workflow.add_conditional_edges(
+        "precheck",
+        after_precheck,
+        {
+            "categorize": "categorize",
+            "suggest": "suggest",
+        }
+    )
+
     # Add static edges
     workflow.add_edge("categorize", "analyze")
     
     # Add conditional routing from analyze node
     workflow.add_conditional_edges(
         "analyze",
-        should_rebalance,
+        route_branch,
         {
             "suggest": "suggest",
             "rebalance": "rebalance",
@@ -272,9 +1043,159 @@ def create_agent_graph():
     workflow.add_edge("suggest", END)
     workflow.add_edge("rebalance", END)
 
-    WorkLifeBalanceAgent = workflow.compile(name="WorkLifeBalanceAgent")
+    WorkLifeBalanceAgent = workflow.compile(checkpointer=checkpointer, name="WorkLifeBalanceAgent")
     return WorkLifeBalanceAgent
 
 
-# --- Agent Instance ---
-WorkLifeBalanceAgent = create_agent_graph()
+def create_fast_agent_graph():
+    """
+    Creates the fast-mode agent, which fuses categorization and analysis into
+    one LLM call and then follows the same conditional routing.
+
+    Graph flow:
+    0. precheck -> categorize_and_analyze, or straight to suggest for trivial schedules
+    1. categorize_and_analyze -> conditional routing based on stress level/needs_rebalancing
+    2a. If high stress: categorize_and_analyze -> rebalance -> END
+    2b. If normal stress: categorize_and_analyze -> suggest -> END
+    """
+    from langgraph.graph import StateGraph, END
+
+    workflow = StateGraph(AgentState)
+
+    workflow.add_node("precheck", _traced_node("precheck", precheck_schedule))
+    workflow.add_node("categorize_and_analyze", _traced_node("categorize_and_analyze", categorize_and_analyze, acategorize_and_analyze))
+    workflow.add_node("suggest", _traced_node("suggest", generate_suggestions, agenerate_suggestions))
+    workflow.add_node("rebalance", _traced_node("rebalance", priority_rebalance, apriority_rebalance))
+
+    workflow.set_entry_point("precheck")
+
+    workflow.add_conditional_edges(
+        "precheck",
+        after_precheck,
+        {
+            "categorize": "categorize_and_analyze",
+            "suggest": "suggest",
+        }
+    )
+
+    workflow.add_conditional_edges(
+        "categorize_and_analyze",
+        route_branch,
+        {
+            "suggest": "suggest",
+            "rebalance": "rebalance",
+        }
+    )
+
+    workflow.add_edge("suggest", END)
+    workflow.add_edge("rebalance", END)
+
+    return workflow.compile(name="FastWorkLifeBalanceAgent")
+
+
+def create_speculative_agent_graph():
+    """
+    Creates the speculative-mode agent, which overlaps the suggest/rebalance
+    branch with the analysis (see `aanalyze_speculative`).
+
+    Graph flow:
+    0. precheck -> categorize, or straight to suggest for trivial schedules
+    1. categorize -> analyze_speculative -> END, where analyze_speculative
+       analyzes and runs the branch `should_rebalance` picks
+    """
+    from langgraph.graph import StateGraph, END
+
+    workflow = StateGraph(AgentState)
+
+    workflow.add_node("precheck", _traced_node("precheck", precheck_schedule))
+    workflow.add_node("categorize", _traced_node("categorize", categorize_tasks, acategorize_tasks))
+    workflow.add_node("analyze_speculative", _traced_node("analyze_speculative", analyze_speculative, aanalyze_speculative))
+    workflow.add_node("suggest", _traced_node("suggest", generate_suggestions, agenerate_suggestions))
+
+    workflow.set_entry_point("precheck")
+
+    workflow.add_conditional_edges(
+        "precheck",
+        after_precheck,
+        {
+            "categorize": "categorize",
+            "suggest": "suggest",
+        }
+    )
+
+    workflow.add_edge("categorize", "analyze_speculative")
+    workflow.add_edge("analyze_speculative", END)
+    workflow.add_edge("suggest", END)
+
+    return workflow.compile(name="SpeculativeWorkLifeBalanceAgent")
+
+
+# --- Agent Instances ---
+#
+# Graphs are compiled on first use (or by `warm_up` from the app's lifespan hook)
+# instead of at import time, so importing this module stays cheap.
+
+GRAPH_BUILDERS = {
+    "standard": create_agent_graph,
+    "fast": create_fast_agent_graph,
+    "speculative": create_speculative_agent_graph,
+}
+
+_agents: Dict[str, object] = {}
+_agents_lock = threading.Lock()
+
+
+def get_agent(mode: Optional[str] = None):
+    """
+    Returns the compiled graph for an analysis mode, defaulting to
+    `settings.ANALYSIS_MODE`. Each graph is compiled once, on first use.
+    """
+    mode = mode or settings.ANALYSIS_MODE
+    if mode not in GRAPH_BUILDERS:
+        raise ValueError(f"Unknown analysis mode {mode!r}, expected one of {sorted(GRAPH_BUILDERS)}")
+    agent = _agents.get(mode)
+    if agent is None:
+        with _agents_lock:
+            agent = _agents.get(mode)
+            if agent is None:
+                agent = _agents[mode] = GRAPH_BUILDERS[mode]()
+    return agent
+
+
+def get_session_agent():
+    """
+    Returns the standard graph compiled with the session checkpointer, used for
+    incremental re-analysis keyed by session (thread) ID.
+    """
+    from app.langgraph_agent.checkpoints import get_checkpointer
+
+    checkpointer = get_checkpointer()
+    agent = _agents.get("session")
+    # Compiled again when `open_checkpointer` swaps the saver
+    if agent is None or agent.checkpointer is not checkpointer:
+        with _agents_lock:
+            agent = _agents.get("session")
+            if agent is None or agent.checkpointer is not checkpointer:
+                agent = _agents["session"] = create_agent_graph(checkpointer=checkpointer)
+    return agent
+
+
+def warm_up() -> None:
+    """
+    Creates the LLM client, builds the structured runnables and compiles every
+    graph ahead of the first request.
+    """
+    for node in NODE_CALLS:
+        structured_runnable(node)
+    for mode in GRAPH_BUILDERS:
+        get_agent(mode)
+
+
+def __getattr__(name: str):
+    # The compiled graphs stay reachable as module attributes (langgraph.json
+    # points at them), but are only built when first accessed.
+    if name == "WorkLifeBalanceAgent":
+        return get_agent("standard")
+    if name == "FastWorkLifeBalanceAgent":
+        return get_agent("fast")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,223 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol, Type
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+
+def _normalize(value: Any) -> Any:
+    """Recursively strips surrounding whitespace from strings so cosmetic differences share a key."""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def make_cache_key(node: str, prompt: Any, model: str, input_data: Dict) -> str:
+    """
+    Builds a content-addressed key from the node name, the prompt template,
+    the model fingerprint and the normalized input of a structured LLM call.
+    """
+    material = json.dumps(
+        {
+            "node": node,
+            "prompt": prompt.pretty_repr() if hasattr(prompt, "pretty_repr") else str(prompt),
+            "model": model,
+            "input": _normalize(input_data),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class CacheBackend(Protocol):
+    """A storage tier of the LLM response cache."""
+
+    name: str
+
+    def get(self, key: str, schema: Type[BaseModel]) -> Optional[BaseModel]: ...
+
+    def set(self, key: str, value: BaseModel) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class MemoryCacheBackend:
+    """In-process tier with LRU eviction and a per-entry TTL."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, schema: Type[BaseModel]) -> Optional[BaseModel]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+        # Hand out a copy so callers can't mutate the cached result
+        return value.model_copy(deep=True)
+
+    def set(self, key: str, value: BaseModel) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value.model_copy(deep=True))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """On-disk tier that survives restarts and can be shared by workers on one host."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, ttl_seconds: float = 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connect lazily so importing the module never touches the disk
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, payload TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def get(self, key: str, schema: Type[BaseModel]) -> Optional[BaseModel]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT payload, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            payload, expires_at = row
+            if expires_at < time.time():
+                self._connection().execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._connection().commit()
+                return None
+        return schema.model_validate_json(payload)
+
+    def set(self, key: str, value: BaseModel) -> None:
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO llm_cache (key, payload, expires_at) VALUES (?, ?, ?)",
+                (key, value.model_dump_json(), time.time() + self.ttl_seconds),
+            )
+            self._connection().commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM llm_cache")
+            self._connection().commit()
+
+
+class LLMResponseCache:
+    """
+    Content-addressed cache for parsed structured LLM results.
+
+    Tiers are consulted in order; a hit in a slower tier is promoted into the
+    faster ones. Hit and miss counters are kept per tier.
+    """
+
+    def __init__(self, *backends: CacheBackend, enabled: bool = True):
+        self.backends = list(backends)
+        self.enabled = enabled
+        self.hits: Dict[str, int] = {backend.name: 0 for backend in self.backends}
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, schema: Type[BaseModel]) -> Optional[BaseModel]:
+        if not self.enabled:
+            return None
+        for index, backend in enumerate(self.backends):
+            value = backend.get(key, schema)
+            if value is not None:
+                for faster in self.backends[:index]:
+                    faster.set(key, value)
+                with self._lock:
+                    self.hits[backend.name] += 1
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: BaseModel) -> None:
+        if not self.enabled:
+            return
+        for backend in self.backends:
+            backend.set(key, value)
+
+    def clear(self) -> None:
+        for backend in self.backends:
+            backend.clear()
+        with self._lock:
+            self.hits = {backend.name: 0 for backend in self.backends}
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the hit/miss counters and the hit ratio of the cache."""
+        with self._lock:
+            hits = sum(self.hits.values())
+            lookups = hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "hits": dict(self.hits),
+                "misses": self.misses,
+                "hit_ratio": hits / lookups if lookups else 0.0,
+                "evictions": sum(getattr(b, "evictions", 0) for b in self.backends),
+            }
+
+
+def create_llm_cache() -> LLMResponseCache:
+    """Builds the cache tiers configured in `app.core.config.settings`."""
+    backends = [
+        MemoryCacheBackend(
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+        )
+    ]
+    if settings.LLM_CACHE_SQLITE_PATH:
+        backends.append(
+            SQLiteCacheBackend(
+                settings.LLM_CACHE_SQLITE_PATH,
+                ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+            )
+        )
+    return LLMResponseCache(*backends, enabled=settings.LLM_CACHE_ENABLED)
+
+
+llm_cache = create_llm_cache()
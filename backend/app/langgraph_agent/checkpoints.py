@@ -0,0 +1,131 @@
+import importlib.util
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_checkpointer = None
+_lock = threading.Lock()
+
+
+def _sqlite_available() -> bool:
+    # Needs the optional `langgraph-checkpoint-sqlite` and `aiosqlite` packages
+    if importlib.util.find_spec("langgraph.checkpoint.sqlite") is None or importlib.util.find_spec("aiosqlite") is None:
+        logger.warning(
+            "CHECKPOINT_BACKEND is 'sqlite' but langgraph-checkpoint-sqlite/aiosqlite are not installed; "
+            "keeping session checkpoints in memory"
+        )
+        return False
+    return True
+
+
+def get_checkpointer():
+    """
+    Returns the shared checkpoint saver of the session graphs: the SQLite
+    saver while `open_checkpointer` holds it open, otherwise in memory.
+    """
+    global _checkpointer
+    if _checkpointer is None:
+        with _lock:
+            if _checkpointer is None:
+                from langgraph.checkpoint.memory import InMemorySaver
+
+                _checkpointer = InMemorySaver()
+    return _checkpointer
+
+
+@asynccontextmanager
+async def open_checkpointer() -> AsyncIterator[None]:
+    """
+    With CHECKPOINT_BACKEND "sqlite", opens the SQLite saver and makes it the
+    shared checkpointer until the context exits, which closes its connection.
+    Used by the app's lifespan; otherwise checkpoints stay in memory.
+    """
+    global _checkpointer
+    if settings.CHECKPOINT_BACKEND != "sqlite" or not _sqlite_available():
+        yield
+        return
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    async with AsyncSqliteSaver.from_conn_string(settings.CHECKPOINT_SQLITE_PATH) as saver:
+        previous, _checkpointer = _checkpointer, saver
+        try:
+            yield
+        finally:
+            _checkpointer = previous
+
+
+class SessionRegistry:
+    """
+    Bounded LRU of the session (thread) IDs that have checkpoints. When more
+    than `max_sessions` sessions exist, the least recently used one is
+    deleted from the checkpointer.
+    """
+
+    def __init__(self, max_sessions: int):
+        self.max_sessions = max_sessions
+        self.evictions = 0
+        self._sessions: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def touch(self, session_id: str) -> List[str]:
+        """Marks a session as used and returns the sessions evicted to make room for it."""
+        with self._lock:
+            self._sessions[session_id] = None
+            self._sessions.move_to_end(session_id)
+            evicted = []
+            while len(self._sessions) > self.max_sessions:
+                evicted.append(self._sessions.popitem(last=False)[0])
+            self.evictions += len(evicted)
+            return evicted
+
+    def forget(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"sessions": len(self._sessions), "evictions": self.evictions}
+
+
+session_registry = SessionRegistry(settings.SESSION_MAX_ENTRIES)
+
+
+async def aprune_session(session_id: str, evicted: Optional[List[str]] = None) -> None:
+    """
+    Keeps only the latest checkpoint of a session, which is all an
+    incremental re-analysis needs, and deletes evicted sessions.
+    """
+    checkpointer = get_checkpointer()
+    for old_session in evicted or []:
+        await checkpointer.adelete_thread(old_session)
+    try:
+        await checkpointer.aprune([session_id], strategy="keep_latest")
+    except NotImplementedError:
+        await _keep_latest(checkpointer, session_id)
+
+
+async def _keep_latest(checkpointer, session_id: str) -> None:
+    """
+    `aprune` for savers that do not implement it (such as the in-memory one):
+    rewrites the session's thread with only its latest checkpoint and that
+    checkpoint's pending writes.
+    """
+    latest = await checkpointer.aget_tuple({"configurable": {"thread_id": session_id}})
+    if latest is None or latest.parent_config is None:
+        return
+    await checkpointer.adelete_thread(session_id)
+    config = {
+        "configurable": {"thread_id": session_id, "checkpoint_ns": latest.config["configurable"].get("checkpoint_ns", "")}
+    }
+    config = await checkpointer.aput(config, latest.checkpoint, latest.metadata, latest.checkpoint["channel_versions"])
+    writes: Dict[str, List[Tuple[str, Any]]] = {}
+    for task_id, channel, value in latest.pending_writes or []:
+        writes.setdefault(task_id, []).append((channel, value))
+    for task_id, task_writes in writes.items():
+        await checkpointer.aput_writes(config, task_writes, task_id)
@@ -0,0 +1,192 @@
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+# Rough size of a token in characters for English text. Good enough for
+# budgeting, and far cheaper than loading a tokenizer on the request path.
+CHARS_PER_TOKEN = 4
+
+_TASK_REF = re.compile(r"^\s*\[?(T\d+)\]?(?:\b|[:.)\-])")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimated number of tokens in a piece of prompt text."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def measure_prompt(prompt, input_data: dict) -> int:
+    """Estimated tokens of a fully rendered prompt."""
+    return sum(estimate_tokens(str(message.content)) for message in prompt.format_messages(**input_data))
+
+
+def token_budget(node: str) -> Optional[int]:
+    """The prompt token budget of a node's variable input, or None if it has none."""
+    return settings.PROMPT_TOKEN_BUDGETS.get(node)
+
+
+# --- Task IDs ---
+
+
+def task_ids(categorized_tasks: Dict[str, List[str]]) -> Dict[str, str]:
+    """
+    Assigns every task a short ID ("T1", "T2", ...) in category order. The IDs
+    only depend on `categorized_tasks`, so every stage that sees the same
+    categorization refers to the same task by the same ID.
+    """
+    ids: Dict[str, str] = {}
+    for tasks in categorized_tasks.values():
+        for task in tasks:
+            ids[f"T{len(ids) + 1}"] = task
+    return ids
+
+
+def resolve_task_refs(refs: List[str], categorized_tasks: Dict[str, List[str]]) -> List[str]:
+    """
+    Maps task IDs in an LLM answer ("T3", "T3: Gym session", "[T3]") back to
+    the user's task text. Anything that is not a known ID is kept as written.
+    """
+    ids = task_ids(categorized_tasks)
+    resolved = []
+    for ref in refs:
+        match = _TASK_REF.match(ref)
+        resolved.append(ids.get(match.group(1), ref) if match else ref)
+    return resolved
+
+
+# --- Encodings ---
+
+
+def encode_categorized_tasks(categorized_tasks: Dict[str, List[str]], budget: Optional[int] = None) -> Tuple[str, int]:
+    """
+    Compact, canonical text form of `categorized_tasks`: one `[Category]`
+    header per category followed by one `<id> <task>` line per task.
+
+    If the encoding would exceed `budget` tokens, tasks are taken round-robin
+    across categories until the budget is spent, and each category ends with a
+    count of the tasks left out, so the model still sees the overall shape of
+    the schedule. Returns the encoding and the number of tasks left out.
+    """
+    lines: Dict[str, List[str]] = {}
+    for category, tasks in categorized_tasks.items():
+        offset = sum(len(category_lines) for category_lines in lines.values())
+        lines[category] = [f"T{offset + i + 1} {task}" for i, task in enumerate(tasks)]
+
+    def render(kept: Dict[str, List[str]]) -> str:
+        blocks = []
+        for category, category_lines in lines.items():
+            blocks.append(f"[{category}]")
+            blocks.extend(kept[category])
+            omitted = len(category_lines) - len(kept[category])
+            if omitted:
+                blocks.append(f"(+{omitted} more)")
+        return "\n".join(blocks)
+
+    full = render(lines)
+    if budget is None or estimate_tokens(full) <= budget:
+        return full, 0
+
+    kept: Dict[str, List[str]] = {category: [] for category in lines}
+    # Headers and omission counts are always part of the encoding
+    used = sum(estimate_tokens(f"[{category}]\n(+{len(category_lines)} more)\n") for category, category_lines in lines.items())
+    round_robin = [
+        (category, category_lines[depth])
+        for depth in range(max(len(category_lines) for category_lines in lines.values()))
+        for category, category_lines in lines.items()
+        if depth < len(category_lines)
+    ]
+    for category, line in round_robin:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            break
+        kept[category].append(line)
+        used += cost
+    omitted = sum(len(category_lines) - len(kept[category]) for category, category_lines in lines.items())
+    return render(kept), omitted
+
+
+def summarize_text(text: str, budget: Optional[int]) -> str:
+    """
+    Shortens free text to at most `budget` tokens by keeping whole leading
+    sentences; a single over-long sentence is cut at a word boundary.
+    """
+    if not text or budget is None or estimate_tokens(text) <= budget:
+        return text
+    kept = []
+    used = 0
+    for sentence in _SENTENCE_END.split(text.strip()):
+        cost = estimate_tokens(sentence) + 1
+        if used + cost > budget:
+            break
+        kept.append(sentence)
+        used += cost
+    if kept:
+        return " ".join(kept)
+    return text[: budget * CHARS_PER_TOKEN].rsplit(" ", 1)[0] + "..."
+
+
+def chunk_tasks(tasks: List[str], budget: Optional[int]) -> List[List[str]]:
+    """Splits a task list into chunks whose newline-joined text fits `budget` tokens."""
+    if budget is None:
+        return [tasks] if tasks else []
+    chunks: List[List[str]] = []
+    chunk: List[str] = []
+    used = 0
+    for task in tasks:
+        cost = estimate_tokens(task) + 1
+        if chunk and used + cost > budget:
+            chunks.append(chunk)
+            chunk, used = [], 0
+        chunk.append(task)
+        used += cost
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+# --- Metrics ---
+
+
+class PromptStats:
+    """Estimated prompt tokens per stage, before and after compaction."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, int]] = {}
+
+    def record(self, node: str, raw_tokens: int, prompt_tokens: int, calls: int = 1, compacted: bool = False) -> None:
+        with self._lock:
+            stage = self._stages.setdefault(
+                node, {"calls": 0, "raw_tokens": 0, "prompt_tokens": 0, "compacted": 0}
+            )
+            stage["calls"] += calls
+            stage["raw_tokens"] += raw_tokens
+            stage["prompt_tokens"] += prompt_tokens
+            stage["compacted"] += int(compacted)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per stage: LLM calls, the estimated prompt tokens actually sent, what
+        the uncompacted prompts would have cost, and how often a budget forced
+        chunking or summarization.
+        """
+        with self._lock:
+            return {
+                node: {
+                    **stage,
+                    "prompt_tokens_per_call": stage["prompt_tokens"] / stage["calls"] if stage["calls"] else 0.0,
+                    "saved_ratio": (
+                        1 - stage["prompt_tokens"] / stage["raw_tokens"] if stage["raw_tokens"] else 0.0
+                    ),
+                }
+                for node, stage in self._stages.items()
+            }
+
+
+prompt_stats = PromptStats()
@@ -0,0 +1,265 @@
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+from app.langgraph_agent.heuristics import categorize_by_rules, workload_for_stress
+from app.langgraph_agent.schemas import (
+    AnalysisResult,
+    CategorizedTasks,
+    EnhancedAnalysisResult,
+    FusedAnalysisResult,
+    PriorityRebalanceResult,
+)
+
+
+class FakeLLMError(RuntimeError):
+    """Raised by `FakeStructuredChatModel` to simulate a failed completion."""
+
+
+def _prompt_text(messages: Sequence[BaseMessage]) -> str:
+    return "\n".join(str(message.content) for message in messages)
+
+
+def _task_lines(messages: Sequence[BaseMessage]) -> List[str]:
+    """The task list of a categorization prompt: the lines after the first blank line of the last message."""
+    content = str(messages[-1].content) if messages else ""
+    _, _, body = content.partition("\n\n")
+    return [line.strip() for line in body.splitlines() if line.strip()]
+
+
+class FakeStructuredChatModel(BaseChatModel):
+    """
+    Offline, deterministic stand-in for `ChatOpenAI` in tests and benchmarks.
+
+    It supports `with_structured_output(..., method="function_calling")` by
+    answering every call with a tool call whose arguments are a schema-valid
+    `CategorizedTasks`, `EnhancedAnalysisResult`, `FusedAnalysisResult`,
+    `AnalysisResult` or `PriorityRebalanceResult`, derived from the prompt.
+    Latency, jitter and failures can be injected, and token usage is reported
+    so tracing and metrics behave as they do against the real API.
+    """
+
+    model_name: str = "fake-structured"
+    temperature: float = 0
+    # Seconds each completion takes, plus up to `latency_jitter_seconds` of random extra
+    latency_seconds: float = 0.0
+    latency_jitter_seconds: float = 0.0
+    # Share of completions that are slow stragglers taking `tail_latency_seconds` instead
+    tail_rate: float = 0.0
+    tail_latency_seconds: float = 0.0
+    # Probability that a completion raises `FakeLLMError`
+    failure_rate: float = 0.0
+    # Completions whose prompt contains this text always fail
+    fail_marker: Optional[str] = None
+    # Forces the stress level of analyses, e.g. to pin the suggest or rebalance branch
+    stress_level: Optional[int] = None
+    seed: Optional[int] = None
+
+    _random: random.Random = PrivateAttr()
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _calls: int = PrivateAttr(default=0)
+    _in_flight: int = PrivateAttr(default=0)
+    _peak_in_flight: int = PrivateAttr(default=0)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._random = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-structured"
+
+    def bind_tools(self, tools: Sequence[Any], *, tool_choice: Any = None, **kwargs: Any):
+        # Tool schemas are kept as classes so the response can be built for them
+        return self.bind(tools=list(tools), tool_choice=tool_choice)
+
+    # --- Accounting ---
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"calls": self._calls, "in_flight": self._in_flight, "peak_in_flight": self._peak_in_flight}
+
+    def _enter(self) -> Tuple[float, bool]:
+        with self._lock:
+            self._calls += 1
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            jitter = self._random.random() * self.latency_jitter_seconds
+            straggler = self._random.random() < self.tail_rate
+            fail = self._random.random() < self.failure_rate
+        latency = self.tail_latency_seconds if straggler else self.latency_seconds
+        return latency + jitter, fail
+
+    def _exit(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    # --- Responses ---
+
+    def _stress_level(self, text: str) -> int:
+        if self.stress_level is not None:
+            return self.stress_level
+        # Longer schedules read as more stressful, so big lists take the rebalance branch
+        return max(1, min(10, 2 + len(text) // 400))
+
+    def _arguments(self, schema: Any, messages: Sequence[BaseMessage]) -> Dict[str, Any]:
+        text = _prompt_text(messages)
+        stress_level = self._stress_level(text)
+        analysis = {
+            "analysis_report": f"The schedule has a stress level of {stress_level}/10.",
+            "stress_level": stress_level,
+            "workload_assessment": workload_for_stress(stress_level),
+            "key_concerns": ["Few breaks between commitments"] if stress_level >= 6 else [],
+            "needs_rebalancing": stress_level >= 8,
+        }
+        if schema is CategorizedTasks:
+            return {"categorized_tasks": categorize_by_rules(_task_lines(messages))}
+        if schema is FusedAnalysisResult:
+            return {"categorized_tasks": categorize_by_rules(_task_lines(messages)), **analysis}
+        if schema is EnhancedAnalysisResult:
+            return analysis
+        if schema is AnalysisResult:
+            return {
+                "analysis_report": analysis["analysis_report"],
+                "suggestions": [
+                    "Block a 15-minute break between your longer commitments.",
+                    "Protect one evening slot for personal time.",
+                ],
+            }
+        if schema is PriorityRebalanceResult:
+            return {
+                "rebalance_report": "Your schedule is overloaded and needs to be lightened today.",
+                "urgent_actions": ["Decline one non-essential meeting"],
+                "tasks_to_reschedule": [],
+                "tasks_to_delegate": [],
+                "recovery_suggestions": ["Take a 15-minute walk after lunch"],
+            }
+        # Unknown schema: every field of the agent's schemas is optional
+        return {}
+
+    def _message(self, messages: Sequence[BaseMessage], tools: Optional[List[Any]]) -> AIMessage:
+        if not tools:
+            return AIMessage(content="OK")
+        schema = tools[0]
+        name = schema.__name__ if isinstance(schema, type) else schema.get("name", "tool")
+        arguments = self._arguments(schema, messages)
+        return AIMessage(
+            content="",
+            tool_calls=[{"name": name, "args": arguments, "id": f"call_{uuid.uuid4().hex[:12]}"}],
+            usage_metadata={
+                "input_tokens": len(_prompt_text(messages)) // 4,
+                "output_tokens": len(json.dumps(arguments)) // 4,
+                "total_tokens": len(_prompt_text(messages)) // 4 + len(json.dumps(arguments)) // 4,
+            },
+            # Usage callbacks only count messages that name their model
+            response_metadata={"model_name": self.model_name},
+        )
+
+    def _check_failure(self, fail: bool, messages: Sequence[BaseMessage]) -> None:
+        if fail or (self.fail_marker and self.fail_marker in _prompt_text(messages)):
+            raise FakeLLMError("Injected fake LLM failure")
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        tools: Optional[List[Any]] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        latency, fail = self._enter()
+        try:
+            time.sleep(latency)
+            self._check_failure(fail, messages)
+            return ChatResult(generations=[ChatGeneration(message=self._message(messages, tools))])
+        finally:
+            self._exit()
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        tools: Optional[List[Any]] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        latency, fail = self._enter()
+        try:
+            await asyncio.sleep(latency)
+            self._check_failure(fail, messages)
+            return ChatResult(generations=[ChatGeneration(message=self._message(messages, tools))])
+        finally:
+            self._exit()
+
+    def _chunks(self, message: AIMessage, pieces: int = 8) -> List[AIMessageChunk]:
+        """Splits a response into chunks the way a streamed completion arrives."""
+        if not message.tool_calls:
+            return [AIMessageChunk(content=message.content, usage_metadata=message.usage_metadata)]
+        call = message.tool_calls[0]
+        arguments = json.dumps(call["args"])
+        size = max(1, -(-len(arguments) // pieces))
+        chunks = []
+        for index, start in enumerate(range(0, len(arguments), size)):
+            chunks.append(
+                AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {
+                            "name": call["name"] if index == 0 else None,
+                            "args": arguments[start:start + size],
+                            "id": call["id"] if index == 0 else None,
+                            "index": 0,
+                        }
+                    ],
+                    usage_metadata=message.usage_metadata if start + size >= len(arguments) else None,
+                    response_metadata=message.response_metadata if start + size >= len(arguments) else {},
+                )
+            )
+        return chunks
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        tools: Optional[List[Any]] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        latency, fail = self._enter()
+        try:
+            time.sleep(latency)
+            self._check_failure(fail, messages)
+            for chunk in self._chunks(self._message(messages, tools)):
+                if run_manager:
+                    run_manager.on_llm_new_token("", chunk=ChatGenerationChunk(message=chunk))
+                yield ChatGenerationChunk(message=chunk)
+        finally:
+            self._exit()
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        tools: Optional[List[Any]] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        latency, fail = self._enter()
+        try:
+            await asyncio.sleep(latency)
+            self._check_failure(fail, messages)
+            for chunk in self._chunks(self._message(messages, tools)):
+                if run_manager:
+                    await run_manager.on_llm_new_token("", chunk=ChatGenerationChunk(message=chunk))
+                yield ChatGenerationChunk(message=chunk)
+        finally:
+            self._exit()
@@ -0,0 +1,286 @@
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+
+# --- Rules ---
+
+# Keywords per category, matched as whole words or their plurals ("mom" does not
+# match "moment"). Stems end in "*" and match as prefixes ("grocer*" matches "groceries").
+CATEGORY_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "Work": (
+        "meeting", "stand-up", "standup", "presentation", "report", "email", "client",
+        "deadline", "review*", "1:1", "interview*", "slides", "project", "budget",
+        "sprint", "deploy*", "invoice", "workshop", "conference",
+    ),
+    "Health": (
+        "doctor", "dentist", "gym", "workout", "yoga", "therapy", "physio",
+        "meditat*", "jog*", "run ", "swim*", "check-up", "checkup",
+    ),
+    "Personal": (
+        "family", "friend", "birthday", "dinner with", "lunch with", "kids", "date night",
+        "mom", "dad", "party", "wedding", "read a book",
+    ),
+    "Chores": (
+        "grocer*", "laundry", "clean*", "dishes", "vacuum*", "bills", "shopping",
+        "cook*", "pick up", "take out the trash", "errand",
+    ),
+}
+
+MEETING_KEYWORDS = (
+    "meeting", "stand-up", "standup", "call with", "call at", "sync", "review*", "interview*", "1:1", "workshop",
+)
+
+
+def _keyword_pattern(keywords: Tuple[str, ...]) -> re.Pattern:
+    alternatives = []
+    for keyword in keywords:
+        if keyword.endswith("*"):
+            alternatives.append(re.escape(keyword[:-1]))
+        elif keyword[-1].isalnum():
+            # Hyphenated compounds ("party-line") are not the keyword either
+            alternatives.append(re.escape(keyword) + r"(?:e?s)?(?![\w-])")
+        else:
+            alternatives.append(re.escape(keyword))
+    return re.compile(r"(?<![\w-])(?:" + "|".join(alternatives) + ")", re.IGNORECASE)
+
+
+_KEYWORD_PATTERNS = {category: _keyword_pattern(keywords) for category, keywords in CATEGORY_KEYWORDS.items()}
+_MEETING_PATTERN = _keyword_pattern(MEETING_KEYWORDS)
+_TIME_12H = re.compile(r"\b(1[0-2]|0?[1-9])(?::([0-5]\d))?\s*([ap])\.?m\b", re.IGNORECASE)
+_TIME_24H = re.compile(r"\b([01]?\d|2[0-3]):([0-5]\d)\b")
+
+# Parsed times closer together than this count as back-to-back
+BACK_TO_BACK_MINUTES = 60
+
+
+def classify_task(task: str) -> Optional[Tuple[str, float]]:
+    """
+    Returns the most likely category of a task and a confidence in [0, 1],
+    or None if no rule matches.
+    """
+    hits = {category: len(pattern.findall(task)) for category, pattern in _KEYWORD_PATTERNS.items()}
+    hits = {category: count for category, count in hits.items() if count}
+    if not hits:
+        return None
+    category, count = max(hits.items(), key=lambda item: item[1])
+    if len(hits) == 1:
+        return category, 0.95 if count > 1 else 0.9
+    # Conflicting rules: confidence is the share of the winning category
+    return category, 0.7 * count / sum(hits.values())
+
+
+def parse_task_time(task: str) -> Optional[int]:
+    """Returns the time mentioned in a task ("10am", "9:30 pm", "14:00") as minutes after midnight."""
+    match = _TIME_12H.search(task)
+    if match:
+        hour = int(match.group(1)) % 12 + (12 if match.group(3).lower() == "p" else 0)
+        return hour * 60 + int(match.group(2) or 0)
+    match = _TIME_24H.search(task)
+    if match:
+        return int(match.group(1)) * 60 + int(match.group(2))
+    return None
+
+
+def categorize_by_rules(tasks: List[str]) -> Dict[str, List[str]]:
+    """Sorts tasks into categories by rule alone; tasks no rule matches go to "Other"."""
+    categorized: Dict[str, List[str]] = {}
+    for task in tasks:
+        result = classify_task(task)
+        categorized.setdefault(result[0] if result else "Other", []).append(task)
+    return categorized
+
+
+def workload_for_stress(stress_level: int) -> str:
+    """Maps a stress level onto the workload scale used by the analysis prompt."""
+    if stress_level <= 3:
+        return "light"
+    if stress_level <= 6:
+        return "moderate"
+    if stress_level <= 8:
+        return "heavy"
+    return "overwhelming"
+
+
+class HeuristicAssessment(BaseModel):
+    """Result of the local, rule-based assessment of a schedule."""
+
+    categories: Dict[str, str] = Field(
+        default_factory=dict, description="Category per confidently classified task"
+    )
+    guesses: Dict[str, str] = Field(
+        default_factory=dict, description="Best-guess category per task, including low-confidence ones"
+    )
+    stress_level: int = Field(..., description="Estimated stress level from 1-10")
+    confidence: float = Field(..., description="Confidence in the overall assessment, in [0, 1]")
+    meeting_count: int = 0
+    back_to_back_count: int = 0
+    short_circuit: bool = Field(
+        False, description="Whether the schedule is trivial enough to skip the LLM categorization and analysis"
+    )
+
+
+def assess_schedule(tasks: List[str]) -> HeuristicAssessment:
+    """
+    Categorizes recognizable tasks and estimates the stress level of a schedule
+    from task count, meeting density and the spacing of parsed times.
+    """
+    categories: Dict[str, str] = {}
+    guesses: Dict[str, str] = {}
+    for task in tasks:
+        result = classify_task(task)
+        if result is None:
+            continue
+        guesses[task] = result[0]
+        if result[1] >= settings.HEURISTIC_MIN_CONFIDENCE:
+            categories[task] = result[0]
+
+    meeting_count = sum(1 for task in tasks if _MEETING_PATTERN.search(task))
+    times = sorted(t for t in (parse_task_time(task) for task in tasks) if t is not None)
+    back_to_back_count = sum(1 for a, b in zip(times, times[1:]) if b - a < BACK_TO_BACK_MINUTES)
+    work_share = sum(1 for category in guesses.values() if category == "Work") / len(tasks) if tasks else 0
+
+    score = 1 + 0.6 * len(tasks) + 0.8 * meeting_count + 1.0 * back_to_back_count
+    if len(tasks) >= 5 and work_share > 0.7:
+        score += 2
+    stress_level = max(1, min(10, round(score)))
+
+    # Rules are most trustworthy for short lists where every task was recognized
+    coverage = len(categories) / len(tasks) if tasks else 0
+    size_penalty = 0.05 * max(0, len(tasks) - settings.HEURISTIC_MAX_TASKS)
+    confidence = max(0.0, min(coverage, 0.95) - size_penalty)
+
+    # The local analysis needs a category for every task, whatever the thresholds allow
+    short_circuit = (
+        0 < len(tasks) <= settings.HEURISTIC_MAX_TASKS
+        and len(categories) == len(tasks)
+        and confidence >= settings.HEURISTIC_MIN_CONFIDENCE
+        and stress_level <= settings.HEURISTIC_MAX_STRESS
+        and back_to_back_count == 0
+    )
+
+    return HeuristicAssessment(
+        categories=categories,
+        guesses=guesses,
+        stress_level=stress_level,
+        confidence=confidence,
+        meeting_count=meeting_count,
+        back_to_back_count=back_to_back_count,
+        short_circuit=short_circuit,
+    )
+
+
+def local_analysis(tasks: List[str], assessment: HeuristicAssessment) -> dict:
+    """Builds the state update that stands in for the categorize and analyze nodes."""
+    categorized_tasks: Dict[str, List[str]] = {}
+    for task in tasks:
+        categorized_tasks.setdefault(assessment.categories[task], []).append(task)
+    workload = workload_for_stress(assessment.stress_level)
+    return {
+        "categorized_tasks": categorized_tasks,
+        "analysis_report": (
+            f"Your schedule has {len(tasks)} task(s) with {assessment.meeting_count} meeting(s) "
+            f"and no back-to-back commitments. It looks {workload} and leaves room for breaks."
+        ),
+        "stress_level": assessment.stress_level,
+        "workload_assessment": workload,
+        "key_concerns": [],
+        "needs_rebalancing": False,
+    }
+
+
+def estimated_analysis(tasks: List[str]) -> dict:
+    """
+    Analysis fields estimated from the rules alone, used in place of the LLM
+    analysis when it is unavailable.
+    """
+    assessment = assess_schedule(tasks)
+    workload = workload_for_stress(assessment.stress_level)
+    key_concerns = []
+    if assessment.back_to_back_count:
+        key_concerns.append(f"{assessment.back_to_back_count} back-to-back commitment(s) without a break")
+    if assessment.meeting_count >= 3:
+        key_concerns.append(f"{assessment.meeting_count} meetings in one day")
+    return {
+        "analysis_report": (
+            f"Your schedule has {len(tasks)} task(s) with {assessment.meeting_count} meeting(s) and looks {workload}. "
+            "This is a quick estimate; a detailed analysis is not available right now."
+        ),
+        "stress_level": assessment.stress_level,
+        "workload_assessment": workload,
+        "key_concerns": key_concerns,
+        "needs_rebalancing": assessment.stress_level >= 8,
+    }
+
+
+# --- Metrics ---
+
+
+class HeuristicStats:
+    """Skip rate of the local pre-classifier and its agreement with the LLM path."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.assessed = 0
+            self.short_circuited = 0
+            self.tasks_seen = 0
+            self.tasks_classified = 0
+            self.category_comparisons = 0
+            self.category_agreements = 0
+            self.stress_comparisons = 0
+            self.stress_agreements = 0
+            self.stress_abs_error = 0
+
+    def record_assessment(self, task_count: int, assessment: HeuristicAssessment) -> None:
+        with self._lock:
+            self.assessed += 1
+            self.short_circuited += int(assessment.short_circuit)
+            self.tasks_seen += task_count
+            self.tasks_classified += len(assessment.categories)
+
+    def record_categories(self, heuristic: Dict[str, str], categorized_tasks: Dict[str, List[str]]) -> None:
+        """Compares heuristic categories with the categories the LLM picked for the same tasks."""
+        llm_categories = {task: category for category, tasks in categorized_tasks.items() for task in tasks}
+        with self._lock:
+            for task, category in heuristic.items():
+                if task in llm_categories:
+                    self.category_comparisons += 1
+                    self.category_agreements += int(llm_categories[task].casefold() == category.casefold())
+
+    def record_stress(self, heuristic_stress_level: int, llm_stress_level: Optional[int]) -> None:
+        """Compares the heuristic stress estimate with the LLM's; within one point counts as agreement."""
+        if llm_stress_level is None:
+            return
+        error = abs(heuristic_stress_level - llm_stress_level)
+        with self._lock:
+            self.stress_comparisons += 1
+            self.stress_agreements += int(error <= 1)
+            self.stress_abs_error += error
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "assessed": self.assessed,
+                "short_circuited": self.short_circuited,
+                "skip_rate": self.short_circuited / self.assessed if self.assessed else 0.0,
+                "task_coverage": self.tasks_classified / self.tasks_seen if self.tasks_seen else 0.0,
+                "category_agreement": (
+                    self.category_agreements / self.category_comparisons if self.category_comparisons else 0.0
+                ),
+                "stress_agreement": (
+                    self.stress_agreements / self.stress_comparisons if self.stress_comparisons else 0.0
+                ),
+                "stress_mean_abs_error": (
+                    self.stress_abs_error / self.stress_comparisons if self.stress_comparisons else 0.0
+                ),
+            }
+
+
+heuristic_stats = HeuristicStats()
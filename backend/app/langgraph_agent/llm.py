@@ -1,5 +1,136 @@
-from langchain_openai import ChatOpenAI
+import threading
+from typing import Any, Dict, Optional
 
-# Initialize the language model to be used by the agent's nodes.
+from app.core.config import settings
+
+# The language model used by the agent's nodes.
 # By placing this in its own file, we avoid circular import errors.
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+#
+# The client is created on first use rather than at import time: importing
+# `langchain_openai` and building `ChatOpenAI` is the most expensive part of
+# starting the app, and it needs credentials that tests and tooling may not have.
+_llm = None
+_lock = threading.Lock()
+
+
+def _create_openai_llm(model: str = "gpt-4o-mini", **options):
+    from langchain_openai import ChatOpenAI
+
+    from app.core.http import get_async_http_client, get_http_client, http_timeout
+
+    return ChatOpenAI(
+        model=model,
+        temperature=0,
+        # Shared, connection-pooled transport with explicit limits and timeouts
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+        timeout=http_timeout(),
+        # Retries are handled per node by app/langgraph_agent/resilience.py
+        max_retries=0 if settings.LLM_RESILIENCE_ENABLED else 2,
+        **options,
+    )
+
+
+def _create_azure_llm(model: str = "gpt-4o-mini", deployment: Optional[str] = None, **options):
+    from langchain_openai import AzureChatOpenAI
+
+    from app.core.http import get_async_http_client, get_http_client, http_timeout
+
+    return AzureChatOpenAI(
+        azure_endpoint=settings.AZURE_AI_ENDPOINT,
+        api_key=settings.AZURE_AI_API_KEY,
+        api_version=settings.AZURE_OPENAI_API_VERSION,
+        azure_deployment=deployment or model,
+        model=model,
+        temperature=0,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+        timeout=http_timeout(),
+        max_retries=0 if settings.LLM_RESILIENCE_ENABLED else 2,
+        **options,
+    )
+
+
+def _create_local_llm(model: str = "local", base_url: Optional[str] = None, **options):
+    # Any OpenAI-compatible server (Ollama, vLLM, llama.cpp); they ignore the key
+    return _create_openai_llm(
+        model=model,
+        base_url=base_url or settings.LOCAL_LLM_BASE_URL,
+        api_key=options.pop("api_key", "not-needed"),
+        **options,
+    )
+
+
+def _create_fake_llm(**options):
+    from app.langgraph_agent.fake_llm import FakeStructuredChatModel
+
+    if "model" in options:
+        options["model_name"] = options.pop("model")
+    return FakeStructuredChatModel(**{
+        "latency_seconds": settings.FAKE_LLM_LATENCY_SECONDS,
+        "latency_jitter_seconds": settings.FAKE_LLM_LATENCY_JITTER_SECONDS,
+        "failure_rate": settings.FAKE_LLM_FAILURE_RATE,
+        "seed": settings.FAKE_LLM_SEED,
+        **options,
+    })
+
+
+# Chat model factory per `settings.LLM_BACKEND` or model profile "backend"
+LLM_BACKENDS = {
+    "openai": _create_openai_llm,
+    "azure": _create_azure_llm,
+    "local": _create_local_llm,
+    "fake": _create_fake_llm,
+}
+
+# Profile keys that describe routing, not the client
+_ROUTING_KEYS = {"backend", "quality", "input_cost_per_1m", "output_cost_per_1m", "max_in_flight"}
+
+
+def create_llm(backend: Optional[str] = None, **options):
+    """
+    Builds a new chat model for a backend, defaulting to `settings.LLM_BACKEND`.
+    `options` (e.g. `model`) are passed to the backend's factory.
+    """
+    backend = backend or settings.LLM_BACKEND
+    if backend not in LLM_BACKENDS:
+        raise ValueError(f"Unknown LLM backend {backend!r}, expected one of {sorted(LLM_BACKENDS)}")
+    return LLM_BACKENDS[backend](**options)
+
+
+def create_profile_llm(profile: Dict[str, Any]):
+    """Builds the chat model of a model profile from `settings.LLM_MODELS`."""
+    options = {key: value for key, value in profile.items() if key not in _ROUTING_KEYS}
+    return create_llm(profile.get("backend"), **options)
+
+
+def uses_closed_client(model) -> bool:
+    """
+    True if a model was built on pooled HTTP clients that have since been
+    closed (by `aclose_http_clients` on shutdown); it has to be rebuilt.
+    """
+    clients = (getattr(model, "http_client", None), getattr(model, "http_async_client", None))
+    return any(client is not None and client.is_closed for client in clients)
+
+
+def get_llm():
+    """Returns the shared chat model, creating it on first use."""
+    global _llm
+    if _llm is None or uses_closed_client(_llm):
+        with _lock:
+            if _llm is None or uses_closed_client(_llm):
+                _llm = create_llm()
+    return _llm
+
+
+def set_llm(model) -> None:
+    """Replaces the shared chat model, e.g. with a fake model in tests and benchmarks."""
+    global _llm
+    _llm = model
+
+
+def __getattr__(name: str):
+    # Keeps `from app.langgraph_agent.llm import llm` working for existing callers
+    if name == "llm":
+        return get_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,201 @@
+import json
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.langgraph_agent.llm import create_profile_llm, get_llm, uses_closed_client
+
+# USD per million input/output tokens, for profiles that do not set their own prices
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+}
+
+# The model of `settings.LLM_BACKEND` (or the one passed to `set_llm`) is always a candidate
+DEFAULT_PROFILE = "default"
+# Quality of profiles that do not state one, which meets every default quality bar
+DEFAULT_QUALITY = 3
+# Number of recent call latencies per node used for the percentiles
+LATENCY_WINDOW = 200
+
+
+class ModelRoute(NamedTuple):
+    """The model profile a node's call was sent to."""
+
+    node: str
+    profile: str
+    model: Any
+    # True when the chosen profile was saturated and the call went elsewhere
+    fallback: bool
+
+
+def model_profiles() -> Dict[str, Dict[str, Any]]:
+    """The default model's profile plus the profiles configured in `settings.LLM_MODELS`."""
+    default = {"backend": settings.LLM_BACKEND, "model": "gpt-4o-mini", "quality": DEFAULT_QUALITY}
+    return {DEFAULT_PROFILE: default, **settings.LLM_MODELS}
+
+
+def profile_prices(profile: Dict[str, Any]) -> Tuple[float, float]:
+    """USD per million input and output tokens of a profile; local and fake models are free."""
+    known = (0.0, 0.0) if profile.get("backend") in ("local", "fake") else MODEL_PRICES.get(profile.get("model"), (0.0, 0.0))
+    return profile.get("input_cost_per_1m", known[0]), profile.get("output_cost_per_1m", known[1])
+
+
+class _NodeRouting:
+    """Latency window and counters of one node."""
+
+    def __init__(self):
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.calls = 0
+        self.failures = 0
+        self.fallbacks = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.models: Dict[str, int] = {}
+
+
+class ModelRouter:
+    """
+    Picks the model profile of each node's LLM call: the profile pinned in
+    `LLM_NODE_MODELS`, otherwise the cheapest profile whose quality meets the
+    node's bar in `LLM_NODE_MIN_QUALITY`. A profile with `max_in_flight` calls
+    running is saturated; the call then goes to the local stand-in
+    `LLM_FALLBACK_MODEL`, or, without one (or if it is saturated too), to the
+    next qualifying profile that has room.
+
+    Records per node latency, tokens and cost, so the bars and prices can be
+    tuned against real traffic.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models_lock = threading.Lock()
+        self._models: Dict[str, Tuple[str, Any]] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._nodes: Dict[str, _NodeRouting] = {}
+
+    def _model(self, name: str, profile: Dict[str, Any]):
+        if name == DEFAULT_PROFILE and DEFAULT_PROFILE not in settings.LLM_MODELS:
+            return get_llm()
+        # Rebuilt when the profile's configuration changes or its HTTP clients were closed
+        signature = json.dumps(profile, sort_keys=True, default=str)
+        entry = self._models.get(name)
+        if entry is None or entry[0] != signature or uses_closed_client(entry[1]):
+            with self._models_lock:
+                entry = self._models.get(name)
+                if entry is None or entry[0] != signature or uses_closed_client(entry[1]):
+                    entry = self._models[name] = (signature, create_profile_llm(profile))
+        return entry[1]
+
+    def _candidates(self, node: str, profiles: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Profiles that may serve a node, cheapest first."""
+        pinned = settings.LLM_NODE_MODELS.get(node)
+        if pinned in profiles:
+            return [pinned]
+        bar = settings.LLM_NODE_MIN_QUALITY.get(node, 0)
+        qualified = [name for name, profile in profiles.items() if profile.get("quality", DEFAULT_QUALITY) >= bar]
+        if not qualified:
+            return [DEFAULT_PROFILE]
+        return sorted(
+            qualified,
+            key=lambda name: (sum(profile_prices(profiles[name])), -profiles[name].get("quality", DEFAULT_QUALITY), name),
+        )
+
+    def _saturated(self, name: str, profile: Dict[str, Any]) -> bool:
+        limit = profile.get("max_in_flight")
+        return bool(limit) and self._in_flight.get(name, 0) >= limit
+
+    def primary(self, node: str) -> ModelRoute:
+        """The profile a node uses when nothing is saturated; its model identifies cached responses."""
+        profiles = model_profiles()
+        name = self._candidates(node, profiles)[0]
+        return ModelRoute(node, name, self._model(name, profiles[name]), False)
+
+    @contextmanager
+    def route(self, node: str, usage_handler=None) -> Iterator[ModelRoute]:
+        """
+        Chooses the profile of one LLM call and counts it as in flight while
+        the block runs. Latency, failures and, from `usage_handler` (a
+        `UsageMetadataCallbackHandler`), tokens and cost are recorded on exit.
+        """
+        profiles = model_profiles()
+        candidates = self._candidates(node, profiles)
+        stand_in = settings.LLM_FALLBACK_MODEL if settings.LLM_FALLBACK_MODEL in profiles else None
+        with self._lock:
+            if not self._saturated(candidates[0], profiles[candidates[0]]):
+                name = candidates[0]
+            elif stand_in and not self._saturated(stand_in, profiles[stand_in]):
+                name = stand_in
+            else:
+                name = next((name for name in candidates if not self._saturated(name, profiles[name])), candidates[0])
+            fallback = name != candidates[0]
+            self._in_flight[name] = self._in_flight.get(name, 0) + 1
+
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield ModelRoute(node, name, self._model(name, profiles[name]), fallback)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            latency = time.perf_counter() - start
+            usage = list(usage_handler.usage_metadata.values()) if usage_handler is not None else []
+            prompt_tokens = sum(entry.get("input_tokens", 0) for entry in usage)
+            completion_tokens = sum(entry.get("output_tokens", 0) for entry in usage)
+            input_price, output_price = profile_prices(profiles[name])
+            with self._lock:
+                self._in_flight[name] -= 1
+                state = self._nodes.setdefault(node, _NodeRouting())
+                state.latencies.append(latency)
+                state.calls += 1
+                state.failures += int(failed)
+                state.fallbacks += int(fallback)
+                state.prompt_tokens += prompt_tokens
+                state.completion_tokens += completion_tokens
+                state.cost_usd += (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+                state.models[name] = state.models.get(name, 0) + 1
+
+    def in_flight(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._in_flight)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._nodes.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per node: calls per profile, fallbacks, latency, tokens and cost."""
+        with self._lock:
+            nodes = {
+                node: (list(state.latencies), {**vars(state), "models": dict(state.models)})
+                for node, state in self._nodes.items()
+            }
+        stats = {}
+        for node, (latencies, state) in nodes.items():
+            stats[node] = {
+                "calls": state["calls"],
+                "failures": state["failures"],
+                "fallbacks": state["fallbacks"],
+                "models": state["models"],
+                "latency_ms_p50": statistics.median(latencies) * 1000 if latencies else 0.0,
+                "latency_ms_p95": (
+                    statistics.quantiles(latencies, n=20)[-1] * 1000 if len(latencies) > 1 else (latencies or [0.0])[0] * 1000
+                ),
+                "prompt_tokens": state["prompt_tokens"],
+                "completion_tokens": state["completion_tokens"],
+                "cost_usd": state["cost_usd"],
+                "cost_usd_per_call": state["cost_usd"] / state["calls"] if state["calls"] else 0.0,
+            }
+        return stats
+
+
+model_router = ModelRouter()
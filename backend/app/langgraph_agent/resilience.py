@@ -0,0 +1,332 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import random
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Number of recent call latencies per node used to estimate its p95
+LATENCY_WINDOW = 200
+# Calls a node needs before its hedge delay follows the observed p95
+MIN_HEDGE_SAMPLES = 20
+
+# 4xx statuses that are worth retrying; any other 4xx is a permanent error
+_RETRYABLE_CLIENT_STATUSES = {408, 409, 429}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the LLM while a node's circuit breaker is open."""
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    """Raised when an LLM call misses its node's deadline."""
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether a failed LLM call may succeed when repeated."""
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int) and 400 <= status < 500:
+        return status in _RETRYABLE_CLIENT_STATUSES
+    return not isinstance(exc, CircuitOpenError)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter before retry number `attempt` (0-based)."""
+    cap = min(settings.LLM_RETRY_MAX_DELAY_SECONDS, settings.LLM_RETRY_BASE_DELAY_SECONDS * 2 ** attempt)
+    return random.uniform(0, cap)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker. After `failure_threshold` failed calls
+    in a row it opens and rejects calls for `reset_seconds`; then a single
+    trial call is let through (half-open), which closes it again on success.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_started_at: Optional[float] = None
+        self.opened_total = 0
+        self.rejected_total = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go to the LLM now."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self._state = self.HALF_OPEN
+            # One trial call at a time; a trial that never reported back (e.g. it
+            # was cancelled) is given up on after another reset period
+            now = time.monotonic()
+            if self._state == self.HALF_OPEN and (
+                self._trial_started_at is None or now - self._trial_started_at >= self.reset_seconds
+            ):
+                self._trial_started_at = now
+                return True
+            self.rejected_total += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_started_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_started_at = None
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.opened_total += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class _NodeResilience:
+    """Breaker, latency window and counters of one node."""
+
+    def __init__(self):
+        self.breaker = CircuitBreaker(settings.LLM_BREAKER_FAILURE_THRESHOLD, settings.LLM_BREAKER_RESET_SECONDS)
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.hedges = 0
+        self.hedges_won = 0
+        self.fallbacks = 0
+
+
+class ResilientCaller:
+    """
+    Wraps the LLM call of a node with a deadline, jittered retries, optional
+    hedged duplicate requests and a per-node circuit breaker.
+
+    A call is hedged when it has not finished after the node's recent p95
+    latency (or `LLM_HEDGE_DELAY_SECONDS` until enough calls were seen): a
+    second, identical request is started and whichever finishes first wins.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._nodes: Dict[str, _NodeResilience] = {}
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    def _node(self, node: str) -> _NodeResilience:
+        with self._lock:
+            if node not in self._nodes:
+                self._nodes[node] = _NodeResilience()
+            return self._nodes[node]
+
+    def _count(self, node: str, field: str) -> None:
+        state = self._node(node)
+        with self._lock:
+            setattr(state, field, getattr(state, field) + 1)
+
+    def record_fallback(self, node: str) -> None:
+        self._count(node, "fallbacks")
+
+    def _deadline(self, node: str) -> Optional[float]:
+        return settings.LLM_NODE_TIMEOUT_SECONDS.get(node)
+
+    def _hedge_delay(self, node: str) -> Optional[float]:
+        if not settings.LLM_HEDGE_ENABLED:
+            return None
+        state = self._node(node)
+        with self._lock:
+            samples = list(state.latencies)
+        if len(samples) < MIN_HEDGE_SAMPLES:
+            return settings.LLM_HEDGE_DELAY_SECONDS
+        return statistics.quantiles(samples, n=20)[-1]
+
+    def _record_success(self, node: str, state: _NodeResilience, latency: float) -> None:
+        state.breaker.record_success()
+        with self._lock:
+            state.latencies.append(latency)
+
+    # --- Async ---
+
+    async def acall(self, node: str, make_call: Callable[[], Awaitable[T]]) -> T:
+        """Runs `make_call` under the node's resilience policy; raises once retries are exhausted."""
+        state = self._node(node)
+        if not state.breaker.allow():
+            raise CircuitOpenError(f"Circuit breaker of node {node!r} is open")
+        self._count(node, "calls")
+
+        attempts = max(1, settings.LLM_RETRY_MAX_ATTEMPTS)
+        for attempt in range(attempts):
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(self._ahedged(node, make_call), self._deadline(node))
+            except Exception as exc:
+                if isinstance(exc, asyncio.TimeoutError):
+                    self._count(node, "timeouts")
+                    exc = LLMDeadlineExceeded(f"LLM call of node {node!r} missed its deadline")
+                if attempt + 1 >= attempts or not is_retryable(exc):
+                    self._count(node, "failures")
+                    state.breaker.record_failure()
+                    raise exc
+                self._count(node, "retries")
+                logger.warning("Retrying LLM call of node %s after %s", node, type(exc).__name__)
+                await asyncio.sleep(backoff_delay(attempt))
+            else:
+                self._record_success(node, state, time.perf_counter() - start)
+                return result
+
+    async def _ahedged(self, node: str, make_call: Callable[[], Awaitable[T]]) -> T:
+        delay = self._hedge_delay(node)
+        if delay is None:
+            return await make_call()
+
+        tasks = [asyncio.ensure_future(make_call())]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                self._count(node, "hedges")
+                tasks.append(asyncio.ensure_future(make_call()))
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if len(tasks) > 1 and task is tasks[1]:
+                            self._count(node, "hedges_won")
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    # --- Sync ---
+
+    def _submit(self, make_call: Callable[[], T]) -> concurrent.futures.Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=settings.LLM_RESILIENCE_MAX_THREADS, thread_name_prefix="llm-call"
+                )
+        # Each attempt runs in a copy of the caller's context, so tracing and
+        # callbacks keep working inside the worker thread
+        return self._executor.submit(contextvars.copy_context().run, make_call)
+
+    def call(self, node: str, make_call: Callable[[], T]) -> T:
+        """
+        Sync version of `acall`. Attempts run on a worker pool so the deadline
+        can be enforced; a timed-out attempt is abandoned, not interrupted.
+        """
+        state = self._node(node)
+        if not state.breaker.allow():
+            raise CircuitOpenError(f"Circuit breaker of node {node!r} is open")
+        self._count(node, "calls")
+
+        attempts = max(1, settings.LLM_RETRY_MAX_ATTEMPTS)
+        for attempt in range(attempts):
+            start = time.perf_counter()
+            try:
+                result = self._hedged(node, make_call)
+            except Exception as exc:
+                if attempt + 1 >= attempts or not is_retryable(exc):
+                    self._count(node, "failures")
+                    state.breaker.record_failure()
+                    raise
+                self._count(node, "retries")
+                logger.warning("Retrying LLM call of node %s after %s", node, type(exc).__name__)
+                time.sleep(backoff_delay(attempt))
+            else:
+                self._record_success(node, state, time.perf_counter() - start)
+                return result
+
+    def _hedged(self, node: str, make_call: Callable[[], T]) -> T:
+        deadline = self._deadline(node)
+        expires = time.monotonic() + deadline if deadline is not None else None
+        delay = self._hedge_delay(node)
+
+        def remaining() -> Optional[float]:
+            return None if expires is None else max(0.0, expires - time.monotonic())
+
+        futures = [self._submit(make_call)]
+        wait = remaining()
+        if delay is not None:
+            wait = delay if wait is None else min(delay, wait)
+        done, _ = concurrent.futures.wait(futures, timeout=wait)
+        if not done and delay is not None and (expires is None or time.monotonic() < expires):
+            self._count(node, "hedges")
+            futures.append(self._submit(make_call))
+
+        pending = set(futures)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, timeout=remaining(), return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            if not done:
+                self._count(node, "timeouts")
+                raise LLMDeadlineExceeded(f"LLM call of node {node!r} missed its deadline")
+            for future in done:
+                if future.exception() is None:
+                    if len(futures) > 1 and future is futures[1]:
+                        self._count(node, "hedges_won")
+                    for other in pending:
+                        other.cancel()
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    # --- Metrics ---
+
+    def reset(self) -> None:
+        with self._lock:
+            self._nodes.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per node: call, retry, timeout, hedge and fallback counters, plus the breaker state."""
+        with self._lock:
+            nodes = dict(self._nodes)
+        return {
+            node: {
+                "calls": state.calls,
+                "failures": state.failures,
+                "retries": state.retries,
+                "timeouts": state.timeouts,
+                "hedges": state.hedges,
+                "hedges_won": state.hedges_won,
+                "fallbacks": state.fallbacks,
+                "breaker_state": state.breaker.state,
+                "breaker_opened_total": state.breaker.opened_total,
+                "breaker_rejected_total": state.breaker.rejected_total,
+            }
+            for node, state in nodes.items()
+        }
+
+
+llm_resilience = ResilientCaller()
@@ -45,6 +45,21 @@ class EnhancedAnalysisResult(BaseModel):
     )
 
 
+class FusedAnalysisResult(EnhancedAnalysisResult):
+    """
+    Categorization and enhanced analysis returned by a single LLM call.
+    Used by the fast-mode graph to save one round-trip.
+    """
+
+    categorized_tasks: Optional[Dict[str, List[str]]] = Field(
+        default=None,
+        description=(
+            "A dictionary where keys are categories (e.g., 'Work', 'Personal', 'Health') "
+            "and values are the lists of tasks belonging to that category."
+        ),
+    )
+
+
 class AnalysisResult(BaseModel):
     """
     A Pydantic model to structure the final analysis and suggestions.
@@ -0,0 +1,212 @@
+import re
+import threading
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.langgraph_agent.task_index import normalize_task
+
+# Character n-grams hashed into each vector
+NGRAM_SIZE = 3
+# Words that do not change what a task is ("Team standup 9am" vs "Team stand-up at 9am")
+STOPWORDS = frozenset({"a", "an", "and", "at", "for", "in", "of", "on", "the", "to", "with"})
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+
+
+def _ngram_text(text: str) -> str:
+    words = _PUNCTUATION.sub("", normalize_task(text)).split()
+    return f" {' '.join(word for word in words if word not in STOPWORDS)} "
+
+
+def embed(texts: Sequence[str], dim: int) -> np.ndarray:
+    """
+    Unit-length hashed character n-gram vectors of `texts`, one row each.
+    Texts are compared case-, punctuation- and stopword-insensitively, so
+    their cosine similarity is the dot product of their rows.
+    """
+    rows: List[int] = []
+    columns: List[int] = []
+    for row, text in enumerate(texts):
+        padded = _ngram_text(text)
+        for start in range(len(padded) - NGRAM_SIZE + 1):
+            rows.append(row)
+            columns.append(zlib.crc32(padded[start:start + NGRAM_SIZE].encode("utf-8")) % dim)
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    np.add.at(vectors, (rows, columns), 1.0)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+class SemanticIndex:
+    """
+    Bounded near-duplicate memo: maps texts to values and answers lookups
+    with the value of the most similar stored text, if its cosine similarity
+    is at least `threshold`. Lookups are batched into one matrix product
+    against every stored vector. Beyond `max_entries`, the least recently
+    used entry is replaced.
+
+    Every time values are added, the index first checks what it would have
+    answered for those texts from its near neighbours and counts how often
+    that agrees with the new values (by `agree`, default equality). In
+    shadow mode, where near hits are looked up but not used, this measures
+    the accuracy of the current threshold on live traffic.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        threshold: float,
+        dim: int = 512,
+        enabled: bool = True,
+        agree: Optional[Callable[[Any, Any], bool]] = None,
+    ):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.dim = dim
+        self.enabled = enabled
+        self._agree = agree or (lambda predicted, actual: predicted == actual)
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+            self._last_used = np.zeros(0, dtype=np.int64)
+            self._keys: List[Optional[str]] = []
+            self._values: List[Any] = []
+            self._slots: Dict[str, int] = {}
+            self._size = 0
+            self._clock = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.comparisons = 0
+            self.agreements = 0
+
+    def _nearest(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Slot and similarity of the closest stored vector to each row."""
+        scores = vectors @ self._vectors[:self._size].T
+        slots = scores.argmax(axis=1)
+        return slots, scores[np.arange(len(vectors)), slots]
+
+    def search(self, texts: Sequence[str]) -> List[Optional[Tuple[Any, float]]]:
+        """The stored value and similarity of each text's nearest neighbour, or None below the threshold."""
+        if not self.enabled or not texts:
+            return [None] * len(texts)
+        vectors = embed(texts, self.dim)
+        with self._lock:
+            if not self._size:
+                self.misses += len(texts)
+                return [None] * len(texts)
+            slots, scores = self._nearest(vectors)
+            hit = scores >= self.threshold
+            self._clock += 1
+            self._last_used[slots[hit]] = self._clock
+            self.hits += int(hit.sum())
+            self.misses += int((~hit).sum())
+            return [
+                (self._values[slot], float(score)) if is_hit else None
+                for slot, score, is_hit in zip(slots.tolist(), scores.tolist(), hit.tolist())
+            ]
+
+    def lookup(self, text: str) -> Optional[Any]:
+        """The value stored for the nearest neighbour of one text, or None."""
+        match = self.search([text])[0]
+        return match[0] if match is not None else None
+
+    def add(self, texts: Sequence[str], values: Sequence[Any]) -> None:
+        """Stores values under their texts, replacing the entry of a text that is already known."""
+        if not self.enabled or not texts:
+            return
+        vectors = embed(texts, self.dim)
+        # Texts that only differ in case, punctuation or stopwords share one entry
+        keys = [_ngram_text(text).strip() for text in texts]
+        with self._lock:
+            self._compare(vectors, keys, values)
+            for key, vector, value in zip(keys, vectors, values):
+                slot = self._slots.get(key)
+                if slot is None:
+                    slot = self._slots[key] = self._free_slot()
+                    self._keys[slot] = key
+                self._vectors[slot] = vector
+                self._values[slot] = value
+                self._clock += 1
+                self._last_used[slot] = self._clock
+
+    def _compare(self, vectors: np.ndarray, keys: List[str], values: Sequence[Any]) -> None:
+        """Counts how often the near neighbours of new texts agree with their new values."""
+        new = [row for row, key in enumerate(keys) if key not in self._slots]
+        if not self._size or not new:
+            return
+        slots, scores = self._nearest(vectors[new])
+        for row, slot, score in zip(new, slots.tolist(), scores.tolist()):
+            if score >= self.threshold:
+                self.comparisons += 1
+                self.agreements += int(bool(self._agree(self._values[slot], values[row])))
+
+    def _free_slot(self) -> int:
+        if self._size < len(self._keys):
+            self._size += 1
+            return self._size - 1
+        if self._size < self.max_entries:
+            # Storage grows by doubling up to `max_entries`
+            capacity = min(self.max_entries, max(64, 2 * self._size))
+            self._vectors = np.vstack([self._vectors, np.zeros((capacity - self._size, self.dim), dtype=np.float32)])
+            self._last_used = np.concatenate([self._last_used, np.zeros(capacity - self._size, dtype=np.int64)])
+            self._keys.extend([None] * (capacity - self._size))
+            self._values.extend([None] * (capacity - self._size))
+            self._size += 1
+            return self._size - 1
+        slot = int(self._last_used[:self._size].argmin())
+        del self._slots[self._keys[slot]]
+        self.evictions += 1
+        return slot
+
+    def stats(self) -> Dict[str, float]:
+        """Size, hit rate, evictions and agreement of near hits with fresh answers."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "comparisons": self.comparisons,
+                "agreement": self.agreements / self.comparisons if self.comparisons else 0.0,
+            }
+
+
+def schedule_text(categorized_tasks: Dict[str, List[str]]) -> str:
+    """Order-insensitive text of a categorized schedule, used to look up similar schedules."""
+    return "\n".join(sorted(normalize_task(task) for tasks in categorized_tasks.values() for task in tasks))
+
+
+def _analyses_agree(predicted, actual) -> bool:
+    # Within one stress point and the same routing decision, as for the heuristic estimates
+    return (
+        abs(predicted.stress_level - actual.stress_level) <= 1
+        and predicted.needs_rebalancing == actual.needs_rebalancing
+    )
+
+
+# Categories of tasks, for the categorize node
+semantic_task_index = SemanticIndex(
+    max_entries=settings.SEMANTIC_TASK_MAX_ENTRIES,
+    threshold=settings.SEMANTIC_TASK_THRESHOLD,
+    dim=settings.SEMANTIC_VECTOR_DIM,
+    enabled=settings.SEMANTIC_CACHE_ENABLED,
+    agree=lambda predicted, actual: predicted.casefold() == actual.casefold(),
+)
+# `EnhancedAnalysisResult`s of whole schedules, for the analyze node
+semantic_analysis_cache = SemanticIndex(
+    max_entries=settings.SEMANTIC_SCHEDULE_MAX_ENTRIES,
+    threshold=settings.SEMANTIC_SCHEDULE_THRESHOLD,
+    dim=settings.SEMANTIC_VECTOR_DIM,
+    enabled=settings.SEMANTIC_CACHE_ENABLED,
+    agree=_analyses_agree,
+)
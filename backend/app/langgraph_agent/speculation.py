@@ -0,0 +1,70 @@
+import threading
+from typing import Dict, List
+
+from app.core.config import settings
+
+BRANCHES = ("suggest", "rebalance")
+
+
+def speculative_branches(estimated_stress: int, likely_branch: str) -> List[str]:
+    """
+    Branches to start alongside the analysis: both for borderline schedules,
+    whose route is hard to call in advance, otherwise only the likely one.
+    """
+    if settings.SPECULATION_BOTH_MIN_STRESS <= estimated_stress <= settings.SPECULATION_BOTH_MAX_STRESS:
+        return list(BRANCHES)
+    return [likely_branch]
+
+
+class SpeculationStats:
+    """
+    Outcome of speculative branch execution: how often the router picked a
+    branch that was already running, the tokens spent on discarded branches,
+    and the latency saved compared with running the branch after the analysis.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.runs = 0
+            self.branches_started = 0
+            self.hits = 0
+            self.misses = 0
+            self.cancelled = 0
+            self.wasted_prompt_tokens = 0
+            self.wasted_completion_tokens = 0
+            self.latency_saved_ms = 0.0
+
+    def record_run(self, branches_started: int, hit: bool, latency_saved_ms: float) -> None:
+        with self._lock:
+            self.runs += 1
+            self.branches_started += branches_started
+            self.hits += int(hit)
+            self.misses += int(not hit)
+            self.latency_saved_ms += max(0.0, latency_saved_ms)
+
+    def record_waste(self, prompt_tokens: int, completion_tokens: int, cancelled: bool) -> None:
+        with self._lock:
+            self.cancelled += int(cancelled)
+            self.wasted_prompt_tokens += prompt_tokens
+            self.wasted_completion_tokens += completion_tokens
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "branches_started": self.branches_started,
+                "hit_rate": self.hits / self.runs if self.runs else 0.0,
+                "misses": self.misses,
+                "cancelled": self.cancelled,
+                "wasted_prompt_tokens": self.wasted_prompt_tokens,
+                "wasted_completion_tokens": self.wasted_completion_tokens,
+                "latency_saved_ms": self.latency_saved_ms,
+                "latency_saved_ms_per_run": self.latency_saved_ms / self.runs if self.runs else 0.0,
+            }
+
+
+speculation_stats = SpeculationStats()
@@ -0,0 +1,128 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_task(task: str) -> str:
+    """Canonical form of a task string: case-folded with collapsed whitespace."""
+    return _WHITESPACE.sub(" ", task).strip().casefold()
+
+
+class TaskCategoryIndex:
+    """
+    Bounded LRU memo of which category each task was sorted into.
+
+    The categorize node only sends tasks that are not in the index to the LLM
+    and fills in the rest from here, so the cost of a request scales with the
+    number of new tasks instead of the size of the list.
+    """
+
+    def __init__(self, max_entries: int = 10_000, enabled: bool = True):
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._categories: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, task: str) -> Optional[str]:
+        """Returns the remembered category of a task, or None if it is unseen."""
+        if not self.enabled:
+            return None
+        key = normalize_task(task)
+        with self._lock:
+            category = self._categories.get(key)
+            if category is None:
+                self.misses += 1
+                return None
+            self._categories.move_to_end(key)
+            self.hits += 1
+            return category
+
+    def split(self, tasks: List[str]) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Splits tasks into those with a known category and those that still need
+        the LLM. Duplicates of an unseen task are only returned once.
+        """
+        known: Dict[str, str] = {}
+        unseen: List[str] = []
+        pending = set()
+        for task in tasks:
+            category = self.lookup(task)
+            if category is not None:
+                known[task] = category
+            elif normalize_task(task) not in pending:
+                pending.add(normalize_task(task))
+                unseen.append(task)
+        return known, unseen
+
+    def record(self, categorized_tasks: Dict[str, List[str]]) -> None:
+        """Remembers the categories of an LLM categorization result."""
+        if not self.enabled:
+            return
+        with self._lock:
+            for category, tasks in categorized_tasks.items():
+                for task in tasks:
+                    key = normalize_task(task)
+                    self._categories[key] = category
+                    self._categories.move_to_end(key)
+            while len(self._categories) > self.max_entries:
+                self._categories.popitem(last=False)
+                self.evictions += 1
+
+    def merge(self, tasks: List[str], known: Dict[str, str], categorized_tasks: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """
+        Combines remembered categories with a fresh LLM result into one
+        `categorized_tasks` dict, keeping the user's own task wording and order.
+        Tasks the LLM returned in a different wording are matched on their
+        normalized form.
+        """
+        fresh: Dict[str, Tuple[str, str]] = {}
+        for category, category_tasks in categorized_tasks.items():
+            for task in category_tasks:
+                fresh.setdefault(normalize_task(task), (category, task))
+
+        merged: Dict[str, List[str]] = {}
+        matched = set()
+        for task in tasks:
+            if task in known:
+                category = known[task]
+            else:
+                key = normalize_task(task)
+                if key not in fresh:
+                    continue
+                matched.add(key)
+                category = fresh[key][0]
+            merged.setdefault(category, []).append(task)
+
+        # Keep anything the LLM returned that does not map back onto an input task
+        for key, (category, task) in fresh.items():
+            if key not in matched:
+                merged.setdefault(category, []).append(task)
+        return merged
+
+    def clear(self) -> None:
+        with self._lock:
+            self._categories.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the size and the hit/miss/eviction counters of the index."""
+        with self._lock:
+            return {
+                "size": len(self._categories),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+task_category_index = TaskCategoryIndex(
+    max_entries=settings.TASK_INDEX_MAX_ENTRIES,
+    enabled=settings.TASK_INDEX_ENABLED,
+)
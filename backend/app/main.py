@@ -1,12 +1,74 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from app.api.v1 import router as api_v1_router
+from app.core.config import settings
+from app.core.http import aclose_http_clients, pool_stats
+from app.core.metrics import MetricsMiddleware, metrics_registry, stats_collector
+from app.core.tracing import RequestIDMiddleware, configure_tracing, shutdown_tracing
+from app.langgraph_agent.agent import warm_up
+from app.langgraph_agent.cache import llm_cache
+from app.langgraph_agent.checkpoints import open_checkpointer, session_registry
+from app.langgraph_agent.compaction import prompt_stats
+from app.langgraph_agent.heuristics import heuristic_stats
+from app.langgraph_agent.model_router import model_router
+from app.langgraph_agent.resilience import llm_resilience
+from app.langgraph_agent.semantic_index import semantic_analysis_cache, semantic_task_index
+from app.langgraph_agent.speculation import speculation_stats
+from app.langgraph_agent.task_index import task_category_index
+from app.services.analysis_service import analysis_flights, analysis_jobs
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Starts the log sinks, opens the session checkpointer, builds the LLM
+    client and compiles the agent graphs before serving traffic. On shutdown
+    it stops the background job workers and closes the pooled LLM
+    connections, the checkpointer and the log sinks.
+    """
+    configure_tracing()
+    try:
+        async with open_checkpointer():
+            if settings.WARM_UP_ON_STARTUP:
+                warm_up()
+            yield
+            analysis_jobs.shutdown()
+            await aclose_http_clients()
+    finally:
+        shutdown_tracing()
+
 
 app = FastAPI(
     title="AI-Powered Work-Life Balance Assistant",
     description="An API for analyzing schedules to improve work-life balance.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Tag every request with an ID that shows up in its log records and node spans
+app.add_middleware(RequestIDMiddleware)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    # Components that already keep `stats()` are read at scrape time
+    for prefix, stats, label in [
+        ("llm_cache", llm_cache.stats, None),
+        ("task_index", task_category_index.stats, None),
+        ("semantic_task_index", semantic_task_index.stats, None),
+        ("semantic_analysis_cache", semantic_analysis_cache.stats, None),
+        ("llm_http_pool", pool_stats, "client"),
+        ("llm_resilience", llm_resilience.stats, "node"),
+        ("llm_routing", model_router.stats, "node"),
+        ("prompt", prompt_stats.stats, "node"),
+        ("heuristics", heuristic_stats.stats, None),
+        ("speculation", speculation_stats.stats, None),
+        ("sessions", session_registry.stats, None),
+        ("coalescing", analysis_flights.stats, None),
+        ("analysis_jobs", analysis_jobs.stats, None),
+    ]:
+        metrics_registry.add_collector(stats_collector(prefix, stats, label))
+
 # Include the API router
 app.include_router(api_v1_router.router, prefix="/api/v1")
 
@@ -15,3 +77,11 @@ app.include_router(api_v1_router.router, prefix="/api/v1")
 def read_root():
     """A simple health check endpoint."""
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Request, node, token and cache metrics in the Prometheus text format."""
+    if not settings.METRICS_ENABLED:
+        return PlainTextResponse("Metrics are disabled\n", status_code=404)
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
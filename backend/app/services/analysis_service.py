@@ -1,22 +1,387 @@
-from typing import List, Dict
-from app.langgraph_agent.agent import WorkLifeBalanceAgent
+import asyncio
+import logging
+import weakref
+from typing import AsyncIterator, List, Dict, Optional, Tuple, Union
+from langchain_core.utils.json import parse_partial_json
+from app.core.config import settings
+from app.langgraph_agent.agent import aprecategorize_tasks, get_agent, get_session_agent, should_rebalance
+from app.langgraph_agent.checkpoints import aprune_session, get_checkpointer, session_registry
+from app.langgraph_agent.task_index import normalize_task
+from app.services.coalescing import SingleFlight
+from app.services.jobs import JobQueue
+from app.services.weekly import reduce_week
 
+# Report fields whose text is streamed token by token, per graph node
+STREAMED_REPORT_FIELDS = {
+    "analyze": "analysis_report",
+    "categorize_and_analyze": "analysis_report",
+    "rebalance": "rebalance_report",
+}
 
-def analyze_schedule_service(tasks: List[str]) -> Dict:
+logger = logging.getLogger(__name__)
+
+
+# In-flight analyses, shared by identical concurrent requests
+analysis_flights = SingleFlight()
+
+
+def _flight_key(tasks: List[str], mode: Optional[str]) -> Tuple:
+    # Same normalization as the task index and sessions: order, case and spacing do not matter
+    normalized = sorted(normalize_task(task) for task in tasks if isinstance(task, str))
+    return (mode or settings.ANALYSIS_MODE, tuple(normalized))
+
+
+def _in_own_wording(result: Dict, tasks: List[str]) -> Dict:
     """
-    This service invokes the enhanced LangGraph agent to perform the full
-    schedule analysis with stress assessment and conditional rebalancing.
+    A shared analysis in one caller's own task strings and order. Requests
+    coalesce with any reordered or recased copy of their task list, whose
+    wording the shared `categorized_tasks`, `tasks_to_reschedule` and
+    `tasks_to_delegate` are in.
     """
-    print("Analysis service: Invoking enhanced LangGraph agent...")
+    own: Dict[str, str] = {}
+    for task in tasks:
+        if isinstance(task, str):
+            own.setdefault(normalize_task(task), task)
+    position = {key: index for index, key in enumerate(own)}
+
+    def reword(items: List[str]) -> List[str]:
+        return [own.get(normalize_task(task), task) for task in items]
+
+    def rank(task: str) -> int:
+        # Tasks the LLM added go last, as in `TaskCategoryIndex.merge`
+        return position.get(normalize_task(task), len(position))
+
+    categorized = {
+        category: sorted(reword(category_tasks), key=rank)
+        for category, category_tasks in result.get("categorized_tasks", {}).items()
+    }
+    reworded = {
+        **result,
+        "categorized_tasks": dict(
+            sorted(categorized.items(), key=lambda item: rank(item[1][0]) if item[1] else len(position))
+        ),
+    }
+    for field in ("tasks_to_reschedule", "tasks_to_delegate"):
+        if result.get(field):
+            reworded[field] = reword(result[field])
+    return reworded
+
+
+async def _analyze(tasks: List[str], mode: Optional[str]) -> Dict:
+    logger.info("Invoking enhanced LangGraph agent")
 
     # The initial state for the agent
     initial_state = {"tasks": tasks}
 
     # Run the agent and get the final state
-    final_state = WorkLifeBalanceAgent.invoke(initial_state)
+    final_state = await get_agent(mode).ainvoke(initial_state)
+
+    logger.info("Agent finished")
+
+    return build_response(final_state)
+
+
+def _analyze_sync(tasks: List[str], mode: Optional[str]) -> Dict:
+    logger.info("Invoking enhanced LangGraph agent")
+    final_state = get_agent(mode).invoke({"tasks": tasks})
+    logger.info("Agent finished")
+    return build_response(final_state)
+
+
+async def analyze_schedule_service(tasks: List[str], mode: Optional[str] = None) -> Dict:
+    """
+    This service invokes the enhanced LangGraph agent to perform the full
+    schedule analysis with stress assessment and conditional rebalancing.
+
+    The graph is run with `ainvoke`, so the LLM round-trips are awaited on the
+    event loop instead of blocking a threadpool worker for the whole request.
+    `mode` picks the "standard", "fast" or "speculative" graph (see `get_agent`).
+
+    With `COALESCE_REQUESTS_ENABLED`, concurrent requests for the same
+    normalized task list share one graph execution, and each gets its
+    response back in its own task wording and order.
+    """
+    if not settings.COALESCE_REQUESTS_ENABLED:
+        return await _analyze(tasks, mode)
+    result = await analysis_flights.ado(_flight_key(tasks, mode), lambda: _analyze(tasks, mode))
+    return _in_own_wording(result, tasks)
+
+
+def analyze_schedule_service_sync(tasks: List[str], mode: Optional[str] = None) -> Dict:
+    """
+    Blocking version of `analyze_schedule_service` for callers without an
+    event loop (scripts, worker threads). It coalesces with async requests
+    for the same task list; never call it from the event loop itself.
+    """
+    if not settings.COALESCE_REQUESTS_ENABLED:
+        return _analyze_sync(tasks, mode)
+    result = analysis_flights.do(_flight_key(tasks, mode), lambda: _analyze_sync(tasks, mode))
+    return _in_own_wording(result, tasks)
+
+
+class _ReportDeltas:
+    """
+    Turns the streamed tool call chunks of the report nodes into text deltas.
+    Structured output arrives as tool call arguments, i.e. a growing JSON
+    document, which is buffered per LLM run.
+
+    A node's first run streams live. Once another run of the node shows up
+    (a retry or a hedged duplicate) live deltas stop, and only the run that
+    finishes adds the rest of its text. If that text does not continue what
+    was already sent, one delta with `reset: true` carries its full text.
+    """
+
+    def __init__(self):
+        self._arguments: Dict[str, str] = {}
+        self._live_run: Dict[str, Optional[str]] = {}
+        self._sent: Dict[str, str] = {}
+        self._finished: set = set()
+
+    def feed(self, node: Optional[str], message) -> Optional[Dict]:
+        field = STREAMED_REPORT_FIELDS.get(node)
+        run_id = getattr(message, "id", None)
+        if field is None or run_id is None or node in self._finished:
+            return None
+        chunks = getattr(message, "tool_call_chunks", None) or []
+        self._arguments[run_id] = self._arguments.get(run_id, "") + "".join(chunk.get("args") or "" for chunk in chunks)
+        if self._live_run.setdefault(node, run_id) != run_id:
+            self._live_run[node] = None
+        finished = getattr(message, "chunk_position", None) == "last"
+        if finished:
+            self._finished.add(node)
+        elif self._live_run[node] != run_id:
+            return None
+
+        try:
+            partial = parse_partial_json(self._arguments[run_id])
+        except ValueError:
+            return None
+        text = partial.get(field) if isinstance(partial, dict) else None
+        if not isinstance(text, str):
+            return None
+        sent = self._sent.get(node, "")
+        if text.startswith(sent):
+            if len(text) == len(sent):
+                return None
+            self._sent[node] = text
+            return {"node": node, "field": field, "delta": text[len(sent):]}
+        if not finished:
+            return None
+        self._sent[node] = text
+        return {"node": node, "field": field, "delta": text, "reset": True}
+
+
+async def stream_schedule_analysis_service(
+    tasks: List[str], include_tokens: bool = False, mode: Optional[str] = None
+) -> AsyncIterator[Tuple[str, Dict]]:
+    """
+    Runs the agent with `astream` and yields `(event, data)` pairs as the graph
+    progresses:
+
+    - one event per finished node (`categorize`, `analyze`, `suggest`,
+      `rebalance`, or `categorize_and_analyze` in fast mode) carrying that
+      node's state update,
+    - a `route` event with the `should_rebalance` decision once the analysis
+      is known,
+    - with `include_tokens`, `token` events carrying text deltas of the
+      `analysis_report` and `rebalance_report` while they are generated
+      (see `_ReportDeltas` for retried and hedged LLM calls),
+    - a final `result` event with the complete analysis response.
+    """
+    logger.info("Streaming enhanced LangGraph agent")
+
+    state: Dict = {"tasks": tasks}
+    stream_mode = ["updates", "messages"] if include_tokens else ["updates"]
+    report_deltas = _ReportDeltas()
+
+    async for kind, chunk in get_agent(mode).astream(state, stream_mode=stream_mode):
+        if kind == "updates":
+            for node, update in chunk.items():
+                if not isinstance(update, dict):
+                    continue
+                state.update(update)
+                yield node, update
+                if node in ("analyze", "categorize_and_analyze", "analyze_speculative") or update.get("short_circuited"):
+                    yield "route", {
+                        "route": should_rebalance(state),
+                        "stress_level": state.get("stress_level"),
+                        "needs_rebalancing": state.get("needs_rebalancing"),
+                    }
+        else:
+            message, metadata = chunk
+            delta = report_deltas.feed(metadata.get("langgraph_node"), message)
+            if delta is not None:
+                yield "token", delta
+
+    logger.info("Agent finished streaming")
+
+    yield "result", build_response(state)
 
-    print("Analysis service: Agent finished.")
 
+async def analyze_schedules_batch_service(
+    task_lists: List[List[str]], max_concurrency: Optional[int] = None, mode: Optional[str] = None
+) -> List[Union[Dict, Exception]]:
+    """
+    Analyzes many schedules concurrently with the agent's `abatch`.
+
+    Tasks shared between schedules are categorized once up front. At most
+    `max_concurrency` graphs run at the same time (capped by
+    `settings.BATCH_MAX_CONCURRENCY`). A failing schedule does not fail the
+    batch: its slot holds the exception instead of a response. Results are
+    returned in input order.
+    """
+    concurrency = min(max_concurrency or settings.BATCH_MAX_CONCURRENCY, settings.BATCH_MAX_CONCURRENCY)
+    logger.info("Invoking agent for a batch of %d schedules", len(task_lists))
+
+    agent = get_agent(mode)
+    try:
+        await aprecategorize_tasks(task_lists)
+    except Exception as exc:
+        # Every schedule still categorizes its own tasks, so this only costs the dedup
+        logger.warning("Batch pre-categorization failed: %r", exc)
+
+    final_states = await agent.abatch(
+        [{"tasks": tasks} for tasks in task_lists],
+        config={"max_concurrency": concurrency},
+        return_exceptions=True,
+    )
+
+    logger.info("Batch finished")
+
+    return [
+        state if isinstance(state, Exception) else build_response(state)
+        for state in final_states
+    ]
+
+
+async def analyze_week_service(
+    days: Dict[str, List[str]], max_concurrency: Optional[int] = None, mode: Optional[str] = None
+) -> Dict:
+    """
+    Analyzes a week's schedule: every day runs through the agent at the same
+    time (map), so the week takes about as long as its slowest day, and the
+    results are then combined by `reduce_week`, which aggregates the stress
+    levels and moves tasks to reschedule onto lighter days.
+
+    Tasks that recur on several days are categorized once. A failing day is
+    reported with its error and does not fail the week.
+    """
+    names = list(days)
+    results = await analyze_schedules_batch_service(
+        [days[name] for name in names],
+        max_concurrency=max_concurrency or len(names),
+        mode=mode,
+    )
+    by_day = dict(zip(names, results))
+    week = reduce_week(days, by_day, settings.WEEK_TARGET_STRESS_LEVEL)
+    week["days"] = [
+        {"day": name, "error": str(result) or type(result).__name__}
+        if isinstance(result, Exception)
+        else {"day": name, "result": result}
+        for name, result in by_day.items()
+    ]
+    return week
+
+
+# Background analyses run on worker threads through the blocking service
+analysis_jobs = JobQueue(lambda tasks, mode: analyze_schedule_service_sync(tasks, mode=mode))
+
+
+def submit_analysis_job(tasks: List[str], mode: Optional[str] = None, callback_url: Optional[str] = None) -> Dict:
+    """
+    Queues an analysis to run in the background and returns the job right
+    away. Raises `CallbackURLError` for a refused callback URL and
+    `QueueFullError` when the job queue is full.
+    """
+    return analysis_jobs.submit(tasks, mode=mode, callback_url=callback_url)
+
+
+def get_analysis_job(job_id: str) -> Dict:
+    """The status of a job and, once it has finished, its result or error. Raises `KeyError` if unknown."""
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        raise KeyError(job_id)
+    return job
+
+
+# One lock per session, so concurrent edits of a session are applied in turn
+_session_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def _session_config(session_id: str) -> Dict:
+    return {"configurable": {"thread_id": session_id}}
+
+
+async def _run_session(session_id: str, tasks: List[str]) -> Dict:
+    # Only the final state is checkpointed; intermediate steps are not needed to resume
+    final_state = await get_session_agent().ainvoke(
+        {"tasks": tasks}, _session_config(session_id), durability="exit"
+    )
+    await aprune_session(session_id, session_registry.touch(session_id))
+    logger.info("Session %s re-analyzed, reused nodes: %s", session_id, final_state.get("reused_nodes"))
+    return build_session_response(session_id, final_state)
+
+
+async def analyze_session_service(session_id: str, tasks: List[str]) -> Dict:
+    """
+    Analyzes the full task list of a session. If the session has a previous
+    run, the graph continues from its checkpoint, so only the nodes whose
+    inputs changed call the LLM again.
+    """
+    lock = _session_locks.setdefault(session_id, asyncio.Lock())
+    async with lock:
+        return await _run_session(session_id, tasks)
+
+
+async def update_session_service(session_id: str, add: List[str], remove: List[str]) -> Dict:
+    """
+    Applies task additions and removals to a session's last task list and
+    re-analyzes it incrementally. Raises KeyError for an unknown session.
+    """
+    lock = _session_locks.setdefault(session_id, asyncio.Lock())
+    async with lock:
+        snapshot = await get_session_agent().aget_state(_session_config(session_id))
+        if not snapshot.values:
+            raise KeyError(session_id)
+
+        removed = {normalize_task(task) for task in remove}
+        tasks = [task for task in snapshot.values.get("tasks", []) if normalize_task(task) not in removed]
+        present = {normalize_task(task) for task in tasks}
+        for task in add:
+            if normalize_task(task) not in present:
+                present.add(normalize_task(task))
+                tasks.append(task)
+        return await _run_session(session_id, tasks)
+
+
+async def get_session_service(session_id: str) -> Dict:
+    """Returns the last analysis of a session. Raises KeyError for an unknown session."""
+    snapshot = await get_session_agent().aget_state(_session_config(session_id))
+    if not snapshot.values:
+        raise KeyError(session_id)
+    return build_session_response(session_id, snapshot.values)
+
+
+async def delete_session_service(session_id: str) -> None:
+    """Deletes a session's checkpoints."""
+    await get_checkpointer().adelete_thread(session_id)
+    session_registry.forget(session_id)
+
+
+def build_session_response(session_id: str, final_state: Dict) -> Dict:
+    """The analysis response of a session, with its current tasks and the nodes the last run reused."""
+    return {
+        **build_response(final_state),
+        "session_id": session_id,
+        "tasks": list(final_state.get("tasks", [])),
+        "reused_nodes": list(final_state.get("reused_nodes") or []),
+    }
+
+
+def build_response(final_state: Dict) -> Dict:
+    """
+    Maps the final agent state onto the fields of the analysis response.
+    """
     # Build the response with all possible fields
     response = {
         "categorized_tasks": final_state.get("categorized_tasks", {}),
@@ -41,4 +406,8 @@ def analyze_schedule_service(tasks: List[str]) -> Dict:
             "recovery_suggestions": final_state.get("recovery_suggestions", []),
         })
 
+    # Flag steps that fell back to local results because the LLM was unavailable
+    if final_state.get("degraded_nodes"):
+        response["degraded_nodes"] = final_state["degraded_nodes"]
+
     return response
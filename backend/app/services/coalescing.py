@@ -0,0 +1,95 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller (the
+    leader) runs the call, and everyone asking for the same key while it is
+    in flight waits for and shares its result, or its exception. Nothing is
+    kept once the call has finished.
+
+    Sync and async callers share the in-flight calls, so a request served on
+    the event loop and one from a worker thread can coalesce. Results are
+    handed to every waiter as the same object and must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, concurrent.futures.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def _join(self, key: Hashable) -> Tuple[concurrent.futures.Future, bool]:
+        """Returns the flight for `key` and whether the caller has to run it."""
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            flight = self._flights[key] = concurrent.futures.Future()
+            flight.set_running_or_notify_cancel()
+            return flight, True
+
+    def _land(self, key: Hashable, flight: concurrent.futures.Future) -> None:
+        # Later callers start a new flight instead of joining a finished one
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def do(self, key: Hashable, call: Callable[[], T]) -> T:
+        """Runs `call`, or waits for the in-flight call with the same key."""
+        flight, leader = self._join(key)
+        if leader:
+            try:
+                result = call()
+            except BaseException as exc:
+                self._land(key, flight)
+                flight.set_exception(exc)
+                raise
+            self._land(key, flight)
+            flight.set_result(result)
+            return result
+        return flight.result()
+
+    async def ado(self, key: Hashable, make_call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Async version of `do`. The leader's call runs as its own task, so a
+        cancelled caller (e.g. a disconnected client) neither cancels the call
+        nor fails the other callers waiting for it.
+        """
+        flight, leader = self._join(key)
+        if leader:
+            task = asyncio.ensure_future(make_call())
+
+            def settle(task: asyncio.Task) -> None:
+                self._land(key, flight)
+                if task.cancelled():
+                    flight.set_exception(asyncio.CancelledError())
+                elif task.exception() is not None:
+                    flight.set_exception(task.exception())
+                else:
+                    flight.set_result(task.result())
+
+            task.add_done_callback(settle)
+        return await asyncio.shield(asyncio.wrap_future(flight))
+
+    def stats(self) -> Dict[str, float]:
+        """Calls seen, calls that joined an in-flight call, and their share."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "coalesce_ratio": self.coalesced / self.calls if self.calls else 0.0,
+                "in_flight": len(self._flights),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = 0
+            self.coalesced = 0
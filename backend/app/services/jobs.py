@@ -0,0 +1,297 @@
+import ipaddress
+import logging
+import socket
+import statistics
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Number of recent queue waits used for the percentiles
+WAIT_WINDOW = 200
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class QueueFullError(RuntimeError):
+    """Raised by `JobQueue.submit` when `JOB_QUEUE_MAX_DEPTH` jobs are already waiting."""
+
+
+class CallbackURLError(ValueError):
+    """Raised for a webhook URL the server refuses to call."""
+
+
+def _host_allowed(host: str) -> bool:
+    allowed = settings.JOB_WEBHOOK_ALLOWED_HOSTS
+    return not allowed or any(
+        host == entry or (entry.startswith("*.") and host.endswith(entry[1:])) for entry in allowed
+    )
+
+
+def _public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address)
+    return ip.is_global and not ip.is_multicast
+
+
+def check_callback_url(url: str, resolve: bool = False) -> None:
+    """
+    Raises `CallbackURLError` unless `url` is an http(s) URL whose host is in
+    `JOB_WEBHOOK_ALLOWED_HOSTS` (if set) and, unless
+    `JOB_WEBHOOK_ALLOW_PRIVATE`, not a loopback, private, link-local or
+    otherwise non-public address. With `resolve`, host names are looked up
+    and every address they resolve to is checked, which is done again right
+    before each delivery.
+    """
+    try:
+        parsed = httpx.URL(url)
+    except httpx.InvalidURL as exc:
+        raise CallbackURLError(f"Invalid callback URL: {exc}") from exc
+    host = parsed.host.lower()
+    if parsed.scheme not in ("http", "https") or not host:
+        raise CallbackURLError("Callback URLs must be absolute http or https URLs.")
+    if not _host_allowed(host):
+        raise CallbackURLError(f"Callback host {host!r} is not allowed.")
+    if settings.JOB_WEBHOOK_ALLOW_PRIVATE:
+        return
+    if host == "localhost" or host.endswith(".localhost"):
+        raise CallbackURLError(f"Callback host {host!r} is not a public address.")
+    try:
+        addresses = [str(ipaddress.ip_address(host))]
+    except ValueError:
+        if not resolve:
+            return
+        try:
+            addresses = [info[4][0] for info in socket.getaddrinfo(host, parsed.port or None, proto=socket.IPPROTO_TCP)]
+        except OSError as exc:
+            raise CallbackURLError(f"Callback host {host!r} cannot be resolved.") from exc
+    if not all(_public_address(address) for address in addresses):
+        raise CallbackURLError(f"Callback host {host!r} is not a public address.")
+
+
+class Job:
+    """One submitted analysis and, once it has finished, its result or error."""
+
+    def __init__(self, tasks: List[str], mode: Optional[str], callback_url: Optional[str]):
+        self.id = uuid.uuid4().hex
+        self.tasks = tasks
+        self.mode = mode
+        self.callback_url = callback_url
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.webhook_status: Optional[str] = None
+        self.enqueued = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The job as returned by the polling endpoint and posted to its webhook."""
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+            "callback_url": self.callback_url,
+            "webhook_status": self.webhook_status,
+        }
+
+
+class JobQueue:
+    """
+    Runs analyses in the background on a bounded pool of `JOB_WORKERS`
+    threads, so a client gets a job ID right away instead of holding its
+    connection open for the whole chain of LLM calls.
+
+    At most `JOB_QUEUE_MAX_DEPTH` jobs wait for a worker; further submissions
+    are rejected with `QueueFullError` until the backlog drains. Finished jobs
+    can be polled for `JOB_RESULT_TTL_SECONDS` and are then evicted. A job
+    with a callback URL has its final snapshot POSTed there, with retries.
+    """
+
+    def __init__(self, run: Callable[[List[str], Optional[str]], Dict]):
+        self._run = run
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: Dict[str, Job] = {}
+        # Finished job IDs in the order they expire
+        self._expiry: "OrderedDict[str, float]" = OrderedDict()
+        self._waits: Deque[float] = deque(maxlen=WAIT_WINDOW)
+        self.queued = 0
+        self.running = 0
+        self.submitted = 0
+        self.rejected = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.evicted = 0
+        self.webhooks_delivered = 0
+        self.webhooks_failed = 0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # Created on first use, and again after `shutdown`
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=settings.JOB_WORKERS, thread_name_prefix="analysis-job")
+        return self._executor
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        while self._expiry:
+            job_id, expires = next(iter(self._expiry.items()))
+            if expires > now:
+                break
+            del self._expiry[job_id]
+            self._jobs.pop(job_id, None)
+            self.evicted += 1
+
+    def submit(self, tasks: List[str], mode: Optional[str] = None, callback_url: Optional[str] = None) -> Dict:
+        """
+        Queues an analysis and returns the job's snapshot. Raises
+        `CallbackURLError` for a refused callback URL and `QueueFullError` on
+        backpressure.
+        """
+        if callback_url:
+            check_callback_url(callback_url)
+        job = Job(tasks, mode, callback_url)
+        with self._lock:
+            self._evict_expired()
+            if self.queued >= settings.JOB_QUEUE_MAX_DEPTH:
+                self.rejected += 1
+                raise QueueFullError(f"{self.queued} analysis jobs are already waiting.")
+            self.queued += 1
+            self.submitted += 1
+            self._jobs[job.id] = job
+            snapshot = job.snapshot()
+            self._pool().submit(self._execute, job)
+        logger.info("Queued analysis job %s with %d tasks", job.id, len(tasks))
+        return snapshot
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """The job's current snapshot, or None if it is unknown or has expired."""
+        with self._lock:
+            self._evict_expired()
+            job = self._jobs.get(job_id)
+            return job.snapshot() if job is not None else None
+
+    def _execute(self, job: Job) -> None:
+        with self._lock:
+            if job.status != QUEUED or self._jobs.get(job.id) is not job:
+                # Dropped by `shutdown` or `reset` while waiting
+                return
+            self.queued -= 1
+            self.running += 1
+            self._waits.append(time.monotonic() - job.enqueued)
+            job.status = RUNNING
+            job.started_at = time.time()
+        try:
+            result, error = self._run(job.tasks, job.mode), None
+        except Exception as exc:
+            logger.exception("Analysis job %s failed", job.id)
+            result, error = None, str(exc) or type(exc).__name__
+        with self._lock:
+            job.status = FAILED if error else SUCCEEDED
+            job.result, job.error = result, error
+            job.finished_at = time.time()
+            snapshot = job.snapshot()
+            if self._jobs.get(job.id) is not job:
+                # Forgotten by `reset` while running; its counts were cleared with it
+                return
+            self.running -= 1
+            if error:
+                self.failed += 1
+            else:
+                self.succeeded += 1
+            self._expiry[job.id] = time.monotonic() + settings.JOB_RESULT_TTL_SECONDS
+        if job.callback_url:
+            self._notify(job, snapshot)
+
+    def _notify(self, job: Job, snapshot: Dict) -> None:
+        """POSTs the finished job to its callback URL, retrying errors and 5xx or 429 answers."""
+        attempts = max(1, settings.JOB_WEBHOOK_MAX_ATTEMPTS)
+        delivered = False
+        with httpx.Client(timeout=settings.JOB_WEBHOOK_TIMEOUT_SECONDS, follow_redirects=False) as client:
+            for attempt in range(attempts):
+                try:
+                    # Checked per attempt, so a host cannot be re-pointed at an internal address in between
+                    check_callback_url(job.callback_url, resolve=True)
+                    response = client.post(job.callback_url, json=snapshot)
+                except (CallbackURLError, httpx.InvalidURL) as exc:
+                    logger.warning("Webhook of job %s refused: %s", job.id, exc)
+                    break
+                except httpx.HTTPError as exc:
+                    reason = repr(exc)
+                else:
+                    if response.status_code < 500 and response.status_code != 429:
+                        delivered = response.is_success
+                        break
+                    reason = f"HTTP {response.status_code}"
+                logger.warning("Webhook of job %s failed (attempt %d/%d): %s", job.id, attempt + 1, attempts, reason)
+                if attempt + 1 < attempts:
+                    time.sleep(0.5 * 2 ** attempt)
+        with self._lock:
+            job.webhook_status = "delivered" if delivered else "failed"
+            if delivered:
+                self.webhooks_delivered += 1
+            else:
+                self.webhooks_failed += 1
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stops the workers; jobs that have not started yet fail."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            for job in self._jobs.values():
+                if job.status == QUEUED:
+                    job.status, job.finished_at = FAILED, time.time()
+                    job.error = "The server shut down before the job started."
+                    self._expiry[job.id] = time.monotonic() + settings.JOB_RESULT_TTL_SECONDS
+                    self.queued -= 1
+                    self.failed += 1
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def reset(self) -> None:
+        """Forgets every job and zeroes the counters; queued jobs never run."""
+        with self._lock:
+            self._jobs.clear()
+            self._expiry.clear()
+            self._waits.clear()
+            self.queued = self.running = 0
+            self.submitted = self.rejected = self.succeeded = self.failed = self.evicted = 0
+            self.webhooks_delivered = self.webhooks_failed = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, running and stored jobs, outcomes and queue wait."""
+        with self._lock:
+            self._evict_expired()
+            waits = list(self._waits)
+            return {
+                "workers": settings.JOB_WORKERS,
+                "queue_depth": self.queued,
+                "queue_capacity": settings.JOB_QUEUE_MAX_DEPTH,
+                "running": self.running,
+                "stored": len(self._jobs),
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+                "evicted": self.evicted,
+                "webhooks_delivered": self.webhooks_delivered,
+                "webhooks_failed": self.webhooks_failed,
+                "queue_wait_ms_p50": statistics.median(waits) * 1000 if waits else 0.0,
+                "queue_wait_ms_p95": (
+                    statistics.quantiles(waits, n=20)[-1] * 1000 if len(waits) > 1 else (waits or [0.0])[0] * 1000
+                ),
+            }
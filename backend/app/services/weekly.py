@@ -0,0 +1,86 @@
+from typing import Dict, List, Optional, Union
+
+from app.langgraph_agent.task_index import normalize_task
+
+
+def _task_load(stress_level: float, task_count: int) -> float:
+    """Share of a day's stress attributed to each of its tasks."""
+    return stress_level / max(1, task_count)
+
+
+def reduce_week(
+    days: Dict[str, List[str]],
+    results: Dict[str, Union[Dict, Exception]],
+    target_stress_level: float,
+) -> Dict:
+    """
+    Combines the per-day analyses of a week: aggregates their stress levels
+    and moves each day's `tasks_to_reschedule` onto the lightest other day.
+
+    A task carries its day's average stress per task with it. It is only
+    moved if the receiving day stays at or below `target_stress_level` and
+    ends up lighter than the day it leaves was, so a move never just shifts
+    the overload elsewhere. Ties go to the nearest following day. Days whose
+    analysis failed neither give nor receive tasks, and are left out of the
+    aggregates.
+    """
+    order = list(days)
+    analyzed = [day for day in order if not isinstance(results.get(day), Exception)]
+    projected: Dict[str, float] = {day: float(results[day]["stress_level"]) for day in analyzed}
+    schedule = {day: list(tasks) for day, tasks in days.items()}
+    moves: List[Dict[str, str]] = []
+    unplaced: List[Dict[str, str]] = []
+
+    # The most stressed days give up their tasks first, while the lighter days have room
+    for source in sorted(analyzed, key=lambda day: -projected[day]):
+        result = results[source]
+        load = _task_load(result["stress_level"], len(days[source]))
+        for task in result.get("tasks_to_reschedule") or []:
+            # Tasks come back in the user's wording, but not necessarily the same case
+            index = next(
+                (i for i, own in enumerate(schedule[source]) if normalize_task(own) == normalize_task(task)),
+                None,
+            )
+            if index is None:
+                continue
+            target = _lightest_day(source, order, projected, load, target_stress_level)
+            if target is None:
+                unplaced.append({"task": schedule[source][index], "day": source})
+                continue
+            moved = schedule[source].pop(index)
+            schedule[target].append(moved)
+            projected[source] -= load
+            projected[target] += load
+            moves.append({"task": moved, "from_day": source, "to_day": target})
+
+    stress_levels = {day: results[day]["stress_level"] for day in analyzed}
+    peak_day = max(analyzed, key=lambda day: stress_levels[day], default=None)
+    return {
+        "average_stress_level": round(sum(stress_levels.values()) / len(analyzed), 1) if analyzed else None,
+        "peak_stress_level": stress_levels[peak_day] if peak_day else None,
+        "peak_day": peak_day,
+        "overloaded_days": [
+            day for day in analyzed if results[day].get("needs_rebalancing") or stress_levels[day] >= 8
+        ],
+        "moves": moves,
+        "unplaced_tasks": unplaced,
+        "rebalanced_schedule": schedule,
+        "projected_stress_levels": {day: round(projected[day], 1) for day in analyzed},
+    }
+
+
+def _lightest_day(
+    source: str, order: List[str], projected: Dict[str, float], load: float, target_stress_level: float
+) -> Optional[str]:
+    position = order.index(source)
+    candidates = [
+        day for day in projected
+        if day != source
+        and projected[day] + load <= target_stress_level
+        and projected[day] + load < projected[source]
+    ]
+    return min(
+        candidates,
+        key=lambda day: (projected[day], (order.index(day) - position) % len(order)),
+        default=None,
+    )
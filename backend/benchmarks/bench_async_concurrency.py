@@ -0,0 +1,98 @@
+"""
+Load benchmark comparing the blocking and the async analysis paths.
+
+The real LLM is replaced with `FakeStructuredChatModel`, which sleeps for a
+fixed latency and returns schema-valid results, so the numbers only reflect
+how many requests the service can keep in flight at once.
+
+The "sync" path reproduces the old `def` route: `WorkLifeBalanceAgent.invoke`
+running on Starlette's threadpool (40 workers by default). The "async" path
+awaits `analyze_schedule_service`, which runs the graph with `ainvoke`.
+
+Usage (from the `backend` directory):
+    python -m benchmarks.bench_async_concurrency --requests 200 --latency 1.0
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+
+import anyio.to_thread
+
+from app.core.config import settings
+from app.langgraph_agent import agent
+from app.langgraph_agent.llm import set_llm
+from app.langgraph_agent.cache import llm_cache
+from app.langgraph_agent.task_index import task_category_index
+from app.langgraph_agent.fake_llm import FakeStructuredChatModel
+from app.services import analysis_service
+
+TASKS = [
+    "Prepare presentation for 10am meeting",
+    "Team stand-up at 9am",
+    "Call the doctor to make an appointment",
+]
+
+
+async def _run_sync_path(n_requests: int):
+    def handle():
+        return analysis_service.build_response(
+            agent.WorkLifeBalanceAgent.invoke({"tasks": TASKS})
+        )
+
+    await asyncio.gather(*(anyio.to_thread.run_sync(handle) for _ in range(n_requests)))
+
+
+async def _run_async_path(n_requests: int):
+    await asyncio.gather(
+        *(analysis_service.analyze_schedule_service(TASKS) for _ in range(n_requests))
+    )
+
+
+def _measure(name: str, runner, n_requests: int, latency: float) -> dict:
+    fake = FakeStructuredChatModel(latency_seconds=latency, stress_level=5)
+    set_llm(fake)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        asyncio.run(runner(n_requests))
+        elapsed = time.perf_counter() - start
+    return {
+        "path": name,
+        "elapsed_s": elapsed,
+        "req_per_s": n_requests / elapsed,
+        "peak_in_flight_llm_calls": fake.stats()["peak_in_flight"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=1.0, help="Fake LLM latency in seconds (a typical completion)")
+    args = parser.parse_args()
+
+    # Every request carries the same tasks, so keep the caches, the local
+    # short-circuit and request coalescing out of the measurement
+    llm_cache.enabled = False
+    task_category_index.enabled = False
+    settings.HEURISTICS_ENABLED = False
+    settings.COALESCE_REQUESTS_ENABLED = False
+    results = [
+        _measure("sync (threadpool)", _run_sync_path, args.requests, args.latency),
+        _measure("async (ainvoke)", _run_async_path, args.requests, args.latency),
+    ]
+
+    print(f"{args.requests} requests, fake LLM latency {args.latency * 1000:.0f} ms, 3 LLM calls/request")
+    print(f"{'path':<20}{'elapsed (s)':>12}{'req/s':>10}{'peak in-flight':>16}")
+    for r in results:
+        print(
+            f"{r['path']:<20}{r['elapsed_s']:>12.2f}{r['req_per_s']:>10.1f}"
+            f"{r['peak_in_flight_llm_calls']:>16}"
+        )
+    speedup = results[1]["req_per_s"] / results[0]["req_per_s"]
+    print(f"async throughput: {speedup:.1f}x the sync path")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Request-coalescing benchmark: a burst of concurrent requests spread over a
+few shared schedule templates, with and without single-flight coalescing.
+
+Every LLM call is answered by `FakeStructuredChatModel` with a fixed latency,
+and the LLM cache and task index are disabled so that repeated work is not
+hidden by them. Reports the LLM calls made, the coalesce ratio and latency.
+
+Usage (from the `backend` directory):
+    python -m benchmarks.bench_coalescing --requests 100 --templates 1 5 20 --latency 0.1
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core.config import settings
+from app.langgraph_agent.cache import llm_cache
+from app.langgraph_agent.fake_llm import FakeStructuredChatModel
+from app.langgraph_agent.llm import set_llm
+from app.langgraph_agent.task_index import task_category_index
+from app.services import analysis_service
+from benchmarks.bench_graph_load import make_tasks, percentile
+
+
+async def _burst(n_requests: int, templates: int) -> list:
+    latencies = []
+
+    async def one(i: int):
+        start = time.perf_counter()
+        await analysis_service.analyze_schedule_service(make_tasks(8, seed=i % templates))
+        latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(n_requests)))
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--templates", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--latency", type=float, default=0.1, help="Fake LLM latency per call in seconds")
+    args = parser.parse_args()
+
+    llm_cache.enabled = False
+    task_category_index.enabled = False
+    settings.HEURISTICS_ENABLED = False
+
+    print(f"{'templates':>9}  {'coalescing':<11}{'LLM calls':>10}{'ratio':>8}{'p50':>9}{'p99':>9}")
+    for templates in args.templates:
+        for enabled in (False, True):
+            settings.COALESCE_REQUESTS_ENABLED = enabled
+            model = FakeStructuredChatModel(latency_seconds=args.latency)
+            set_llm(model)
+            analysis_service.analysis_flights.reset()
+            latencies = asyncio.run(_burst(args.requests, templates))
+            ratio = analysis_service.analysis_flights.stats()["coalesce_ratio"]
+            print(
+                f"{templates:>9}  {'on' if enabled else 'off':<11}{model.stats()['calls']:>10}{ratio:>8.0%}"
+                f"{percentile(latencies, 50) * 1000:>7.0f}ms{percentile(latencies, 99) * 1000:>7.0f}ms"
+            )
+    set_llm(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Compares the standard three-stage graph with the fused fast-mode graph.
+
+Each sample schedule is run through both graphs against the configured LLM.
+The report shows latency, prompt and completion tokens, and how often fast
+mode agrees with the standard graph on task categories, stress level and
+routing branch. The caches and the heuristic short-circuit are disabled so
+every run reaches the model.
+
+Usage (from the `backend` directory, with OPENAI_API_KEY set):
+    python -m benchmarks.bench_fast_mode --repeats 3
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import time
+
+from langchain_core.callbacks import get_usage_metadata_callback
+
+from app.core.config import settings
+from app.langgraph_agent.agent import get_agent, should_rebalance
+from app.langgraph_agent.cache import llm_cache
+from app.langgraph_agent.task_index import normalize_task, task_category_index
+
+SAMPLE_SCHEDULES = [
+    [
+        "Prepare presentation for 10am meeting",
+        "Team stand-up at 9am",
+        "Call the doctor to make an appointment",
+    ],
+    [
+        "Gym at 7am",
+        "Write quarterly report",
+        "Lunch with Sarah",
+        "Pick up kids from school at 3pm",
+        "Grocery shopping",
+    ],
+    [
+        "Team stand-up at 9am",
+        "Client call at 9:30am",
+        "Design review at 10am",
+        "1:1 with manager at 11am",
+        "Budget meeting at 1pm",
+        "Hiring interview at 2pm",
+        "Incident post-mortem at 3pm",
+        "Finish slides for tomorrow's board meeting",
+        "Reply to 40 unread emails",
+        "Dinner with family at 7pm",
+    ],
+]
+
+
+async def _run(mode: str, tasks):
+    with get_usage_metadata_callback() as usage:
+        start = time.perf_counter()
+        state = await get_agent(mode).ainvoke({"tasks": tasks})
+        elapsed = time.perf_counter() - start
+    prompt_tokens = sum(u.get("input_tokens", 0) for u in usage.usage_metadata.values())
+    completion_tokens = sum(u.get("output_tokens", 0) for u in usage.usage_metadata.values())
+    return state, elapsed, prompt_tokens, completion_tokens
+
+
+def _categories_by_task(categorized_tasks):
+    return {
+        normalize_task(task): category.casefold()
+        for category, tasks in (categorized_tasks or {}).items()
+        for task in tasks
+    }
+
+
+async def _compare(repeats: int):
+    rows = {"standard": [], "fast": []}
+    agreement = {"category": [], "route": [], "stress_diff": []}
+    for tasks in SAMPLE_SCHEDULES:
+        for _ in range(repeats):
+            standard = await _run("standard", tasks)
+            fast = await _run("fast", tasks)
+            rows["standard"].append(standard[1:])
+            rows["fast"].append(fast[1:])
+
+            standard_categories = _categories_by_task(standard[0].get("categorized_tasks"))
+            fast_categories = _categories_by_task(fast[0].get("categorized_tasks"))
+            shared = [t for t in standard_categories if t in fast_categories]
+            if shared:
+                agreement["category"].append(
+                    sum(standard_categories[t] == fast_categories[t] for t in shared) / len(shared)
+                )
+            agreement["route"].append(should_rebalance(standard[0]) == should_rebalance(fast[0]))
+            agreement["stress_diff"].append(
+                abs((standard[0].get("stress_level") or 0) - (fast[0].get("stress_level") or 0))
+            )
+    return rows, agreement
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per sample schedule and mode")
+    args = parser.parse_args()
+
+    llm_cache.enabled = False
+    task_category_index.enabled = False
+    settings.HEURISTICS_ENABLED = False
+    with contextlib.redirect_stdout(io.StringIO()):
+        rows, agreement = asyncio.run(_compare(args.repeats))
+
+    print(f"{len(SAMPLE_SCHEDULES)} schedules x {args.repeats} runs per mode")
+    print(f"{'mode':<10}{'p50 (s)':>10}{'mean (s)':>10}{'prompt tok':>12}{'compl. tok':>12}")
+    for mode, samples in rows.items():
+        latencies = [s[0] for s in samples]
+        print(
+            f"{mode:<10}{statistics.median(latencies):>10.2f}{statistics.mean(latencies):>10.2f}"
+            f"{statistics.mean(s[1] for s in samples):>12.0f}{statistics.mean(s[2] for s in samples):>12.0f}"
+        )
+    if agreement["category"]:
+        print(f"category agreement: {statistics.mean(agreement['category']):.0%}")
+    print(f"routing agreement:  {statistics.mean(agreement['route']):.0%}")
+    print(f"mean |stress diff|: {statistics.mean(agreement['stress_diff']):.2f}")
+
+
+if __name__ == "__main__":
+    main()
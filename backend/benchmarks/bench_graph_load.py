@@ -0,0 +1,159 @@
+"""
+Load benchmark of the analysis graph across routing branches, concurrency
+levels and task-list sizes.
+
+Every LLM call is answered by `FakeStructuredChatModel` with a configurable
+latency, so runs are offline and reproducible. The fake model's stress level
+is pinned per branch, which routes every request either to the `suggest` or
+to the `rebalance` node. For each combination the benchmark reports latency
+percentiles (p50/p95/p99), throughput, and the peak memory allocated while a
+single request runs (measured with `tracemalloc` in a separate pass, so
+tracing does not slow down the timed runs).
+
+Usage (from the `backend` directory):
+    python -m benchmarks.bench_graph_load --requests 200 --latency 0.05
+    python -m benchmarks.bench_graph_load --mode fast --concurrency 1 50 --tasks 5 100 --json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import tracemalloc
+
+from app.core.config import settings
+from app.langgraph_agent.cache import llm_cache
+from app.langgraph_agent.fake_llm import FakeStructuredChatModel
+from app.langgraph_agent.llm import set_llm
+from app.langgraph_agent.task_index import task_category_index
+from app.services import analysis_service
+
+# Stress level the fake model reports to force each routing branch
+BRANCH_STRESS_LEVELS = {"suggest": 4, "rebalance": 9}
+
+TASK_TEMPLATES = [
+    "Team stand-up at {hour}am",
+    "Prepare slides for the client review #{n}",
+    "Gym session {n}",
+    "Buy groceries for dinner #{n}",
+    "Call with the design team about project {n}",
+    "Dinner with friends #{n}",
+]
+
+
+def make_tasks(count: int, seed: int = 0) -> list:
+    """A schedule of `count` distinct tasks; `seed` keeps concurrent requests from sharing tasks."""
+    return [
+        TASK_TEMPLATES[i % len(TASK_TEMPLATES)].format(hour=8 + i % 4, n=f"{seed}-{i}")
+        for i in range(count)
+    ]
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _run_load(n_requests: int, concurrency: int, task_count: int, mode: str) -> tuple:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await analysis_service.analyze_schedule_service(make_tasks(task_count, seed=i), mode=mode)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n_requests)))
+    return latencies, time.perf_counter() - start
+
+
+def _peak_memory_per_request(task_count: int, mode: str, samples: int = 3) -> int:
+    """Median peak of traced allocations while one request runs on its own."""
+    peaks = []
+    for i in range(samples):
+        tasks = make_tasks(task_count, seed=-1 - i)
+        tracemalloc.start()
+        try:
+            asyncio.run(analysis_service.analyze_schedule_service(tasks, mode=mode))
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    return int(statistics.median(peaks))
+
+
+def run_case(branch: str, concurrency: int, task_count: int, args) -> dict:
+    fake = FakeStructuredChatModel(
+        latency_seconds=args.latency,
+        latency_jitter_seconds=args.jitter,
+        stress_level=BRANCH_STRESS_LEVELS[branch],
+        seed=0,
+    )
+    set_llm(fake)
+    # One untimed request builds the structured runnables for this model
+    asyncio.run(analysis_service.analyze_schedule_service(make_tasks(task_count, seed=-100), mode=args.mode))
+
+    latencies, elapsed = asyncio.run(_run_load(args.requests, concurrency, task_count, args.mode))
+    return {
+        "mode": args.mode,
+        "branch": branch,
+        "concurrency": concurrency,
+        "tasks": task_count,
+        "requests": args.requests,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "req_per_s": args.requests / elapsed,
+        "peak_kib_per_request": _peak_memory_per_request(task_count, args.mode) / 1024,
+        "peak_in_flight_llm_calls": fake.stats()["peak_in_flight"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mode", choices=["standard", "fast"], default="standard")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per combination")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[3, 30, 100], help="Task-list sizes")
+    parser.add_argument("--branches", nargs="+", choices=sorted(BRANCH_STRESS_LEVELS), default=["suggest", "rebalance"])
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake LLM latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra fake LLM latency in seconds")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    # Measure the graph itself, not the caches or the local short-circuit
+    llm_cache.enabled = False
+    task_category_index.enabled = False
+    settings.HEURISTICS_ENABLED = False
+
+    results = [
+        run_case(branch, concurrency, task_count, args)
+        for branch in args.branches
+        for task_count in args.tasks
+        for concurrency in args.concurrency
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(
+        f"mode={args.mode}, {args.requests} requests per row, "
+        f"fake LLM latency {args.latency * 1000:.0f} ms (+{args.jitter * 1000:.0f} ms jitter)"
+    )
+    print(
+        f"{'branch':<11}{'tasks':>6}{'conc':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        f"{'req/s':>10}{'KiB/req':>10}"
+    )
+    for r in results:
+        print(
+            f"{r['branch']:<11}{r['tasks']:>6}{r['concurrency']:>6}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}"
+            f"{r['p99_ms']:>10.1f}{r['req_per_s']:>10.1f}{r['peak_kib_per_request']:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
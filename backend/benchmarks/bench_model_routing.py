@@ -0,0 +1,86 @@
+"""
+Model-routing benchmark: per-node latency and cost with every node on one
+model, against per-node routing to the cheapest model meeting its bar, and
+with a saturation limit that spills calls to a local stand-in.
+
+Every profile is a `FakeStructuredChatModel` with the list prices and a rough
+relative latency of the model it stands in for; token counts come from the
+fake model's usage (about 4 characters per token). Figures are read from
+`model_router.stats()` (see app/langgraph_agent/model_router.py).
+
+Usage (from the `backend` directory):
+    python -m benchmarks.bench_model_routing --requests 50 --concurrency 10
+"""
+
+import argparse
+import asyncio
+
+from app.core.config import settings
+from app.langgraph_agent.cache import llm_cache
+from app.langgraph_agent.model_router import MODEL_PRICES, model_router
+from app.langgraph_agent.task_index import task_category_index
+from benchmarks.bench_graph_load import _run_load
+
+
+def fake_profile(model: str, quality: int, latency: float, **options) -> dict:
+    input_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return {
+        "backend": "fake",
+        "model": model,
+        "quality": quality,
+        "latency_seconds": latency,
+        "stress_level": 9,
+        "input_cost_per_1m": input_price,
+        "output_cost_per_1m": output_price,
+        **options,
+    }
+
+
+SCENARIOS = {
+    "single model": {
+        "default": fake_profile("gpt-4o", 4, 0.12),
+    },
+    "routed": {
+        "default": fake_profile("gpt-4o", 4, 0.12),
+        "mini": fake_profile("gpt-4o-mini", 3, 0.08),
+        "nano": fake_profile("gpt-4.1-nano", 1, 0.05),
+    },
+    "routed, saturated": {
+        "default": fake_profile("gpt-4o", 4, 0.12),
+        "mini": fake_profile("gpt-4o-mini", 3, 0.08, max_in_flight=4),
+        "nano": fake_profile("gpt-4.1-nano", 1, 0.05, max_in_flight=4),
+        "local": fake_profile("local-llama", 0, 0.03),
+    },
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=10)
+    args = parser.parse_args()
+
+    llm_cache.enabled = False
+    task_category_index.enabled = False
+    settings.HEURISTICS_ENABLED = False
+    settings.COALESCE_REQUESTS_ENABLED = False
+    settings.LLM_FALLBACK_MODEL = "local"
+
+    for scenario, profiles in SCENARIOS.items():
+        settings.LLM_MODELS = profiles
+        model_router.reset()
+        asyncio.run(_run_load(args.requests, args.concurrency, args.tasks, "standard"))
+        stats = model_router.stats()
+        total = sum(node["cost_usd"] for node in stats.values())
+        print(f"\n{scenario}: ${total * 1000 / args.requests:.4f} per 1000 requests")
+        print(f"  {'node':<11}{'p50':>8}{'p95':>8}{'$/1k calls':>12}{'fallbacks':>11}  models")
+        for node, numbers in stats.items():
+            print(
+                f"  {node:<11}{numbers['latency_ms_p50']:>6.0f}ms{numbers['latency_ms_p95']:>6.0f}ms"
+                f"{numbers['cost_usd_per_call'] * 1000:>12.4f}{numbers['fallbacks']:>11}  {numbers['models']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Prompt-size benchmark: estimated prompt tokens per stage with and without
+prompt compaction, for growing task lists.
+
+Runs the standard graph once per task-list size against `FakeStructuredChatModel`,
+with the stress level pinned so every run passes through categorize, analyze
+and the chosen final branch. Prompt tokens are the estimates recorded by
+`prompt_stats` (see app/langgraph_agent/compaction.py).
+
+Usage (from the `backend` directory):
+    python -m benchmarks.bench_prompt_compaction --tasks 10 100 300 --branch rebalance
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core.config import settings
+from app.langgraph_agent.cache import llm_cache
+from app.langgraph_agent.compaction import prompt_stats
+from app.langgraph_agent.fake_llm import FakeStructuredChatModel
+from app.langgraph_agent.llm import set_llm
+from app.langgraph_agent.task_index import task_category_index
+from app.services import analysis_service
+from benchmarks.bench_graph_load import BRANCH_STRESS_LEVELS, make_tasks
+
+
+def run(task_count: int, compaction: bool, branch: str) -> tuple:
+    settings.PROMPT_COMPACTION_ENABLED = compaction
+    prompt_stats.reset()
+    start = time.perf_counter()
+    asyncio.run(analysis_service.analyze_schedule_service(make_tasks(task_count)))
+    elapsed = time.perf_counter() - start
+    return prompt_stats.stats(), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[10, 100, 300])
+    parser.add_argument("--branch", choices=sorted(BRANCH_STRESS_LEVELS), default="rebalance")
+    args = parser.parse_args()
+
+    llm_cache.enabled = False
+    task_category_index.enabled = False
+    settings.HEURISTICS_ENABLED = False
+    set_llm(FakeStructuredChatModel(stress_level=BRANCH_STRESS_LEVELS[args.branch]))
+
+    run(3, True, args.branch)  # builds the graph and runnables outside the measurement
+    print(f"{'tasks':>6}  {'stage':<12}{'calls':>6}{'raw tokens':>12}{'compact':>10}{'saved':>8}")
+    for task_count in args.tasks:
+        raw, raw_elapsed = run(task_count, False, args.branch)
+        compact, compact_elapsed = run(task_count, True, args.branch)
+        for stage, numbers in compact.items():
+            saved = 1 - numbers["prompt_tokens"] / raw[stage]["prompt_tokens"]
+            print(
+                f"{task_count:>6}  {stage:<12}{numbers['calls']:>6}{raw[stage]['prompt_tokens']:>12}"
+                f"{numbers['prompt_tokens']:>10}{saved:>8.0%}"
+            )
+        raw_total = sum(numbers["prompt_tokens"] for numbers in raw.values())
+        compact_total = sum(numbers["prompt_tokens"] for numbers in compact.values())
+        print(
+            f"{task_count:>6}  {'total':<12}{'':>6}{raw_total:>12}{compact_total:>10}{1 - compact_total / raw_total:>8.0%}"
+            f"   ({raw_elapsed * 1000:.0f} ms -> {compact_elapsed * 1000:.0f} ms with a zero-latency model)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Tail-latency benchmark of hedged LLM requests.
+
+`FakeStructuredChatModel` answers most calls after `--latency` seconds, but a
+share of them (`--tail-rate`) straggle for `--tail-latency` seconds. The same
+load runs with hedging off and on; with hedging, a call that outlives the
+node's p95 gets a duplicate request and the first answer wins. The report
+shows request latency percentiles and how many extra LLM calls hedging cost.
+
+Usage (from the `backend` directory):
+    python -m benchmarks.bench_resilience --requests 300 --tail-rate 0.03
+"""
+
+import argparse
+import asyncio
+
+from app.core.config import settings
+from app.langgraph_agent.cache import llm_cache
+from app.langgraph_agent.fake_llm import FakeStructuredChatModel
+from app.langgraph_agent.llm import set_llm
+from app.langgraph_agent.resilience import llm_resilience
+from app.langgraph_agent.task_index import task_category_index
+from benchmarks.bench_graph_load import _run_load, percentile
+
+
+def run(hedging: bool, args) -> dict:
+    settings.LLM_HEDGE_ENABLED = hedging
+    settings.LLM_HEDGE_DELAY_SECONDS = args.latency * 2
+    llm_resilience.reset()
+    fake = FakeStructuredChatModel(
+        latency_seconds=args.latency,
+        latency_jitter_seconds=args.latency / 2,
+        tail_rate=args.tail_rate,
+        tail_latency_seconds=args.tail_latency,
+        stress_level=4,
+        seed=1,
+    )
+    set_llm(fake)
+    latencies, elapsed = asyncio.run(_run_load(args.requests, args.concurrency, 5, "standard"))
+    stats = llm_resilience.stats()
+    return {
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "llm_calls": fake.stats()["calls"],
+        "hedges": sum(node["hedges"] for node in stats.values()),
+        "hedges_won": sum(node["hedges_won"] for node in stats.values()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="Typical fake LLM latency in seconds")
+    parser.add_argument("--tail-rate", type=float, default=0.03, help="Share of straggling LLM calls")
+    parser.add_argument("--tail-latency", type=float, default=1.0, help="Latency of a straggling call in seconds")
+    args = parser.parse_args()
+
+    llm_cache.enabled = False
+    task_category_index.enabled = False
+    settings.HEURISTICS_ENABLED = False
+
+    print(f"{'hedging':<9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'LLM calls':>11}{'hedges':>8}{'won':>6}")
+    for hedging in (False, True):
+        r = run(hedging, args)
+        print(
+            f"{'on' if hedging else 'off':<9}{r['p50_ms']:>9.0f}{r['p95_ms']:>9.0f}{r['p99_ms']:>9.0f}"
+            f"{r['llm_calls']:>11}{r['hedges']:>8}{r['hedges_won']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Semantic near-duplicate cache benchmark: hit rate and accuracy of the
+semantic task index across similarity thresholds, and the cost of its
+vectorized batch lookups as the index grows.
+
+The workload is a stream of task strings drawn from a fixed vocabulary and
+rewritten the way users retype the same task (case, punctuation, stopwords,
+plurals, times and small typos). The "LLM" is the rule-based categorizer
+that `FakeStructuredChatModel` answers with: every miss is categorized by it
+and added to the index, and every near hit is scored against what it would
+have answered (the accuracy). Exact repeats are left out, since the exact
+task index already serves those.
+
+Usage (from the `backend` directory):
+    python -m benchmarks.bench_semantic_cache --tasks 600 --thresholds 0.8 0.85 0.9 0.95
+"""
+
+import argparse
+import random
+import time
+
+from app.langgraph_agent.heuristics import categorize_by_rules
+from app.langgraph_agent.semantic_index import SemanticIndex
+from app.langgraph_agent.task_index import normalize_task
+
+VOCABULARY = [
+    "Team stand-up at 9am", "Prepare slides for the client review", "Reply to the budget emails",
+    "Weekly sync with my manager", "Write the quarterly report", "Code review for the payments service",
+    "Interview a backend candidate", "Plan the sprint backlog", "Call the insurance company",
+    "Gym session after work", "Morning run in the park", "Yoga class", "Dentist appointment at 4pm",
+    "Doctor checkup", "Meditate for ten minutes", "Buy groceries for dinner", "Pick up the dry cleaning",
+    "Pay the electricity bill", "Renew the car registration", "Clean the kitchen", "Do the laundry",
+    "Dinner with friends", "Call mom", "Birthday party for Sam", "Coffee with an old colleague",
+    "Pick up the kids from school", "Help the kids with homework", "Walk the dog", "Read a novel",
+    "Practice the guitar", "Book flights for the holiday", "Fix the leaking tap",
+]
+
+
+def retype(task: str, rng: random.Random) -> str:
+    """The same task as a user might type it again."""
+    words = task.split()
+    edit = rng.randrange(7)
+    if edit == 0:
+        return task.lower()
+    if edit == 1:
+        return task.replace("-", "") + rng.choice(["!", ".", ""])
+    if edit == 2:
+        return " ".join(word for word in words if word.lower() not in ("the", "a", "at", "for", "with"))
+    if edit == 3:
+        return f"{task} {rng.choice(['today', 'asap', 'tomorrow'])}"
+    if edit == 4:
+        index = rng.randrange(len(words))
+        words[index] += "s" if not words[index].endswith("s") else ""
+        return " ".join(words)
+    if edit == 5:
+        return task.replace("9am", f"{rng.randint(8, 11)}am").replace("4pm", f"{rng.randint(1, 5)}pm")
+    # A dropped letter
+    index = rng.randrange(len(task))
+    return task[:index] + task[index + 1:]
+
+
+def workload(n_tasks: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    seen, tasks = set(), []
+    while len(tasks) < n_tasks:
+        task = retype(rng.choice(VOCABULARY), rng)
+        if normalize_task(task) not in seen:
+            seen.add(normalize_task(task))
+            tasks.append(task)
+        elif len(seen) > 20 * len(VOCABULARY):
+            break
+    return tasks
+
+
+def truth(task: str) -> str:
+    return next(iter(categorize_by_rules([task])))
+
+
+def accuracy_report(tasks: list, thresholds: list, batch: int) -> None:
+    print(f"{'threshold':>9}{'hit rate':>10}{'accuracy':>10}{'LLM tasks':>11}")
+    for threshold in thresholds:
+        index = SemanticIndex(max_entries=10_000, threshold=threshold)
+        hits = correct = 0
+        for start in range(0, len(tasks), batch):
+            chunk = tasks[start:start + batch]
+            misses = []
+            for task, match in zip(chunk, index.search(chunk)):
+                if match is None:
+                    misses.append(task)
+                else:
+                    hits += 1
+                    correct += match[0] == truth(task)
+            index.add(misses, [truth(task) for task in misses])
+        print(
+            f"{threshold:>9.2f}{hits / len(tasks):>10.1%}{correct / hits if hits else 0.0:>10.1%}"
+            f"{len(tasks) - hits:>11}"
+        )
+
+
+def latency_report(sizes: list, batch: int) -> None:
+    print(f"\n{'entries':>8}{'batch lookup':>14}{'per task':>10}")
+    rng = random.Random(1)
+    for size in sizes:
+        index = SemanticIndex(max_entries=size, threshold=0.9)
+        stored = [f"{retype(rng.choice(VOCABULARY), rng)} #{i}" for i in range(size)]
+        index.add(stored, [truth(task) for task in stored])
+        queries = [retype(rng.choice(VOCABULARY), rng) for _ in range(batch)]
+        rounds = 20
+        start = time.perf_counter()
+        for _ in range(rounds):
+            index.search(queries)
+        elapsed = (time.perf_counter() - start) / rounds
+        print(f"{size:>8}{elapsed * 1000:>12.2f}ms{elapsed / batch * 1e6:>8.0f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=600)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.8, 0.85, 0.9, 0.95])
+    parser.add_argument("--batch", type=int, default=20, help="Tasks per request")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    args = parser.parse_args()
+
+    tasks = workload(args.tasks)
+    print(f"{len(tasks)} distinct retyped tasks from {len(VOCABULARY)} originals\n")
+    accuracy_report(tasks, args.thresholds, args.batch)
+    latency_report(args.sizes, args.batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Serialization micro-benchmark: cost per request of turning the final graph
+state into response bytes, for growing task lists.
+
+"before" is the previous path: the service's dict is validated into the
+response model in the router, then FastAPI validates it against the
+route's `response_model` again and serializes it with pydantic. "after"
+validates the model once and writes it with orjson straight from its fields
+(`ModelJSONResponse`, see app/core/responses.py). No LLM is involved.
+
+Usage (from the `backend` directory):
+    python -m benchmarks.bench_serialization --tasks 10 100 1000 --repeat 2000
+"""
+
+import argparse
+import timeit
+
+from pydantic import TypeAdapter
+
+from app.api.v1.schemas import ScheduleAnalysisResponse
+from app.core.responses import dumps
+from app.langgraph_agent.heuristics import categorize_by_rules
+from app.services.analysis_service import build_response
+from benchmarks.bench_graph_load import make_tasks
+
+# What FastAPI builds from `response_model` to validate and serialize return values
+response_adapter = TypeAdapter(ScheduleAnalysisResponse)
+
+
+def final_state(n_tasks: int) -> dict:
+    """A final state of the rebalance branch, the largest response there is."""
+    tasks = make_tasks(n_tasks)
+    return {
+        "tasks": tasks,
+        "categorized_tasks": categorize_by_rules(tasks),
+        "analysis_report": "The schedule is overloaded. " * 40,
+        "stress_level": 9,
+        "workload_assessment": "overloaded",
+        "key_concerns": ["Back-to-back meetings", "No breaks", "Late deadlines"],
+        "needs_rebalancing": True,
+        "rebalance_report": "Move the flexible tasks to later in the week. " * 20,
+        "urgent_actions": ["Decline one non-essential meeting"] * 3,
+        "tasks_to_reschedule": tasks[: n_tasks // 4],
+        "tasks_to_delegate": tasks[n_tasks // 4: n_tasks // 3],
+        "recovery_suggestions": ["Take a 15-minute walk after lunch"] * 3,
+    }
+
+
+def before(state: dict) -> bytes:
+    model = ScheduleAnalysisResponse(**build_response(state))
+    return response_adapter.dump_json(response_adapter.validate_python(model))
+
+
+def after(state: dict) -> bytes:
+    return dumps(ScheduleAnalysisResponse(**build_response(state)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>6}{'bytes':>9}{'before':>11}{'after':>11}{'speedup':>9}")
+    for n_tasks in args.tasks:
+        state = final_state(n_tasks)
+        assert before(state) == after(state)
+        timings = [
+            min(timeit.repeat(lambda: path(state), number=args.repeat, repeat=3)) / args.repeat
+            for path in (before, after)
+        ]
+        print(
+            f"{n_tasks:>6}{len(after(state)):>9}{timings[0] * 1e6:>9.1f}us{timings[1] * 1e6:>9.1f}us"
+            f"{timings[0] / timings[1]:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Cost of repeated session edits compared with full re-runs.
+
+A schedule of `--tasks` tasks is analyzed once per session, then edited
+`--edits` times: each edit adds one task and removes another. Every edit is
+applied both as an incremental session update and as a fresh, full analysis
+of the same list. The report compares LLM calls and estimated prompt tokens
+(see `prompt_stats`) per edit.
+
+Usage (from the `backend` directory):
+    python -m benchmarks.bench_session_edits --tasks 50 --edits 10
+"""
+
+import argparse
+import asyncio
+
+from app.core.config import settings
+from app.langgraph_agent.cache import llm_cache
+from app.langgraph_agent.compaction import prompt_stats
+from app.langgraph_agent.fake_llm import FakeStructuredChatModel
+from app.langgraph_agent.llm import set_llm
+from app.langgraph_agent.task_index import task_category_index
+from app.services import analysis_service
+from benchmarks.bench_graph_load import make_tasks
+
+
+def _prompt_tokens() -> int:
+    return sum(stage["prompt_tokens"] for stage in prompt_stats.stats().values())
+
+
+async def _measure(run) -> tuple:
+    fake = FakeStructuredChatModel(stress_level=5)
+    set_llm(fake)
+    prompt_stats.reset()
+    await run()
+    return fake.stats()["calls"], _prompt_tokens()
+
+
+async def main_async(args):
+    tasks = make_tasks(args.tasks)
+    await _measure(lambda: analysis_service.analyze_session_service("bench", tasks))
+
+    incremental = [0, 0]
+    full = [0, 0]
+    for i in range(args.edits):
+        added, removed = f"New task number {i}", tasks[i]
+        calls, tokens = await _measure(
+            lambda: analysis_service.update_session_service("bench", [added], [removed])
+        )
+        incremental[0] += calls
+        incremental[1] += tokens
+
+        tasks = [task for task in tasks if task != removed] + [added]
+        calls, tokens = await _measure(lambda: analysis_service.analyze_schedule_service(tasks))
+        full[0] += calls
+        full[1] += tokens
+
+    print(f"{args.edits} edits of a {args.tasks}-task schedule (one task added and one removed per edit)")
+    print(f"{'':<14}{'LLM calls/edit':>16}{'prompt tokens/edit':>20}")
+    print(f"{'full re-run':<14}{full[0] / args.edits:>16.1f}{full[1] / args.edits:>20.0f}")
+    print(f"{'incremental':<14}{incremental[0] / args.edits:>16.1f}{incremental[1] / args.edits:>20.0f}")
+    print(f"incremental edits cost {incremental[1] / full[1]:.0%} of the prompt tokens of a full run")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=50)
+    parser.add_argument("--edits", type=int, default=10)
+    args = parser.parse_args()
+
+    # Without caches the full re-run pays for every task again, as on a cold server
+    llm_cache.enabled = False
+    task_category_index.enabled = False
+    settings.HEURISTICS_ENABLED = False
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Speculative-execution benchmark: request latency of the standard graph
+against the speculative graph, and what the speculation costs.
+
+Both graphs run against `FakeStructuredChatModel` with a fixed per-call
+latency. The fake model's stress level is pinned per branch, so the router's
+pick is known while the rule-based estimate that drives the speculation
+varies with the task list. For the speculative runs the benchmark also
+reports the hit rate, the tokens spent on discarded branches and the
+latency saved (from `speculation_stats`, see app/langgraph_agent/speculation.py).
+
+Usage (from the `backend` directory):
+    python -m benchmarks.bench_speculation --requests 50 --latency 0.1 --tasks 5 9 20
+"""
+
+import argparse
+import asyncio
+import statistics
+
+from app.core.config import settings
+from app.langgraph_agent.cache import llm_cache
+from app.langgraph_agent.fake_llm import FakeStructuredChatModel
+from app.langgraph_agent.llm import set_llm
+from app.langgraph_agent.speculation import speculation_stats
+from app.langgraph_agent.task_index import task_category_index
+from benchmarks.bench_graph_load import BRANCH_STRESS_LEVELS, _run_load, percentile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.1, help="Fake LLM latency per call in seconds")
+    parser.add_argument("--tasks", type=int, nargs="+", default=[5, 9, 20])
+    args = parser.parse_args()
+
+    llm_cache.enabled = False
+    task_category_index.enabled = False
+    settings.HEURISTICS_ENABLED = False
+
+    print(
+        f"{'branch':<10}{'tasks':>6}{'std p50':>10}{'spec p50':>10}{'hit rate':>10}"
+        f"{'started':>9}{'wasted tok':>12}{'saved ms/req':>14}"
+    )
+    for branch, stress_level in BRANCH_STRESS_LEVELS.items():
+        set_llm(FakeStructuredChatModel(stress_level=stress_level, latency_seconds=args.latency))
+        for task_count in args.tasks:
+            standard, _ = asyncio.run(_run_load(args.requests, args.concurrency, task_count, "standard"))
+            speculation_stats.reset()
+            speculative, _ = asyncio.run(_run_load(args.requests, args.concurrency, task_count, "speculative"))
+            stats = speculation_stats.stats()
+            wasted = stats["wasted_prompt_tokens"] + stats["wasted_completion_tokens"]
+            print(
+                f"{branch:<10}{task_count:>6}{percentile(standard, 50) * 1000:>8.0f}ms"
+                f"{percentile(speculative, 50) * 1000:>8.0f}ms{stats['hit_rate']:>10.0%}"
+                f"{stats['branches_started'] / stats['runs']:>9.1f}{wasted / stats['runs']:>12.0f}"
+                f"{stats['latency_saved_ms_per_run']:>14.0f}"
+            )
+    set_llm(None)
+
+
+if __name__ == "__main__":
+    main()
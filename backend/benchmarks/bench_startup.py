@@ -0,0 +1,128 @@
+"""
+Startup benchmark: how long it takes to import the app and to warm it up.
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters and
+parses the output into a report: the total import time of `app.main`, the
+slowest top-level packages, and the app's own modules. It also times
+`warm_up()`, which builds the LLM client and compiles the graphs in the
+lifespan hook. The run fails when the median import time exceeds the budget,
+so it can guard against regressions in CI.
+
+Usage (from the `backend` directory):
+    python -m benchmarks.bench_startup --runs 5 --budget-ms 1500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+WARM_UP_SNIPPET = (
+    "import time\n"
+    "import app.main\n"
+    "from app.langgraph_agent.agent import warm_up\n"
+    "start = time.perf_counter()\n"
+    "warm_up()\n"
+    "print((time.perf_counter() - start) * 1000)\n"
+)
+
+
+def parse_importtime(stderr: str):
+    """Parses `-X importtime` lines into (module, self_us, cumulative_us, depth) tuples."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def _env():
+    # Warm-up builds ChatOpenAI, which only needs a key to be present, not valid
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "sk-startup-benchmark")
+    return env
+
+
+def measure_import():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def measure_warm_up() -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", WARM_UP_SNIPPET],
+        cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True, check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def build_report(runs: int, top: int) -> dict:
+    totals = []
+    by_package = defaultdict(list)
+    app_modules = defaultdict(list)
+    for _ in range(runs):
+        entries = measure_import()
+        totals.append(next(cum for name, _, cum, _ in entries if name == "app.main") / 1000)
+        per_package = defaultdict(int)
+        for name, self_us, cumulative_us, _ in entries:
+            per_package[name.split(".")[0]] += self_us
+            if name.startswith("app."):
+                app_modules[name].append(cumulative_us / 1000)
+        for package, self_us in per_package.items():
+            by_package[package].append(self_us / 1000)
+
+    packages = sorted(
+        ((package, statistics.median(values)) for package, values in by_package.items()),
+        key=lambda item: item[1], reverse=True,
+    )
+    return {
+        "import_ms": {"median": statistics.median(totals), "min": min(totals), "max": max(totals)},
+        "warm_up_ms": statistics.median(measure_warm_up() for _ in range(runs)),
+        "top_packages_ms": dict(packages[:top]),
+        "app_modules_cumulative_ms": {
+            name: statistics.median(values) for name, values in sorted(app_modules.items())
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to measure")
+    parser.add_argument("--top", type=int, default=10, help="Number of packages to list")
+    parser.add_argument("--budget-ms", type=float, default=1500, help="Maximum median import time of app.main")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = build_report(args.runs, args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        imports = report["import_ms"]
+        print(f"import app.main: median {imports['median']:.0f} ms (min {imports['min']:.0f}, max {imports['max']:.0f})")
+        print(f"warm_up():       median {report['warm_up_ms']:.0f} ms")
+        print("slowest packages (self time):")
+        for package, ms in report["top_packages_ms"].items():
+            print(f"  {package:<30}{ms:>8.0f} ms")
+        print("app modules (cumulative):")
+        for name, ms in report["app_modules_cumulative_ms"].items():
+            print(f"  {name:<40}{ms:>8.0f} ms")
+
+    if report["import_ms"]["median"] > args.budget_ms:
+        print(f"import time over budget ({args.budget_ms:.0f} ms)", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
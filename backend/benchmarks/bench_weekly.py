@@ -0,0 +1,62 @@
+"""
+Weekly-analysis benchmark: wall time of analyzing one day against a full
+week of days analyzed in parallel and reduced into one rebalanced week.
+
+Every LLM call is answered by `FakeStructuredChatModel` with a fixed latency,
+and the LLM cache and task index are disabled, so each day costs its full
+graph run. With the days mapped concurrently, the week should take about as
+long as its slowest day rather than the sum of them.
+
+Usage (from the `backend` directory):
+    python -m benchmarks.bench_weekly --days 1 3 7 --tasks 8 --latency 0.1
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core.config import settings
+from app.langgraph_agent.cache import llm_cache
+from app.langgraph_agent.fake_llm import FakeStructuredChatModel
+from app.langgraph_agent.llm import set_llm
+from app.langgraph_agent.task_index import task_category_index
+from app.services import analysis_service
+from benchmarks.bench_graph_load import make_tasks
+
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, nargs="+", default=[1, 3, 7])
+    parser.add_argument("--tasks", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.1, help="Fake LLM latency per call in seconds")
+    args = parser.parse_args()
+
+    llm_cache.enabled = False
+    task_category_index.enabled = False
+    settings.HEURISTICS_ENABLED = False
+    settings.COALESCE_REQUESTS_ENABLED = False
+    settings.WEEK_MAX_DAYS = max(settings.WEEK_MAX_DAYS, *args.days)
+
+    print(f"{'days':>5}{'wall time':>11}{'per day':>10}{'LLM calls':>11}{'peak in flight':>16}")
+    for n_days in args.days:
+        week = {
+            f"{DAY_NAMES[i % 7]} {i // 7 + 1}": make_tasks(args.tasks, seed=i)
+            for i in range(n_days)
+        }
+        model = FakeStructuredChatModel(latency_seconds=args.latency)
+        set_llm(model)
+        start = time.perf_counter()
+        asyncio.run(analysis_service.analyze_week_service(week))
+        elapsed = time.perf_counter() - start
+        stats = model.stats()
+        print(
+            f"{n_days:>5}{elapsed * 1000:>9.0f}ms{elapsed * 1000 / n_days:>8.0f}ms"
+            f"{stats['calls']:>11}{stats['peak_in_flight']:>16}"
+        )
+    set_llm(None)
+
+
+if __name__ == "__main__":
+    main()
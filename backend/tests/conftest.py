@@ -0,0 +1,37 @@
+import os
+
+# Run the agent against the offline fake chat model unless a test run opts into a real backend
+os.environ.setdefault("LLM_BACKEND", "fake")
+
+import pytest  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.langgraph_agent.cache import llm_cache  # noqa: E402
+from app.langgraph_agent.fake_llm import FakeStructuredChatModel  # noqa: E402
+from app.langgraph_agent.llm import set_llm  # noqa: E402
+from app.langgraph_agent.task_index import task_category_index  # noqa: E402
+
+
+@pytest.fixture
+def no_llm_shortcuts(monkeypatch):
+    """Turns off the heuristics, the LLM cache and the task category index, so every node calls the model."""
+    monkeypatch.setattr(settings, "HEURISTICS_ENABLED", False)
+    monkeypatch.setattr(llm_cache, "enabled", False)
+    monkeypatch.setattr(task_category_index, "enabled", False)
+
+
+@pytest.fixture
+def fake_llm(no_llm_shortcuts):
+    """
+    Factory installing a `FakeStructuredChatModel` built with the given
+    options as the agent's model, and returning it. The model is removed
+    again after the test, also when it fails.
+    """
+
+    def install(**options) -> FakeStructuredChatModel:
+        model = FakeStructuredChatModel(**options)
+        set_llm(model)
+        return model
+
+    yield install
+    set_llm(None)
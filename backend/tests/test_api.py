@@ -1,4 +1,9 @@
+import asyncio
+
+import httpx
 from fastapi.testclient import TestClient
+
+from app.core.config import settings
 from app.main import app
 
 client = TestClient(app)
@@ -23,3 +28,23 @@ def test_analyze_schedule_placeholder():
     assert "categorized_tasks" in data
     assert "analysis_report" in data
     assert "suggestions" in data
+
+
+def test_concurrent_requests_are_not_serialized(fake_llm, monkeypatch):
+    """Requests await their LLM calls on the event loop, so they overlap instead of queueing."""
+    monkeypatch.setattr(settings, "COALESCE_REQUESTS_ENABLED", False)
+    model = fake_llm(latency_seconds=0.1)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await asyncio.gather(
+                *(
+                    http.post("/api/v1/analyze-schedule", json={"tasks": [f"Concurrent task {i}", "Concurrent gym"]})
+                    for i in range(5)
+                )
+            )
+
+    responses = asyncio.run(run())
+    assert all(response.status_code == 200 for response in responses)
+    assert model.stats()["peak_in_flight"] == 5
@@ -0,0 +1,57 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.langgraph_agent.semantic_index import semantic_analysis_cache, semantic_task_index
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_batch_results_keep_order_and_isolate_failures(fake_llm, monkeypatch):
+    # Without degradation a failing LLM call fails its schedule
+    monkeypatch.setattr(settings, "LLM_RESILIENCE_ENABLED", False)
+    fake_llm(fail_marker="BATCH-FAIL")
+    schedules = [
+        ["Batch order stand-up at 9am"],
+        ["Batch order BATCH-FAIL review"],
+        ["Batch order gym session", "Batch order groceries"],
+    ]
+    response = client.post("/api/v1/analyze-schedules:batch", json={"requests": [{"tasks": tasks} for tasks in schedules]})
+    assert response.status_code == 200
+
+    results = response.json()["results"]
+    assert [item["index"] for item in results] == [0, 1, 2]
+    assert results[1]["result"] is None
+    assert results[1]["error"]
+    for item, tasks in zip((results[0], results[2]), (schedules[0], schedules[2])):
+        assert item["error"] is None
+        assert sorted(task for category in item["result"]["categorized_tasks"].values() for task in category) == sorted(tasks)
+
+
+def test_batch_categorizes_shared_tasks_once(fake_llm, monkeypatch):
+    # Pre-categorized tasks are found through the semantic task index, with the exact task index off
+    monkeypatch.setattr(semantic_task_index, "enabled", True)
+    monkeypatch.setattr(semantic_analysis_cache, "enabled", False)
+    model = fake_llm()
+    shared = ["Batch dedup stand-up at 9am", "Batch dedup gym session"]
+    schedules = [shared, [*shared, "Batch dedup groceries"], ["batch dedup gym session", "Batch dedup dentist at 4pm"]]
+    try:
+        response = client.post("/api/v1/analyze-schedules:batch", json={"requests": [{"tasks": tasks} for tasks in schedules]})
+    finally:
+        semantic_task_index.clear()
+
+    results = response.json()["results"]
+    assert all(item["error"] is None for item in results)
+    assert results[2]["result"]["categorized_tasks"]["Health"] == ["batch dedup gym session", "Batch dedup dentist at 4pm"]
+    # One categorization for the whole batch, then an analysis and an advice call per schedule
+    assert model.stats()["calls"] == 1 + 2 * len(schedules)
+
+
+def test_batch_size_is_validated_by_the_schema():
+    too_many = [{"tasks": ["Batch limit gym session"]}] * (settings.BATCH_MAX_ITEMS + 1)
+    response = client.post("/api/v1/analyze-schedules:batch", json={"requests": too_many})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "requests"]
+
+    schema = client.get("/openapi.json").json()["components"]["schemas"]["BatchScheduleAnalysisRequest"]
+    assert schema["properties"]["requests"]["maxItems"] == settings.BATCH_MAX_ITEMS
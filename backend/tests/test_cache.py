@@ -0,0 +1,47 @@
+import time
+
+from app.langgraph_agent.cache import (
+    LLMResponseCache,
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+    make_cache_key,
+)
+from app.langgraph_agent.schemas import CategorizedTasks
+
+RESULT = CategorizedTasks(categorized_tasks={"Work": ["Team stand-up at 9am"]})
+
+
+def test_cache_key_ignores_surrounding_whitespace():
+    """Inputs that only differ in surrounding whitespace share a key, other nodes don't."""
+    key = make_cache_key("categorize", "prompt", "gpt-4o-mini", {"tasks": "Team stand-up at 9am"})
+    assert key == make_cache_key("categorize", "prompt", "gpt-4o-mini", {"tasks": " Team stand-up at 9am\n"})
+    assert key != make_cache_key("analyze", "prompt", "gpt-4o-mini", {"tasks": "Team stand-up at 9am"})
+
+
+def test_memory_backend_evicts_least_recently_used_and_expired():
+    """The memory tier is bounded by size and by TTL."""
+    backend = MemoryCacheBackend(max_entries=2, ttl_seconds=60)
+    backend.set("a", RESULT)
+    backend.set("b", RESULT)
+    backend.get("a", CategorizedTasks)
+    backend.set("c", RESULT)
+    assert backend.get("b", CategorizedTasks) is None
+    assert backend.get("a", CategorizedTasks) == RESULT
+
+    expiring = MemoryCacheBackend(ttl_seconds=0.01)
+    expiring.set("a", RESULT)
+    time.sleep(0.02)
+    assert expiring.get("a", CategorizedTasks) is None
+
+
+def test_sqlite_tier_hit_is_promoted_to_memory(tmp_path):
+    """A hit from disk is promoted into the memory tier and counted per tier."""
+    sqlite_backend = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+    sqlite_backend.set("key", RESULT)
+    cache = LLMResponseCache(MemoryCacheBackend(), sqlite_backend)
+
+    assert cache.get("missing", CategorizedTasks) is None
+    assert cache.get("key", CategorizedTasks) == RESULT
+    assert cache.get("key", CategorizedTasks) == RESULT
+    assert cache.stats()["hits"] == {"memory": 1, "sqlite": 1}
+    assert cache.stats()["misses"] == 1
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services import analysis_service
+from app.services.coalescing import SingleFlight
+
+
+def test_concurrent_identical_requests_share_one_run(fake_llm):
+    model = fake_llm(latency_seconds=0.05)
+    analysis_service.analysis_flights.reset()
+    tasks = ["Coalesced stand-up at 9am", "Coalesced gym session", "Coalesced groceries"]
+    # Reordered and recased copies of the template count as the same schedule
+    variants = [tasks, list(reversed(tasks)), [task.upper() for task in tasks]]
+
+    async def run():
+        return await asyncio.gather(
+            *(analysis_service.analyze_schedule_service(variants[i % 3]) for i in range(9))
+        )
+
+    results = asyncio.run(run())
+
+    for i, result in enumerate(results):
+        own = variants[i % 3]
+        # The shared analysis comes back in each caller's own wording and order
+        assert [task for category in result["categorized_tasks"].values() for task in category] == own
+        assert {key: value for key, value in result.items() if key != "categorized_tasks"} == {
+            key: value for key, value in results[0].items() if key != "categorized_tasks"
+        }
+    assert model.stats()["calls"] == 3  # categorize, analyze and one advice call
+    stats = analysis_service.analysis_flights.stats()
+    assert stats["coalesced"] == 8
+    assert stats["coalesce_ratio"] == pytest.approx(8 / 9)
+    assert stats["in_flight"] == 0
+
+
+def test_sync_callers_share_result_and_errors():
+    flights = SingleFlight()
+    runs = []
+    started = threading.Event()
+
+    def slow(value):
+        runs.append(value)
+        started.set()
+        time.sleep(0.1)
+        if value == "fail":
+            raise ValueError("boom")
+        return value
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leader = pool.submit(flights.do, "key", lambda: slow("ok"))
+        started.wait()
+        followers = [pool.submit(flights.do, "key", lambda: slow("other")) for _ in range(3)]
+        assert leader.result() == "ok"
+        assert [future.result() for future in followers] == ["ok"] * 3
+    assert runs == ["ok"]
+
+    started.clear()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flights.do, "key", lambda: slow("fail"))
+        started.wait()
+        follower = pool.submit(flights.do, "key", lambda: slow("other"))
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+    # A finished flight is not reused
+    assert flights.do("key", lambda: "fresh") == "fresh"
+    assert flights.stats()["coalesced"] == 4
+
+
+def test_shared_result_is_returned_in_each_callers_wording():
+    leader = {
+        "categorized_tasks": {"Work": ["Stand-up at 9am", "Write report"], "Health": ["Gym"], "Other": ["Extra"]},
+        "stress_level": 8,
+        "tasks_to_reschedule": ["Write report"],
+        "tasks_to_delegate": [],
+    }
+    follower = analysis_service._in_own_wording(leader, ["gym", "WRITE  REPORT", "stand-up at 9am"])
+
+    assert follower["categorized_tasks"] == {
+        "Health": ["gym"],
+        "Work": ["WRITE  REPORT", "stand-up at 9am"],
+        "Other": ["Extra"],
+    }
+    assert follower["tasks_to_reschedule"] == ["WRITE  REPORT"]
+    assert follower["stress_level"] == 8
+    assert leader["categorized_tasks"]["Work"] == ["Stand-up at 9am", "Write report"]
@@ -0,0 +1,64 @@
+import pytest
+
+from app.core.config import settings
+from app.langgraph_agent.agent import NODE_CALLS, _compact_schedule
+from app.langgraph_agent.compaction import (
+    chunk_tasks,
+    encode_categorized_tasks,
+    estimate_tokens,
+    resolve_task_refs,
+    summarize_text,
+)
+
+CATEGORIZED = {
+    "Work": ["Team meeting at 10am", "Finish the quarterly report"],
+    "Health": ["Gym session"],
+}
+
+
+def test_encoding_uses_shared_task_ids():
+    encoded, omitted = encode_categorized_tasks(CATEGORIZED)
+    assert encoded == "[Work]\nT1 Team meeting at 10am\nT2 Finish the quarterly report\n[Health]\nT3 Gym session"
+    assert omitted == 0
+    assert resolve_task_refs(["T3", "T2: the report", "Call mom"], CATEGORIZED) == [
+        "Gym session",
+        "Finish the quarterly report",
+        "Call mom",
+    ]
+
+
+def test_budgets_summarize_and_chunk_large_inputs():
+    categorized = {
+        "Work": [f"Work item number {i}" for i in range(100)],
+        "Health": [f"Health item number {i}" for i in range(20)],
+    }
+    encoded, omitted = encode_categorized_tasks(categorized, budget=200)
+    assert estimate_tokens(encoded) <= 200
+    assert 0 < omitted < 120
+    # Every category keeps some tasks and reports what was left out
+    assert "T101 Health item number 0" in encoded
+    assert encoded.count("more)") == 2
+
+    chunks = chunk_tasks(categorized["Work"], budget=50)
+    assert [task for chunk in chunks for task in chunk] == categorized["Work"]
+    assert all(estimate_tokens("\n".join(chunk)) <= 50 for chunk in chunks)
+
+    report = "The day is packed. There are no breaks. " * 20
+    assert estimate_tokens(summarize_text(report, 20)) <= 20
+    assert summarize_text(report, 20).startswith("The day is packed.")
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_id_format_hint_only_with_compaction(monkeypatch, enabled):
+    monkeypatch.setattr(settings, "PROMPT_COMPACTION_ENABLED", enabled)
+    state = {"categorized_tasks": CATEGORIZED, "analysis_report": "A busy day."}
+    for node in ("analyze", "suggest", "rebalance"):
+        input_data = _compact_schedule(node, state)[1]
+        if node == "rebalance":
+            input_data.update(stress_level=8, key_concerns="- No breaks")
+        system, human = NODE_CALLS[node][0].format_messages(**input_data)
+        assert ("'<ID> <task>'" in system.content) is enabled
+        assert ("T1 Team meeting at 10am" in human.content) is enabled
+        if not enabled:
+            assert "ID" not in system.content
+            assert str(CATEGORIZED) in human.content
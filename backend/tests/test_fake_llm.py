@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from app.langgraph_agent.agent import NODE_CALLS, structured_runnable
+from app.langgraph_agent.fake_llm import FakeLLMError, FakeStructuredChatModel
+from app.langgraph_agent.llm import create_llm
+from app.langgraph_agent.schemas import CategorizedTasks
+
+
+def test_fake_llm_returns_schema_valid_results():
+    """Every node's structured call parses into its schema."""
+    model = FakeStructuredChatModel()
+    input_data = {
+        "tasks": "Team meeting at 10am\nGym session",
+        "categorized_tasks": {"Work": ["Team meeting at 10am"]},
+        "analysis_report": "Busy morning",
+        "stress_level": 6,
+        "format_hint": "",
+        "key_concerns": "None",
+    }
+    for node, (prompt, schema) in NODE_CALLS.items():
+        result = (prompt | model.with_structured_output(schema, method="function_calling")).invoke(input_data)
+        assert isinstance(result, schema), node
+
+    categorize = NODE_CALLS["categorize"][0] | model.with_structured_output(
+        CategorizedTasks, method="function_calling"
+    )
+    result = categorize.invoke({"tasks": "Team meeting at 10am\nGym session\nWater the plants"})
+    assert result.categorized_tasks == {
+        "Work": ["Team meeting at 10am"],
+        "Health": ["Gym session"],
+        "Other": ["Water the plants"],
+    }
+
+
+def test_fake_llm_streams_and_injects_failures():
+    model = FakeStructuredChatModel(fail_marker="FAIL", stress_level=9)
+    runnable = NODE_CALLS["analyze"][0] | model.with_structured_output(NODE_CALLS["analyze"][1], method="function_calling")
+
+    async def stream():
+        return [chunk async for chunk in runnable.astream({"categorized_tasks": {"Work": ["Report"]}, "format_hint": ""})]
+
+    chunks = asyncio.run(stream())
+    assert chunks[-1].stress_level == 9
+    assert chunks[-1].needs_rebalancing is True
+
+    with pytest.raises(FakeLLMError):
+        runnable.invoke({"categorized_tasks": {"Work": ["FAIL"]}, "format_hint": ""})
+    assert model.stats()["calls"] == 2
+    assert model.stats()["in_flight"] == 0
+
+
+def test_llm_backend_is_selected_from_config():
+    assert isinstance(create_llm("fake"), FakeStructuredChatModel)
+    assert isinstance(create_llm(), FakeStructuredChatModel)
+    assert structured_runnable("suggest") is structured_runnable("suggest")
+    with pytest.raises(ValueError):
+        create_llm("unknown")
@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+from app.api.v1.schemas import ScheduleAnalysisResponse
+from app.core.config import settings
+from app.main import app
+from tests.test_streaming import read_events
+
+client = TestClient(app)
+
+TASKS = ["Fast mode stand-up at 9am", "Fast mode gym session", "Fast mode groceries"]
+
+
+def test_fast_mode_fuses_categorize_and_analyze(fake_llm):
+    model = fake_llm()
+    response = client.post("/api/v1/analyze-schedule", params={"mode": "fast"}, json={"tasks": TASKS})
+
+    assert response.status_code == 200
+    result = ScheduleAnalysisResponse(**response.json())
+    assert sorted(task for tasks in result.categorized_tasks.values() for task in tasks) == sorted(TASKS)
+    assert result.analysis_report and result.suggestions
+    # One fused call plus the advice, instead of categorize, analyze and advice
+    assert model.stats()["calls"] == 2
+
+    nodes = [event for event, _ in read_events([f"Streamed {task}" for task in TASKS], mode="fast")]
+    assert nodes == ["precheck", "categorize_and_analyze", "route", "suggest", "result"]
+
+
+def test_fast_mode_over_budget_falls_back_to_separate_steps(fake_llm, monkeypatch):
+    monkeypatch.setitem(settings.PROMPT_TOKEN_BUDGETS, "categorize_and_analyze", 5)
+    model = fake_llm()
+    response = client.post(
+        "/api/v1/analyze-schedule", params={"mode": "fast"}, json={"tasks": [f"Over budget {task}" for task in TASKS]}
+    )
+
+    assert response.status_code == 200
+    ScheduleAnalysisResponse(**response.json())
+    assert model.stats()["calls"] == 3
@@ -0,0 +1,60 @@
+from app.core.config import settings
+from app.langgraph_agent.agent import precheck_schedule
+from app.langgraph_agent.heuristics import assess_schedule, classify_task, local_analysis, parse_task_time
+
+
+def test_parse_task_time():
+    """Times in 12h and 24h notation are parsed into minutes after midnight."""
+    assert parse_task_time("Team stand-up at 9am") == 9 * 60
+    assert parse_task_time("Dinner at 7:30 pm") == 19 * 60 + 30
+    assert parse_task_time("Deploy at 14:00") == 14 * 60
+    assert parse_task_time("Grocery shopping") is None
+
+
+def test_keywords_match_whole_words_unless_marked_as_stems():
+    """Short keywords do not match inside longer words or hyphenated compounds."""
+    assert classify_task("Draft the party-line memo for legal") is None
+    assert classify_task("Fix daddy-long-legs bug in parser") is None
+    assert classify_task("Build momentum for the launch") is None
+    assert classify_task("Wait a moment") is None
+    assert classify_task("Call mom")[0] == "Personal"
+    assert classify_task("Pay the bills")[0] == "Chores"
+    assert classify_task("Two client meetings")[0] == "Work"
+    # Stems still match as prefixes
+    assert classify_task("Buy groceries")[0] == "Chores"
+    assert classify_task("Morning meditation")[0] == "Health"
+
+
+def test_trivial_schedule_is_short_circuited():
+    """A short, fully recognized, relaxed schedule skips the LLM; a dense one does not."""
+    assert classify_task("Gym after work")[0] == "Health"
+
+    trivial = assess_schedule(["Team stand-up at 9am", "Gym after work"])
+    assert trivial.short_circuit
+    assert trivial.categories == {"Team stand-up at 9am": "Work", "Gym after work": "Health"}
+
+    dense = assess_schedule(["Team stand-up at 9am", "Client meeting at 9:30am", "Design review at 10am"])
+    assert dense.back_to_back_count == 2
+    assert not dense.short_circuit
+
+
+def test_short_circuit_requires_every_task_recognized(monkeypatch):
+    """Looser thresholds still never skip the LLM for a schedule with unrecognized tasks."""
+    monkeypatch.setattr(settings, "HEURISTIC_MAX_TASKS", 10)
+    monkeypatch.setattr(settings, "HEURISTIC_MIN_CONFIDENCE", 0.8)
+    monkeypatch.setattr(settings, "HEURISTIC_MAX_STRESS", 10)
+    recognized = [f"Gym session {day}" for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday")]
+    recognized += ["Team stand-up at 9am", "Lunch with mom", "Laundry", "Yoga class"]
+    assert all(classify_task(task) for task in recognized)
+
+    partial = assess_schedule(recognized + ["Zorblax the quinterfold"])
+    assert partial.confidence >= settings.HEURISTIC_MIN_CONFIDENCE
+    assert len(partial.categories) == 9
+    assert not partial.short_circuit
+
+    update = precheck_schedule({"tasks": recognized + ["Zorblax the quinterfold"]})
+    assert update["short_circuited"] is False
+
+    full = assess_schedule(recognized)
+    assert full.short_circuit
+    assert sum(len(tasks) for tasks in local_analysis(recognized, full)["categorized_tasks"].values()) == 9
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core import http
+from app.core.config import settings
+from app.langgraph_agent import llm
+from app.langgraph_agent.llm import create_llm
+from app.langgraph_agent.model_router import model_router
+
+
+@pytest.fixture
+def server():
+    """A local keep-alive HTTP server that records the client port of every request."""
+    ports = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            ports.append(self.client_address[1])
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}/", ports
+    httpd.shutdown()
+    asyncio.run(http.aclose_http_clients())
+
+
+def test_llm_clients_share_one_pooled_http_client(server):
+    url, ports = server
+    first = create_llm("openai", api_key="test-key")
+    second = create_llm("openai", api_key="test-key", model="gpt-4o")
+    assert first.http_client is second.http_client is http.get_http_client()
+    assert first.http_async_client is second.http_async_client is http.get_async_http_client()
+
+    before = http.sync_pool_stats.stats()
+    for _ in range(5):
+        assert http.get_http_client().get(url).text == "ok"
+    after = http.sync_pool_stats.stats()
+    # Sequential requests go over a single kept-alive connection
+    assert len(set(ports)) == 1
+    assert after["requests_total"] - before["requests_total"] == 5
+    assert after["in_flight"] == 0
+
+
+def test_async_pool_stats_track_concurrent_requests(server):
+    url, _ = server
+
+    async def run():
+        client = http.get_async_http_client()
+        responses = await asyncio.gather(*(client.get(url) for _ in range(4)))
+        assert http.get_async_http_client() is client
+        # Its connections belong to this event loop
+        await http.aclose_http_clients()
+        return responses
+
+    before = http.async_pool_stats.stats()
+    responses = asyncio.run(run())
+    after = http.async_pool_stats.stats()
+
+    assert [response.text for response in responses] == ["ok"] * 4
+    assert after["requests_total"] - before["requests_total"] == 4
+    assert after["peak_in_flight"] >= 2
+    assert after["in_flight"] == 0
+
+
+def test_models_are_rebuilt_after_the_clients_close(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_BACKEND", "openai")
+    monkeypatch.setattr(settings, "LLM_MODELS", {"mini": {"backend": "openai", "model": "gpt-4o-mini"}})
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(llm, "_llm", None)
+    first, routed = llm.get_llm(), model_router.primary("categorize").model
+    asyncio.run(http.aclose_http_clients())
+
+    # A later lifespan in the same process must not reuse the closed clients
+    second = llm.get_llm()
+    assert second is not first and not second.http_async_client.is_closed
+    assert second.http_async_client is http.get_async_http_client()
+    rebuilt = model_router.primary("categorize").model
+    assert rebuilt is not routed and not rebuilt.http_client.is_closed
+    asyncio.run(http.aclose_http_clients())
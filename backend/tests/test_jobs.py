@@ -0,0 +1,159 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.services import analysis_service
+from app.services.jobs import JobQueue, QueueFullError
+
+client = TestClient(app)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_job_is_polled_and_posted_to_webhook(fake_llm, monkeypatch):
+    # The test's webhook receiver listens on loopback
+    monkeypatch.setattr(settings, "JOB_WEBHOOK_ALLOW_PRIVATE", True)
+    received = []
+
+    class Hook(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Hook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    fake_llm(latency_seconds=0.05)
+    try:
+        response = client.post(
+            "/api/v1/analyze-schedule/jobs",
+            json={"tasks": ["Job stand-up at 9am", "Job gym session"], "callback_url": f"http://127.0.0.1:{server.server_port}/"},
+        )
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert response.headers["Location"].endswith(job_id)
+        assert response.json()["status"] in ("queued", "running")
+
+        poll = lambda: client.get(f"/api/v1/analyze-schedule/jobs/{job_id}").json()
+        wait_for(lambda: poll()["webhook_status"] is not None)
+    finally:
+        server.shutdown()
+
+    job = poll()
+    assert job["status"] == "succeeded"
+    assert job["webhook_status"] == "delivered"
+    assert job["result"]["categorized_tasks"]
+    assert received[0]["job_id"] == job_id
+    assert received[0]["result"]["categorized_tasks"] == job["result"]["categorized_tasks"]
+    assert client.get("/api/v1/analyze-schedule/jobs/unknown").status_code == 404
+    assert "analysis_jobs_queue_depth 0" in client.get("/metrics").text
+
+
+def test_full_queue_rejects_and_finished_jobs_expire(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_WORKERS", 1)
+    monkeypatch.setattr(settings, "JOB_QUEUE_MAX_DEPTH", 1)
+    monkeypatch.setattr(settings, "JOB_RESULT_TTL_SECONDS", 0.2)
+    release = threading.Event()
+
+    def run(tasks, mode):
+        release.wait(5)
+        if tasks == ["fail"]:
+            raise ValueError("boom")
+        return {"tasks": tasks}
+
+    jobs = JobQueue(run)
+    try:
+        running = jobs.submit(["first"])
+        wait_for(lambda: jobs.stats()["running"] == 1)
+        queued = jobs.submit(["fail"])
+        with pytest.raises(QueueFullError):
+            jobs.submit(["third"])
+        assert jobs.stats()["queue_depth"] == 1
+
+        release.set()
+        wait_for(lambda: jobs.stats()["succeeded"] + jobs.stats()["failed"] == 2)
+        assert jobs.get(running["job_id"])["result"] == {"tasks": ["first"]}
+        assert jobs.get(queued["job_id"])["error"] == "boom"
+
+        time.sleep(0.25)
+        assert jobs.get(running["job_id"]) is None
+        stats = jobs.stats()
+    finally:
+        jobs.shutdown(wait=True)
+    assert (stats["rejected"], stats["evicted"], stats["stored"], stats["queue_depth"]) == (1, 2, 0, 0)
+
+
+def test_reset_clears_queued_and_running_counts(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_WORKERS", 1)
+    release = threading.Event()
+    ran = []
+    jobs = JobQueue(lambda tasks, mode: ran.append(tasks) or release.wait(5) and {"tasks": tasks})
+    try:
+        jobs.submit(["running"])
+        wait_for(lambda: jobs.stats()["running"] == 1)
+        jobs.submit(["queued"])
+        jobs.reset()
+        assert (jobs.stats()["running"], jobs.stats()["queue_depth"]) == (0, 0)
+
+        # The job that was running finishes without touching the new counts
+        release.set()
+        jobs.submit(["after reset"])
+        wait_for(lambda: jobs.stats()["succeeded"] == 1)
+    finally:
+        jobs.shutdown(wait=True)
+    stats = jobs.stats()
+    assert (stats["running"], stats["queue_depth"], stats["submitted"], stats["stored"]) == (0, 0, 1, 1)
+    assert ran == [["running"], ["after reset"]]
+
+
+@pytest.mark.parametrize(
+    "callback_url",
+    [
+        "http://127.0.0.1:8080/hook",
+        "http://169.254.169.254/latest/meta-data/",
+        "http://10.0.0.5/hook",
+        "http://[::1]/hook",
+        "http://localhost/hook",
+        "https://evil.example.org/hook",
+        "ftp://hooks.example.com/hook",
+        "not a url",
+    ],
+)
+def test_callback_urls_outside_the_allowlist_or_public_internet_are_rejected(monkeypatch, callback_url):
+    monkeypatch.setattr(settings, "JOB_WEBHOOK_ALLOWED_HOSTS", ["hooks.example.com", "*.example.net", "127.0.0.1", "169.254.169.254"])
+    submitted = analysis_service.analysis_jobs.stats()["submitted"]
+
+    response = client.post("/api/v1/analyze-schedule/jobs", json={"tasks": ["Refused job"], "callback_url": callback_url})
+
+    assert response.status_code == 422
+    assert analysis_service.analysis_jobs.stats()["submitted"] == submitted
+
+
+def test_callback_refused_at_delivery_is_marked_failed(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_WEBHOOK_ALLOWED_HOSTS", ["93.184.215.14"])
+    release = threading.Event()
+    jobs = JobQueue(lambda tasks, mode: release.wait(5) and {"tasks": tasks})
+    try:
+        job = jobs.submit(["Refused at delivery"], callback_url="http://93.184.215.14/hook")
+        # The host is dropped from the allowlist before the job finishes
+        monkeypatch.setattr(settings, "JOB_WEBHOOK_ALLOWED_HOSTS", ["hooks.example.com"])
+        release.set()
+        wait_for(lambda: jobs.get(job["job_id"])["webhook_status"] is not None)
+    finally:
+        jobs.shutdown(wait=True)
+    assert jobs.get(job["job_id"])["webhook_status"] == "failed"
+    assert jobs.stats()["webhooks_failed"] == 1
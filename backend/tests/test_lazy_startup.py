@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Run in a fresh interpreter: this test session has long since imported and built everything
+SCRIPT = """
+import sys
+
+import app.langgraph_agent.agent as agent
+from app.langgraph_agent import llm
+
+heavy = ("langgraph", "langchain_openai")
+assert not [name for name in sys.modules if name.split(".")[0] in heavy], "imported eagerly"
+assert agent._agents == {} and llm._llm is None
+
+agent.WorkLifeBalanceAgent
+assert "langgraph" in sys.modules
+assert set(agent._agents) == {"standard"}
+"""
+
+
+def test_importing_the_agent_defers_langgraph_and_graph_builds():
+    env = {**os.environ, "LLM_BACKEND": "fake"}
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT], cwd=Path(__file__).parents[1], env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,47 @@
+from fastapi.testclient import TestClient
+
+from app.core.metrics import MetricsRegistry
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ("node",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.observe(value, "analyze")
+    registry.counter("calls_total", "Calls", ("node",)).inc("say \"hi\"", amount=2)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{node="analyze",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{node="analyze",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{node="analyze",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{node="analyze"} 4.25' in lines
+    assert 'latency_seconds_count{node="analyze"} 4' in lines
+    assert 'calls_total{node="say \\"hi\\""} 2' in lines
+
+
+def test_metrics_endpoint_reports_routes_nodes_and_tokens():
+    tasks = ["Metrics review meeting at 10am", "Prepare the metrics report", "Call the metrics vendor"]
+    assert client.post("/api/v1/analyze-schedule", json={"tasks": tasks}).status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="POST",route="/api/v1/analyze-schedule",status="200"}' in body
+    assert 'graph_node_duration_seconds_count{node="analyze"}' in body
+    assert 'agent_route_total{branch="' in body
+    assert 'llm_prompt_tokens_total{node="analyze"}' in body
+    assert "graph_nodes_in_flight" in body
+    assert "llm_cache_hit_ratio" in body
+    assert 'llm_http_pool_in_flight{client="async"}' in body
+
+
+def test_route_label_is_the_prefixed_template():
+    client.delete("/api/v1/sessions/metrics-label-session")
+    body = client.get("/metrics").text
+    assert 'http_request_duration_seconds_count{method="DELETE",route="/api/v1/sessions/{session_id}",' in body
+    assert "metrics-label-session" not in body
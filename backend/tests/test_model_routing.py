@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.langgraph_agent.model_router import model_router
+from app.services import analysis_service
+
+
+def fake_profile(model, quality, input_cost, output_cost, **options):
+    return {
+        "backend": "fake",
+        "model": model,
+        "quality": quality,
+        "input_cost_per_1m": input_cost,
+        "output_cost_per_1m": output_cost,
+        **options,
+    }
+
+
+@pytest.fixture
+def profiles(no_llm_shortcuts, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MODELS", {
+        "default": fake_profile("gpt-4o-mini", 3, 0.15, 0.60),
+        "nano": fake_profile("gpt-4.1-nano", 1, 0.10, 0.40),
+        "strong": fake_profile("gpt-4o", 4, 2.50, 10.00, stress_level=9),
+        "local": fake_profile("local-llama", 1, 0.0, 0.0),
+    })
+    monkeypatch.setattr(settings, "LLM_NODE_MIN_QUALITY", {"categorize": 1, "analyze": 4, "suggest": 3, "rebalance": 4})
+    model_router.reset()
+    yield
+
+
+def test_nodes_use_cheapest_model_meeting_their_quality_bar(profiles, monkeypatch):
+    # The free local model would win every node it qualifies for
+    monkeypatch.setitem(settings.LLM_MODELS, "local", fake_profile("local-llama", 0, 0.0, 0.0))
+    result = asyncio.run(analysis_service.analyze_schedule_service(["Routing stand-up at 9am", "Routing gym session"]))
+
+    assert result["rebalance_report"]
+    stats = model_router.stats()
+    assert stats["categorize"]["models"] == {"nano": 1}
+    assert stats["analyze"]["models"] == {"strong": 1}
+    assert stats["rebalance"]["models"] == {"strong": 1}
+    assert stats["rebalance"]["cost_usd"] > stats["categorize"]["cost_usd"] > 0
+    assert stats["analyze"]["latency_ms_p50"] > 0
+
+
+def test_saturated_model_falls_back(profiles, monkeypatch):
+    monkeypatch.setitem(settings.LLM_MODELS, "nano", fake_profile("gpt-4.1-nano", 1, 0.10, 0.40, max_in_flight=1))
+    monkeypatch.setitem(settings.LLM_MODELS, "local", fake_profile("local-llama", 0, 0.0, 0.0, max_in_flight=1))
+
+    # Without a stand-in, the next cheapest qualifying profile takes the call
+    with model_router.route("categorize") as first, model_router.route("categorize") as second:
+        assert (first.profile, first.fallback) == ("nano", False)
+        assert (second.profile, second.fallback) == ("default", True)
+
+    # With one, the local model takes over until it is saturated as well
+    monkeypatch.setattr(settings, "LLM_FALLBACK_MODEL", "local")
+    with model_router.route("categorize") as first, model_router.route("categorize") as second:
+        with model_router.route("categorize") as third:
+            assert [route.profile for route in (first, second, third)] == ["nano", "local", "default"]
+    assert not any(model_router.in_flight().values())
+    assert model_router.stats()["categorize"]["fallbacks"] == 3
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.langgraph_agent.fake_llm import FakeStructuredChatModel
+from app.langgraph_agent.llm import set_llm
+from app.langgraph_agent.resilience import CircuitBreaker, LLMDeadlineExceeded, ResilientCaller, llm_resilience
+from app.main import app
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_RETRY_BASE_DELAY_SECONDS", 0.001)
+    monkeypatch.setattr(settings, "LLM_NODE_TIMEOUT_SECONDS", {"analyze": 0.2})
+
+
+def test_retries_deadlines_and_hedges(fast_retries, monkeypatch):
+    caller = ResilientCaller()
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ConnectionError("reset by peer")
+        return "ok"
+
+    assert asyncio.run(caller.acall("analyze", flaky)) == "ok"
+    assert caller.stats()["analyze"]["retries"] == 1
+
+    async def hangs():
+        await asyncio.sleep(10)
+
+    with pytest.raises(LLMDeadlineExceeded):
+        asyncio.run(caller.acall("analyze", hangs))
+    assert caller.stats()["analyze"]["timeouts"] == 3
+
+    # The first request stalls, the hedged duplicate answers
+    monkeypatch.setattr(settings, "LLM_HEDGE_ENABLED", True)
+    monkeypatch.setattr(settings, "LLM_HEDGE_DELAY_SECONDS", 0.02)
+    delays = iter([5.0, 0.0])
+
+    async def slow_then_fast():
+        await asyncio.sleep(next(delays))
+        return "hedged"
+
+    assert asyncio.run(caller.acall("analyze", slow_then_fast)) == "hedged"
+    assert caller.stats()["analyze"]["hedges_won"] == 1
+    assert caller.call("analyze", lambda: "sync") == "sync"
+
+
+def test_circuit_breaker_opens_and_recovers(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr("app.langgraph_agent.resilience.time.monotonic", lambda: clock[0])
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock[0] = 31
+    assert breaker.allow()  # half-open trial
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_failing_llm_degrades_to_local_results(fast_retries, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_BREAKER_FAILURE_THRESHOLD", 1)
+    set_llm(FakeStructuredChatModel(failure_rate=1.0))
+    llm_resilience.reset()
+    try:
+        response = TestClient(app).post(
+            "/api/v1/analyze-schedule",
+            json={"tasks": ["Degraded stand-up at 9am", "Degraded gym session", "Buy degraded groceries", "Water the plants"]},
+        )
+    finally:
+        set_llm(None)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["degraded_nodes"] == ["categorize", "analyze", "suggest"]
+    assert data["categorized_tasks"]["Other"] == ["Water the plants"]
+    assert data["suggestions"]
+    stats = llm_resilience.stats()
+    assert stats["categorize"]["breaker_state"] == "open"
+    assert stats["suggest"]["fallbacks"] == 1
+    llm_resilience.reset()
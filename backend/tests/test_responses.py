@@ -0,0 +1,44 @@
+import json
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+
+from app.api.v1 import schemas
+from app.core.responses import dumps
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_dumps_matches_pydantic_serialization():
+    result = schemas.ScheduleAnalysisResponse(
+        categorized_tasks={"Work": ["Review the Q3 budget"], "Personal": ["Call mum ☎"]},
+        analysis_report="Busy but manageable.",
+        stress_level=6,
+        workload_assessment="moderate",
+        key_concerns=["Few breaks"],
+        needs_rebalancing=False,
+    )
+    batch = schemas.BatchScheduleAnalysisResponse(
+        results=[
+            schemas.BatchScheduleAnalysisItem(index=0, result=result),
+            schemas.BatchScheduleAnalysisItem(index=1, error="boom"),
+        ]
+    )
+    job = schemas.AnalysisJobResponse(
+        job_id="abc", status="succeeded", created_at=datetime(2024, 5, 1, 9, 30, tzinfo=timezone.utc), result=result
+    )
+
+    for model in (result, batch, job):
+        assert json.loads(dumps(model)) == json.loads(model.model_dump_json())
+
+
+def test_endpoint_returns_every_response_field():
+    response = client.post("/api/v1/analyze-schedule", json={"tasks": ["Serialized stand-up at 9am"]})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    data = response.json()
+    # Fields the graph did not set are still present, as null
+    assert set(data) == set(schemas.ScheduleAnalysisResponse.model_fields)
+    schemas.ScheduleAnalysisResponse.model_validate(data)
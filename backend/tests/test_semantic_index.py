@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.langgraph_agent.semantic_index import SemanticIndex, semantic_analysis_cache, semantic_task_index
+from app.services import analysis_service
+
+
+def test_near_duplicates_hit_and_least_recently_used_is_evicted():
+    index = SemanticIndex(max_entries=2, threshold=0.85)
+    index.add(["Team standup 9am", "Buy groceries"], ["Work", "Errands"])
+
+    matches = index.search(["Team stand-up at 9am", "BUY GROCERIES!", "Call the plumber"])
+    assert [match and match[0] for match in matches] == ["Work", "Errands", None]
+    assert matches[0][1] == pytest.approx(1.0)
+
+    # A near duplicate with a different answer counts against the threshold's agreement
+    index.add(["Team standups 9am"], ["Personal"])
+    assert (index.stats()["comparisons"], index.stats()["agreement"]) == (1, 0.0)
+    assert index.stats()["evictions"] == 1
+
+    # Same text up to case, punctuation and stopwords: the entry is replaced, nothing is evicted
+    index.add(["The team standups at 9am!"], ["Work"])
+    assert index.lookup("team standups 9am") == "Work"
+    index.add(["Call the plumber"], ["Errands"])
+    assert index.lookup("call plumber") == "Errands"
+    stats = index.stats()
+    assert (stats["size"], stats["evictions"]) == (2, 2)
+    assert stats["hit_rate"] == pytest.approx(4 / 5)
+
+
+@pytest.fixture
+def semantic_cache(fake_llm, monkeypatch):
+    for index in (semantic_task_index, semantic_analysis_cache):
+        monkeypatch.setattr(index, "enabled", True)
+        index.clear()
+    yield fake_llm
+    for index in (semantic_task_index, semantic_analysis_cache):
+        index.clear()
+
+
+def test_near_duplicate_schedule_reuses_categories_and_analysis(semantic_cache, monkeypatch):
+    model = semantic_cache()
+    first = asyncio.run(analysis_service.analyze_schedule_service(["Semantic team standup 9am", "Semantic gym session"]))
+    calls = model.stats()["calls"]
+    second = asyncio.run(
+        analysis_service.analyze_schedule_service(["Semantic team stand-up at 9am", "semantic gym session!"])
+    )
+    # Only the advice call is made; categories and analysis come from the near duplicates
+    assert model.stats()["calls"] == calls + 1
+    assert second["stress_level"] == first["stress_level"]
+    assert second["categorized_tasks"] == {
+        "Work": ["Semantic team stand-up at 9am"],
+        "Health": ["semantic gym session!"],
+    }
+    assert first["categorized_tasks"] == {"Work": ["Semantic team standup 9am"], "Health": ["Semantic gym session"]}
+
+    # In shadow mode the LLM still answers, and the near hits are scored against it
+    monkeypatch.setattr(settings, "SEMANTIC_CACHE_SHADOW_MODE", True)
+    calls = model.stats()["calls"]
+    asyncio.run(analysis_service.analyze_schedule_service(["Semantic team standups 9am", "Semantic gym session"]))
+    assert model.stats()["calls"] == calls + 3
+
+    assert semantic_task_index.stats()["agreement"] == semantic_analysis_cache.stats()["agreement"] == 1.0
+    assert semantic_task_index.stats()["comparisons"] == semantic_analysis_cache.stats()["comparisons"] == 1
@@ -0,0 +1,58 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.langgraph_agent.checkpoints import get_checkpointer
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_session_edits_only_recompute_changed_nodes(fake_llm):
+    model = fake_llm()
+    tasks = ["Water the plants", "Team meeting at 10am", "Gym session"]
+    response = client.put("/api/v1/sessions/edits/schedule", json={"tasks": tasks})
+    assert response.status_code == 200
+    assert response.json()["reused_nodes"] == []
+    assert model.stats()["calls"] == 3
+
+    # Same schedule in a different order and casing: nothing to recompute
+    response = client.put("/api/v1/sessions/edits/schedule", json={"tasks": ["gym session", *tasks[:2]]})
+    assert response.json()["reused_nodes"] == ["categorize", "analyze", "suggest"]
+    assert model.stats()["calls"] == 3
+
+    # Only the added task is categorized; the changed schedule is analyzed again
+    response = client.patch(
+        "/api/v1/sessions/edits/schedule", json={"add": ["Dentist at 4pm"], "remove": ["Water the plants"]}
+    )
+    data = response.json()
+    assert data["tasks"] == ["gym session", "Team meeting at 10am", "Dentist at 4pm"]
+    assert data["categorized_tasks"]["Health"] == ["gym session", "Dentist at 4pm"]
+    assert model.stats()["calls"] == 6
+    assert client.get("/api/v1/sessions/edits/schedule").json()["tasks"] == data["tasks"]
+
+
+def test_unknown_and_deleted_sessions_return_404(fake_llm):
+    fake_llm()
+    assert client.patch("/api/v1/sessions/missing/schedule", json={"add": ["Gym"]}).status_code == 404
+    client.put("/api/v1/sessions/gone/schedule", json={"tasks": ["Gym session"]})
+    assert client.delete("/api/v1/sessions/gone").status_code == 204
+    assert client.get("/api/v1/sessions/gone/schedule").status_code == 404
+
+
+def test_sessions_keep_only_their_latest_checkpoint(fake_llm):
+    fake_llm()
+    client.put("/api/v1/sessions/pruned/schedule", json={"tasks": ["Pruned gym session"]})
+    for task in ("Pruned dentist at 4pm", "Pruned groceries"):
+        assert client.patch("/api/v1/sessions/pruned/schedule", json={"add": [task]}).status_code == 200
+
+    async def count():
+        return len([c async for c in get_checkpointer().alist({"configurable": {"thread_id": "pruned"}})])
+
+    assert asyncio.run(count()) == 1
+    data = client.get("/api/v1/sessions/pruned/schedule").json()
+    assert data["tasks"] == ["Pruned gym session", "Pruned dentist at 4pm", "Pruned groceries"]
+    # The kept checkpoint still lets an unchanged schedule reuse every node
+    response = client.put("/api/v1/sessions/pruned/schedule", json={"tasks": data["tasks"]})
+    assert response.json()["reused_nodes"] == ["categorize", "analyze", "suggest"]
+    assert asyncio.run(count()) == 1
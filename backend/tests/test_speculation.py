@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from app.langgraph_agent.agent import _advice_fingerprint, _speculative_state
+from app.langgraph_agent.speculation import speculation_stats
+from app.services import analysis_service
+
+# Nine unremarkable tasks: the rule-based stress estimate is 6, a borderline schedule
+BORDERLINE_TASKS = [f"Errand number {i}" for i in range(1, 10)]
+# Eleven are estimated at 8, which already calls for rebalancing
+REBALANCE_TASKS = [f"Errand number {i}" for i in range(1, 12)]
+
+
+@pytest.fixture
+def speculative(fake_llm):
+    speculation_stats.reset()
+    return fake_llm
+
+
+@pytest.mark.parametrize(
+    "tasks, stress_level, kept, discarded",
+    [(REBALANCE_TASKS, 9, "rebalance_report", "suggestions"), (BORDERLINE_TASKS, 5, "suggestions", "rebalance_report")],
+)
+def test_borderline_schedule_keeps_routed_branch(speculative, tasks, stress_level, kept, discarded):
+    speculative(stress_level=stress_level, latency_seconds=0.05)
+    result = asyncio.run(analysis_service.analyze_schedule_service(tasks, mode="speculative"))
+
+    assert result["stress_level"] == stress_level
+    assert result.get(kept)
+    assert not result.get(discarded)
+
+    stats = speculation_stats.stats()
+    assert stats["runs"] == 1
+    assert stats["branches_started"] == 2
+    assert stats["hit_rate"] == 1.0
+    assert stats["wasted_prompt_tokens"] > 0
+    assert stats["latency_saved_ms"] > 0
+
+
+async def _final_state(tasks):
+    state = {}
+    async for event, data in analysis_service.stream_schedule_analysis_service(tasks, mode="speculative"):
+        if event not in ("route", "result"):
+            state.update(data)
+    return state
+
+
+@pytest.mark.parametrize("stress_level, rerun", [(5, False), (9, True)])
+def test_advice_is_built_on_the_llm_analysis_unless_the_estimate_holds(speculative, stress_level, rerun):
+    """Advice on the estimate (stress 6) is only kept when the LLM analysis is close to it."""
+    model = speculative(stress_level=stress_level, latency_seconds=0.02)
+    state = asyncio.run(_final_state(BORDERLINE_TASKS))
+
+    branch = "rebalance" if rerun else "suggest"
+    assert state["stress_level"] == stress_level
+    assert state["advice_fingerprint"] == _advice_fingerprint(branch, state if rerun else _speculative_state(state))
+    assert state["advice_fingerprint"] != _advice_fingerprint(branch, _speculative_state(state) if rerun else state)
+
+    stats = speculation_stats.stats()
+    assert stats["hit_rate"] == (0.0 if rerun else 1.0)
+    # categorize, analyze, both speculated branches, and the re-run
+    assert model.stats()["calls"] == 4 + rerun
+
+
+def test_unspeculated_branch_runs_after_analysis(speculative):
+    # Two tasks are estimated as low stress, so only the suggestions are speculated
+    speculative(stress_level=9)
+    result = asyncio.run(analysis_service.analyze_schedule_service(["Errand one", "Errand two"], mode="speculative"))
+
+    assert result.get("rebalance_report")
+    stats = speculation_stats.stats()
+    assert stats["branches_started"] == 1
+    assert stats["misses"] == 1
+    assert stats["wasted_prompt_tokens"] > 0
@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessageChunk
+
+from app.core.config import settings
+from app.main import app
+from app.services import analysis_service
+
+client = TestClient(app)
+
+
+def read_events(tasks, **params):
+    """Posts to the stream endpoint and returns its Server-Sent Events as (event, data) pairs."""
+    events = []
+    with client.stream("POST", "/api/v1/analyze-schedule/stream", params=params, json={"tasks": tasks}) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        for block in response.read().decode().split("\n\n"):
+            if block:
+                event, data = block.split("\n")
+                events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_stream_reports_nodes_route_partials_and_result(fake_llm):
+    fake_llm(stress_level=9)
+    events = read_events(["Stream stand-up at 9am", "Stream gym session"], tokens="true")
+
+    names = [event for event, _ in events if event != "token"]
+    assert names == ["precheck", "categorize", "analyze", "route", "rebalance", "result"]
+    by_event = {event: data for event, data in events if event != "token"}
+    assert by_event["route"] == {"route": "rebalance", "stress_level": 9, "needs_rebalancing": True}
+    assert by_event["categorize"]["categorized_tasks"] == by_event["result"]["categorized_tasks"]
+
+    # Report deltas arrive before their node's event and add up to the final text
+    tokens = [(index, data) for index, (event, data) in enumerate(events) if event == "token"]
+    analyze_at = next(index for index, (event, _) in enumerate(events) if event == "analyze")
+    analysis_deltas = [data["delta"] for index, data in tokens if data["node"] == "analyze"]
+    assert all(index < analyze_at for index, data in tokens if data["node"] == "analyze")
+    assert "".join(analysis_deltas) == by_event["result"]["analysis_report"]
+    rebalance_deltas = [data["delta"] for _, data in tokens if data["node"] == "rebalance"]
+    assert "".join(rebalance_deltas) == by_event["result"]["rebalance_report"]
+    assert by_event["result"]["stress_level"] == 9
+
+
+def test_stream_reports_failures_in_band(fake_llm, monkeypatch):
+    # Without degradation a failing LLM call ends the stream
+    monkeypatch.setattr(settings, "LLM_RESILIENCE_ENABLED", False)
+    fake_llm(fail_marker="STREAM-FAIL")
+    events = read_events(["Stream STREAM-FAIL review"])
+
+    names = [event for event, _ in events]
+    assert names[-1] == "error"
+    assert "result" not in names
+    assert events[-1][1]["detail"]
+
+
+def test_stream_deltas_come_from_the_run_that_finishes(monkeypatch):
+    # A hedged duplicate of the analysis call streams alongside the original, and wins
+    def chunk(run, args="", last=False):
+        message = AIMessageChunk(
+            content="", id=run, tool_call_chunks=[{"args": args, "index": 0}] if args else [],
+            chunk_position="last" if last else None,
+        )
+        return "messages", (message, {"langgraph_node": "analyze"})
+
+    class HedgedAgent:
+        async def astream(self, state, stream_mode):
+            yield chunk("original", '{"analysis_report": "Calm ')
+            yield chunk("hedge", '{"analysis_report": "Busy ')
+            yield chunk("original", 'week."')
+            yield chunk("hedge", 'week ahead."')
+            yield chunk("hedge", last=True)
+            yield chunk("original", "}")
+            yield "updates", {"analyze": {"analysis_report": "Busy week ahead."}}
+
+    monkeypatch.setattr(analysis_service, "get_agent", lambda mode: HedgedAgent())
+    monkeypatch.setattr(analysis_service, "build_response", lambda state: state)
+
+    async def collect():
+        return [item async for item in analysis_service.stream_schedule_analysis_service(["Hedged"], include_tokens=True)]
+
+    tokens = [data for event, data in asyncio.run(collect()) if event == "token"]
+    # The original streamed live until the hedge started; the hedge's text then replaces it
+    assert tokens == [
+        {"node": "analyze", "field": "analysis_report", "delta": "Calm "},
+        {"node": "analyze", "field": "analysis_report", "delta": "Busy week ahead.", "reset": True},
+    ]
@@ -0,0 +1,30 @@
+from app.langgraph_agent.task_index import TaskCategoryIndex
+
+
+def test_only_unseen_tasks_need_the_llm():
+    """Known tasks are answered from the index and merged with the fresh LLM result."""
+    index = TaskCategoryIndex()
+    index.record({"Work": ["Team stand-up at 9am"]})
+
+    tasks = ["team  stand-up at 9am", "Gym after work", "Gym after work"]
+    known, unseen = index.split(tasks)
+    assert known == {"team  stand-up at 9am": "Work"}
+    assert unseen == ["Gym after work"]
+
+    fresh = {"Health": ["gym after work"]}
+    index.record(fresh)
+    assert index.merge(tasks, known, fresh) == {
+        "Work": ["team  stand-up at 9am"],
+        "Health": ["Gym after work", "Gym after work"],
+    }
+
+
+def test_index_is_bounded():
+    """The least recently used tasks are evicted once the index is full."""
+    index = TaskCategoryIndex(max_entries=2)
+    index.record({"Work": ["a", "b"]})
+    index.lookup("a")
+    index.record({"Chores": ["c"]})
+    assert index.lookup("b") is None
+    assert index.lookup("a") == "Work"
+    assert index.stats()["evictions"] == 1
@@ -0,0 +1,46 @@
+import logging
+import logging.handlers
+
+from fastapi.testclient import TestClient
+
+from app.core import tracing
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_request_id_round_trips_and_node_spans_are_logged(fake_llm, caplog):
+    fake_llm()
+    caplog.set_level(logging.INFO, logger="app.trace")
+    response = client.post(
+        "/api/v1/analyze-schedule",
+        json={"tasks": ["Traced stand-up at 9am", "Traced gym session"]},
+        headers={"X-Request-ID": "trace-test-1"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["X-Request-ID"] == "trace-test-1"
+    spans = [record.span for record in caplog.records if hasattr(record, "span")]
+    assert [span["span"] for span in spans] == ["precheck", "categorize", "analyze", "suggest"]
+    assert all(span["request_id"] == "trace-test-1" for span in spans)
+    assert spans[1]["prompt_tokens"] > 0 and spans[1]["duration_ms"] >= 0
+
+    # Without the header, a fresh ID is generated per request
+    generated = client.get("/").headers["X-Request-ID"]
+    assert generated and generated != client.get("/").headers["X-Request-ID"]
+
+
+def test_log_sinks_only_run_while_the_app_does():
+    app_logger = logging.getLogger("app")
+    assert app_logger.propagate and tracing._listener is None
+
+    with TestClient(app):
+        assert not app_logger.propagate
+        assert tracing._listener._thread.is_alive()
+        # Node spans are opt-in: at the default level they are never built
+        assert not logging.getLogger("app.trace").isEnabledFor(logging.INFO)
+        thread = tracing._listener._thread
+
+    assert app_logger.propagate and tracing._listener is None
+    assert not thread.is_alive()
+    assert not any(isinstance(handler, logging.handlers.QueueHandler) for handler in app_logger.handlers)
@@ -0,0 +1,65 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.services.weekly import reduce_week
+
+client = TestClient(app)
+
+
+def day_result(stress_level, tasks_to_reschedule=()):
+    return {
+        "stress_level": stress_level,
+        "needs_rebalancing": stress_level >= 8,
+        "tasks_to_reschedule": list(tasks_to_reschedule),
+    }
+
+
+def test_reduce_moves_tasks_onto_lighter_days():
+    days = {
+        "Monday": ["Stand-up", "Board review", "Client dinner"],
+        "Tuesday": ["Stand-up", "Gym"],
+        "Wednesday": ["Stand-up"],
+        "Thursday": ["Stand-up", "Dentist", "Groceries"],
+    }
+    results = {
+        "Monday": day_result(9, ["client dinner", "Board review", "Not on Monday"]),
+        "Tuesday": day_result(4),
+        "Wednesday": RuntimeError("boom"),
+        "Thursday": day_result(4),
+    }
+
+    week = reduce_week(days, results, target_stress_level=7)
+
+    # Each task carries 3 points; after one move Monday (6) is no heavier than Thursday would be (7)
+    assert week["moves"] == [{"task": "Client dinner", "from_day": "Monday", "to_day": "Tuesday"}]
+    assert week["unplaced_tasks"] == [{"task": "Board review", "day": "Monday"}]
+    assert week["rebalanced_schedule"]["Monday"] == ["Stand-up", "Board review"]
+    assert week["rebalanced_schedule"]["Tuesday"] == ["Stand-up", "Gym", "Client dinner"]
+    assert week["rebalanced_schedule"]["Wednesday"] == ["Stand-up"]
+    assert week["projected_stress_levels"] == {"Monday": 6.0, "Tuesday": 7.0, "Thursday": 4.0}
+    # The failed day is left out of the aggregates
+    assert (week["average_stress_level"], week["peak_stress_level"], week["peak_day"]) == (5.7, 9, "Monday")
+    assert week["overloaded_days"] == ["Monday"]
+
+
+def test_week_days_are_analyzed_in_parallel(fake_llm, monkeypatch):
+    monkeypatch.setattr(settings, "COALESCE_REQUESTS_ENABLED", False)
+    model = fake_llm(latency_seconds=0.05)
+    week = {
+        day: ["Weekly stand-up at 9am", f"Weekly {day} gym session", f"Weekly {day} groceries"]
+        for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+    }
+    response = client.post("/api/v1/analyze-schedule/week", json={"days": week})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [entry["day"] for entry in data["days"]] == list(week)
+    assert all(entry["result"]["stress_level"] for entry in data["days"])
+    assert data["rebalanced_schedule"] == week
+    # Every day's LLM calls were in flight at the same time
+    assert model.stats()["peak_in_flight"] == len(week)
+
+    too_long = {str(i): ["x"] for i in range(settings.WEEK_MAX_DAYS + 1)}
+    for days in (too_long, {}):
+        assert client.post("/api/v1/analyze-schedule/week", json={"days": days}).status_code == 422